@@ -717,36 +717,77 @@ export default function ChatWindow() {
 
       console.log(requestBody)
 
-      const resp = await fetch("http://localhost:8001/supplier-analysis", {
+      const resp = await fetch("http://localhost:8001/supplier-analysis/stream", {
         method: "POST",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify(requestBody),
       })
-      const data = await resp.json()
+      if (!resp.ok || !resp.body) {
+        throw new Error(`supplier-analysis failed with status ${resp.status}`)
+      }
+
+      const toMessage = (entry: any, id: number): Message => ({
+        id,
+        text: entry.content,
+        sender: entry.name === "you" ? "user" : "agent",
+        name: formatName(entry.name),
+        timestamp: new Date().toLocaleTimeString([], {
+          hour: "2-digit",
+          minute: "2-digit",
+        }),
+      })
+      const isShown = (entry: any) => entry.content != null && entry.content !== "None"
+
+      // 5) Show agent messages as the server-sent events arrive
+      const reader = resp.body.getReader()
+      const decoder = new TextDecoder()
+      let buffer = ""
+      let data: any = null
+      let failure: string | null = null
+      while (true) {
+        const { done, value } = await reader.read()
+        if (done) break
+        buffer += decoder.decode(value, { stream: true })
+        const events = buffer.split("\n\n")
+        buffer = events.pop() ?? ""
+        for (const raw of events) {
+          const event = raw.match(/^event: (.*)$/m)?.[1]
+          const payload = raw.match(/^data: (.*)$/m)?.[1]
+          if (!event || payload === undefined) continue // keep-alive comment
+
+          const body = JSON.parse(payload)
+          if (event === "message" && isShown(body)) {
+            setSessions((prev) =>
+              prev.map((sess) =>
+                sess.id === newSession.id
+                  ? { ...sess, messages: [...sess.messages, toMessage(body, sess.messages.length + 1)] }
+                  : sess,
+              ),
+            )
+          } else if (event === "result") {
+            data = body
+          } else if (event === "done" && body.status !== "succeeded") {
+            failure = body.error ?? body.status
+          }
+        }
+      }
+      if (!data || typeof data !== "object") {
+        throw new Error(`supplier-analysis returned no result${failure ? `: ${failure}` : ""}`)
+      }
 
       // *** NEW: update our summary state for next time
       if (data.chat_summary) {
         setChatSummary(data.chat_summary)
       }
 
-      // 5) Transform returned chat_history into Message[]
+      // 6) Replace the streamed messages with the complete chat_history
       const agentMsgs: Message[] = data.chat_history
-        .filter((e: any) => e.content != null && e.content !== "None")
-        .map((entry: any, idx: number) => ({
-          id: idx + 2, // user was 1
-          text: entry.content,
-          sender: entry.name === "you" ? "user" : "agent",
-          name: formatName(entry.name),
-          timestamp: new Date().toLocaleTimeString([], {
-            hour: "2-digit",
-            minute: "2-digit",
-          }),
-        }))
-
-      // 6) Append agent messages only into our new session
+        .filter(isShown)
+        .map((entry: any, idx: number) => toMessage(entry, idx + 2)) // user was 1
+
       setSessions((prev) =>
         prev.map((sess) =>
-          sess.id === newSession.id ? { ...sess, messages: [...sess.messages, ...agentMsgs] } : sess,
+          sess.id === newSession.id ? { ...sess, messages: [sess.messages[0], ...agentMsgs] } : sess,
         ),
       )
 
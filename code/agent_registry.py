@@ -0,0 +1,200 @@
+"""
+Build-once registry of the agent teams behind the workflows.
+
+Creating a workflow's agents is the expensive part of a request that does
+not involve the LLM: every ConversableAgent with an llm_config builds its own
+OpenAI client, register_function generates a tool schema, and the
+GroupChatManager sets up its own client and reply functions (about 50 ms
+each, so 0.5-1 s for a large workflow). A builder function creates the
+agents, tools, GroupChat and manager of one workflow; WorkflowRegistry keeps
+the teams it built in a pool and hands them out per request:
+
+    @workflow_teams.register("send_email_workflow")
+    def build_send_email_team():
+        ...
+        return Team(agent_list, group_chat, group_chat_manager)
+
+    with workflow_teams.acquire("send_email_workflow") as team:
+        chat_result = team.agents[0].initiate_chat(team.manager, message=...)
+
+A team is used by one request at a time; concurrent requests get another
+instance, built on demand. When the request is done the team's message
+history and reply counters are cleared and it goes back to the pool.
+Builders may take variant arguments (e.g. whether tool results were
+pre-fetched, which changes the agent list) and are pooled per variant.
+Teams whose prompts or tool descriptions embed CSV data are rebuilt when one
+of their data_paths changes on disk. Unless SPEAKER_FSM=0, each group chat
+picks speakers with speaker_fsm.TransitionSelector instead of asking the LLM
+at every branch of its transitions, agents run the tool calls of one
+message concurrently (parallel_tools), and group chat messages are published
+live to a request that streams them (streaming).
+"""
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from autogen import Agent, GroupChat, GroupChatManager
+
+from data_registry import registry
+from parallel_tools import enable_parallel_tool_calls
+from speaker_fsm import TransitionSelector, selection_counts
+from streaming import stream_messages
+
+
+# Placeholder for the current date and time in system messages; it is filled
+# in each time the team is handed out, so prompts built once do not go stale
+CURRENT_TIME = "<current date and time>"
+CURRENT_TIME_FORMAT = '%d-%m-%Y ( at %H:%M )'
+
+SPEAKER_FSM = os.getenv("SPEAKER_FSM", "1") == "1"
+
+
+class Team(NamedTuple):
+    """Agents of one workflow; agents[0] initiates the chat with manager."""
+    agents: List[Agent]
+    group_chat: GroupChat
+    manager: GroupChatManager
+
+    def reset(self):
+        """Clear messages and auto-reply counters left by the last chat."""
+        for agent in self.agents:
+            agent.reset()
+        self.group_chat.reset()
+        # manager.reset() would also restore its reply configs from copies,
+        # detaching the manager from group_chat
+        self.manager.clear_history()
+        self.manager.reset_consecutive_auto_reply_counter()
+
+
+def _group_chats(team: Team) -> List[GroupChat]:
+    """team.group_chat and the copies of it the manager's run_chat replies work on."""
+    # register_reply keeps a shallow copy of its config: it shares the message
+    # list, but not attributes set after the manager was created
+    return [team.group_chat] + [reply["config"] for reply in team.manager._reply_func_list
+                                if isinstance(reply["config"], GroupChat)]
+
+
+class _Pooled(NamedTuple):
+    team: Team
+    # {agent: system message containing CURRENT_TIME}
+    templates: Dict[Agent, str]
+
+
+class TeamPool:
+    """Idle teams of one workflow, per builder variant."""
+
+    def __init__(self, name: str, build: Callable[..., Team], data_paths: Iterable[str] = (),
+                 tool_handoff: bool = False):
+        self.name = name
+        self.tool_handoff = tool_handoff
+        self.build = build
+        self.data_paths = tuple(data_paths)
+        self.built = 0
+        self._lock = threading.Lock()
+        self._idle = {}
+        self._version = None
+
+    def _data_version(self) -> tuple:
+        return tuple(registry.version(path) for path in self.data_paths)
+
+    def acquire(self, *variant) -> tuple:
+        """(pooled team, data version it was built against) for one request."""
+        version = self._data_version()
+        pooled = None
+        with self._lock:
+            if version != self._version:
+                self._idle.clear()
+                self._version = version
+            idle = self._idle.get(variant)
+            if idle:
+                pooled = idle.pop()
+
+        if pooled is None:
+            team = self.build(*variant)
+            selector = TransitionSelector(self.name, deterministic=SPEAKER_FSM, tool_handoff=self.tool_handoff)
+            for group_chat in _group_chats(team):
+                group_chat.speaker_selection_method = selector
+                stream_messages(group_chat)
+            for agent in team.agents:
+                if getattr(agent, "function_map", None):
+                    enable_parallel_tool_calls(agent)
+            pooled = _Pooled(team, {agent: agent.system_message for agent in team.agents
+                                    if CURRENT_TIME in getattr(agent, "system_message", "")})
+            with self._lock:
+                self.built += 1
+
+        now = datetime.now().strftime(CURRENT_TIME_FORMAT)
+        for agent, template in pooled.templates.items():
+            agent.update_system_message(template.replace(CURRENT_TIME, now))
+        return pooled, version
+
+    def release(self, pooled: _Pooled, version: tuple, *variant):
+        """Reset the team and keep it for the next request, unless its data changed."""
+        pooled.team.reset()
+        with self._lock:
+            if version == self._version:
+                self._idle.setdefault(variant, []).append(pooled)
+
+
+class WorkflowRegistry:
+    """Team builders by workflow name, with a pool of built teams for each."""
+
+    def __init__(self):
+        self._pools = {}
+
+    def register(self, name: str, data_paths: Iterable[str] = (), tool_handoff: bool = False):
+        """
+        Decorator registering a team builder for a workflow.
+
+        Args:
+            name: Workflow name, as in function_registry.
+            data_paths: CSV files read while building (e.g. into a system
+                message); idle teams are discarded when one of them changes.
+            tool_handoff: Let agents with a single tool pass the turn on right
+                after a successful tool result, without summarising it (see
+                speaker_fsm).
+        """
+        def decorator(build: Callable[..., Team]):
+            self._pools[name] = TeamPool(name, build, data_paths, tool_handoff)
+            return build
+        return decorator
+
+    @contextmanager
+    def acquire(self, name: str, *variant):
+        """
+        Context manager yielding a Team for one request.
+
+        Args:
+            name: Workflow name.
+            *variant: Arguments passed to the builder; teams are only reused
+                for the same variant.
+        """
+        pool = self._pools[name]
+        pooled, version = pool.acquire(*variant)
+        try:
+            yield pooled.team
+        finally:
+            pool.release(pooled, version, *variant)
+
+    def warm(self, names: Optional[Iterable[str]] = None):
+        """Build one team (default variant) per workflow ahead of the first request."""
+        for name in (self._pools if names is None else names):
+            with self.acquire(name):
+                pass
+
+    def stats(self) -> dict:
+        """
+        {workflow: {'built': teams built so far, 'idle': teams waiting in the
+        pool, 'speaker_selection': selections settled by the transition graph
+        vs. by the LLM}}
+        """
+        return {
+            name: {
+                "built": pool.built,
+                "idle": sum(len(v) for v in pool._idle.values()),
+                "speaker_selection": selection_counts(name),
+            }
+            for name, pool in self._pools.items()
+        }
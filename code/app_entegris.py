@@ -1,10 +1,12 @@
 from sendgrid.helpers.mail import Mail
 from sendgrid import SendGridAPIClient
+import asyncio
+import functools
 import json
 import time
 from fastapi import FastAPI, HTTPException, Request, Form
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 import pandas as pd
 import os
@@ -21,9 +23,9 @@ from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import PydanticOutputParser
 
 import time
-import ast
 import re
 import base64
+import shutil
 
 
 from tools_manager import (
@@ -48,11 +50,22 @@ from tools_manager import (
     extract_invoice_details,
     get_po_grn_details,
     generate_alphanumeric_string,
-    clear_pdfs,
+    PDF_STORE,
+    pdf_folder,
     calculate_eta_from_files,
     analysed_pr_details,
     send_reminder_email_to_approver
 )
+from data_registry import load_csv
+from panama_pipeline import run_panama_stages
+from panama_sweep import panama_delay_sweep
+from disruption_sim import simulate_disruption
+from entities import extract_entities
+from intent_router import IntentRouter
+from direct_execution import DIRECT_CHAINS, run_direct, run_parallel
+from jobs import MAX_WAIT_SECONDS, ROUTING, JobQueue, QueueFull, set_workflow
+from streaming import MessageStream, format_event
+from agent_registry import CURRENT_TIME, Team, WorkflowRegistry
 
 app = FastAPI(title="Supplier Analysis API")
 
@@ -377,18 +390,52 @@ config_list_gpt_4o_mini = [{
 
 os.environ['AUTOGEN_USE_DOCKER'] = '0'
 
+SUPPLIER_DATA_PATH = './updated_docs/Supplier_data.csv'
+
+# Agents, tools and group chats of each workflow are built once and reused
+# across requests (see agent_registry)
+workflow_teams = WorkflowRegistry()
+
+# Worker pool behind the /supplier-analysis/jobs endpoints
+job_queue = JobQueue()
+
 
 class SupplierQuery(BaseModel):
     query: str
     chat_summary: str
     pdfs: Optional[List] = None
+    # "agents" runs the agent workflow; for the workflows in DIRECT_CHAINS,
+    # "direct" runs their tools directly plus one narrative LLM call and
+    # "tables" returns the tool results only
+    mode: Literal["agents", "direct", "tables"] = "agents"
 
 
 class PanamaCanalQuery(BaseModel):
     affected_dc: str = "DC3"  # Default to DC3 which typically has highest-value electronics
     delay_days: int = 15
-    # "delayed_shipments", "stockout_risk", "rerouting", "cost_benefit", "full"
+    # "delayed_shipments", "stockout_risk", "rerouting", "cost_benefit", "rerouting_plan", "full"
     analysis_type: str = "full"
+    # "greedy" (5 cheapest options) or "optimal" (min rerouting cost + lost sales)
+    rerouting_solver: Literal["greedy", "optimal"] = "greedy"
+
+
+class PanamaSimulationQuery(BaseModel):
+    # Fixed delay for East Coast arrivals, on top of sampled lane variability
+    delay_days: int = 15
+    scenarios: int = 10000
+    horizon_days: int = 90
+    affected_dcs: Optional[List[str]] = None
+    seed: Optional[int] = None
+
+
+class PanamaSweepQuery(BaseModel):
+    # None = every DC receiving East Coast shipments
+    affected_dcs: Optional[List[str]] = None
+    # Delay values min_delay, min_delay + step, ..., max_delay (inclusive);
+    # delays of 0-365 days, at most 100 values
+    min_delay: int = 5
+    max_delay: int = 30
+    step: int = 5
 
 
 # === 3. Define structured output model ===
@@ -557,25 +604,62 @@ llm = ChatOpenAI(
 
 pipeline = prompt_chain | llm | parser
 
+# Local classifier over the prompt's examples; the pipeline is only called
+# for queries it is not confident about
+intent_router = IntentRouter.from_prompt(prompt.template)
+
 # === 5. Function to handle user query ===
 
 
-def handle_user_query(orchestration_mssg, query, chat_summary):
+def route_query(query: str) -> str:
+    """Name of the workflow for a query (local router, LLM pipeline as fallback)."""
+    return intent_router.route(query, lambda q: pipeline.invoke({"user_query": q}).function_name)
+
+
+def handle_user_query(orchestration_mssg, query, chat_summary, mode="agents", function_name=None,
+                      raise_errors=False):
+    """
+    Route the query (unless function_name is given) and run its workflow.
+    Errors come back as the response unless raise_errors is set, in which case
+    they, and workflows that report a failed run, raise instead.
+    """
     try:
-        call = pipeline.invoke({"user_query": query})
-        fn = function_registry.get(call.function_name)
-        if fn:
-            return fn(orchestration_mssg, query, chat_summary)
-        else:
-            return f"Unknown function: {call.function_name}"
+        if function_name is None:
+            function_name = route_query(query)
+            set_workflow(function_name)
+        if mode != "agents" and function_name in DIRECT_CHAINS:
+            try:
+                result = direct_workflow(function_name, query, chat_summary, narrative=mode == "direct")
+            except Exception as e:
+                print(f"Direct execution of {function_name} failed, running the agents: {e}")
+                result = None
+            if result is not None:
+                return result
+        fn = function_registry.get(function_name)
+        if not fn:
+            if raise_errors:
+                raise ValueError(f"Unknown function: {function_name}")
+            return f"Unknown function: {function_name}"
+        result = fn(orchestration_mssg, query, chat_summary)
+        if raise_errors and isinstance(result, dict) and result.get("chat_history") is None:
+            raise RuntimeError(result.get("chat_summary") or f"{function_name} failed")
+        return result
     except Exception as e:
         print(f"Error: {e}")
+        if raise_errors:
+            raise
         return f"Error: {e}"
 
 
-@app.post("/supplier-analysis")
-def supplier_analysis(request: SupplierQuery):
-
+def run_supplier_analysis(request: SupplierQuery, function_name: str = None, raise_errors: bool = False):
+    """
+    Store the request's PDFs in a folder of its own, run the query's workflow
+    and remove the folder again. function_name skips routing when the
+    workflow is already known; raise_errors is passed to handle_user_query.
+    """
+    folder = os.path.join(PDF_STORE, generate_alphanumeric_string(12))
+    os.makedirs(folder, exist_ok=True)
+    token = pdf_folder.set(folder)
     try:
         try:
             request_list = request.pdfs
@@ -584,7 +668,7 @@ def supplier_analysis(request: SupplierQuery):
                 for request_element in request_list:
                     pdf_bytes = base64.b64decode(request_element["data"])
                     random_pdf_name = generate_alphanumeric_string(12)
-                    with open(f"./updated_docs/pdf_store/{random_pdf_name}.pdf", "wb") as f:
+                    with open(os.path.join(folder, f"{random_pdf_name}.pdf"), "wb") as f:
                         f.write(pdf_bytes)
             chat_summary = request.chat_summary
             print("CHAT SUMMARY:\n`"+chat_summary+"`")
@@ -600,16 +684,154 @@ def supplier_analysis(request: SupplierQuery):
                 print("ERROR:\n\n")
                 print(err)
 
-        result = handle_user_query([], request.query, chat_summary)
+        return handle_user_query([], request.query, chat_summary, request.mode, function_name, raise_errors)
+    finally:
+        pdf_folder.reset(token)
+        shutil.rmtree(folder, ignore_errors=True)
 
-        return result
+
+@app.post("/supplier-analysis")
+def supplier_analysis(request: SupplierQuery):
+
+    try:
+        return run_supplier_analysis(request)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
+
+
+@app.post("/supplier-analysis/stream")
+async def stream_supplier_analysis(request: SupplierQuery):
+    """
+    /supplier-analysis as server-sent events: 'job' (id for cancelling), one
+    'message' per group chat message as the agents produce it, 'result' (the
+    /supplier-analysis response) and 'done' (final job status). The workflow
+    runs on the job queue (routed there, like /supplier-analysis/jobs) and is
+    cancelled if the client disconnects. A failed job sends no 'result'; its
+    'done' event carries the error. The events are awaited on the event loop,
+    so an open stream holds no server thread while the workflow runs.
+    """
+    stream = MessageStream()
+    try:
+        job = job_queue.submit(ROUTING, stream.run, functools.partial(run_supplier_analysis, raise_errors=True), request)
+    except QueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    job.future.add_done_callback(lambda _: stream.close())
+
+    async def events():
         try:
-            clear_pdfs()
-        except Exception as cleanup_err:
-            print("Failed to clear PDFs:", cleanup_err)
+            yield format_event("job", job.to_dict())
+            async for chunk in stream.events():
+                yield chunk
+            yield format_event("done", {k: v for k, v in job.to_dict().items() if k != "result"})
+        finally:
+            if not job.done:
+                job_queue.cancel(job.id)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@app.post("/supplier-analysis/jobs", status_code=202)
+def submit_supplier_analysis(request: SupplierQuery):
+    """
+    Queue a /supplier-analysis request on the job worker pool and return its
+    job id right away; poll GET /supplier-analysis/jobs/{job_id} for the result.
+    The job is routed on its worker, so its workflow reads 'routing' until then.
+    """
+    try:
+        job = job_queue.submit(ROUTING, functools.partial(run_supplier_analysis, raise_errors=True), request)
+    except QueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return job.to_dict()
+
+
+@app.get("/supplier-analysis/jobs/{job_id}")
+async def supplier_analysis_job(job_id: str, wait: float = 0):
+    """
+    Status of a job, with the workflow's response as 'result' once it
+    succeeded. With wait > 0 the call returns as soon as the job finishes, or
+    after wait seconds (at most MAX_WAIT_SECONDS).
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job {job_id}")
+    if wait > 0 and not job.done:
+        await asyncio.wait([asyncio.wrap_future(job.future)], timeout=min(wait, MAX_WAIT_SECONDS))
+    return job.to_dict()
+
+
+@app.delete("/supplier-analysis/jobs/{job_id}")
+def cancel_supplier_analysis_job(job_id: str):
+    """Cancel a queued job, or stop a running one before its next agent turn."""
+    job = job_queue.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job {job_id}")
+    return job.to_dict()
+
+
+@app.get("/job-metrics")
+def job_metrics():
+    """Queue depth, running jobs and wait / run times per workflow."""
+    return job_queue.metrics()
+
+
+def direct_workflow(workflow: str, query: str, chat_summary: str, narrative: bool = True):
+    """
+    Answer a query with the workflow's tool chain run directly (see
+    direct_execution) instead of its agent group chat.
+
+    Args:
+        workflow: Workflow name, a key of DIRECT_CHAINS.
+        query: The user query.
+        chat_summary: Summary of the previous conversation.
+        narrative: Have the workflow's optibuy_agent write its report from
+            the tool results (one LLM call); otherwise return the tables only.
+
+    Returns:
+        The workflow's usual response dict, or None if the chain could not
+        resolve its inputs and the agents should run instead.
+    """
+    start_time = time.time()
+    results = run_direct(workflow, query, chat_summary or "")
+    if not results:
+        return None
+
+    orchestration_mssg = [{
+        "content": "Running the workflow tools directly",
+        "role": "assistant",
+        "name": "optibuy_agent"
+    }]
+    orchestration_mssg.extend(r.history_message() for r in results)
+    summary = "\n\n".join(r.markdown for r in results)
+
+    if narrative:
+        if (chat_summary or "").strip() != "":
+            final_query = f"""
+        **Chat Summary of Previous Conversation:** {chat_summary}
+        \n
+        **New  Query:** {query}
+        """
+        else:
+            final_query = query
+        message = "**"+final_query+"**\n\n" + datetime.now().strftime("Today's Date is %d-%b-%Y") + \
+            "\n\n**Tool results:**\n\n" + "\n\n".join(r.section() for r in results)
+        with workflow_teams.acquire(workflow) as team:
+            writer = next(agent for agent in team.agents if agent.name == "optibuy_agent")
+            reply = writer.generate_reply(messages=[{"role": "user", "content": message}])
+        summary = (reply if isinstance(reply, str) else (reply or {}).get("content") or "").replace("TERMINATE", "").strip()
+        orchestration_mssg.append({
+            "content": summary,
+            "role": "user",
+            "name": "optibuy_agent"
+        })
+
+    return_dict = {
+        'chat_history': orchestration_mssg,
+        'chat_summary': summary,
+        'total_time': time.time()-start_time
+    }
+    print(json.dumps(return_dict, indent=4))
+    return return_dict
 
 
 def save_pr_email_to_json(email_data: dict):
@@ -734,28 +956,14 @@ def fetch_pr_emails():
         return f"Error fetching PR emails: {str(e)}"
 
 
-def send_email_workflow(orchestration_mssg: list, query: str, chat_summary: str):
-    print("Chat Summary:\n\n"+chat_summary)
-    if chat_summary.strip() != "":
-        print("CHAT SUMMARY:\n`"+chat_summary+"`")
-
-        final_query = f"""
-        **Chat Summary of Previous Conversation:** {chat_summary}
-        \n
-        **New  Query:** {query}
-        """
-    else:
-        final_query = query
-
-    start_time = time.time()
-    try:
-
-        email_sending_agent = ConversableAgent(
-            "email_sending_agent",
-            llm_config={"config_list": config_list_gpt_4o_mini},
-            max_consecutive_auto_reply=3,
-            human_input_mode='NEVER',
-            system_message="""
+@workflow_teams.register("send_email_workflow")
+def build_send_email_team():
+    email_sending_agent = ConversableAgent(
+        "email_sending_agent",
+        llm_config={"config_list": config_list_gpt_4o_mini},
+        max_consecutive_auto_reply=3,
+        human_input_mode='NEVER',
+        system_message="""
             You are **email\_sending\_agent**.
 
 Your task is to read the user's last message, extract Purchase Order details, and draft a PO table. Follow these rules exactly:
@@ -807,69 +1015,88 @@ Your task is to read the user's last message, extract Purchase Order details, an
             **IMPORTANT: End your response with "TERMINATE" to properly conclude the workflow.**
 
             """,
-        )
+    )
+
+    register_function(
+        email_sending_tool,
+        caller=email_sending_agent,
+        executor=email_sending_agent,
+        name="email_sending_tool",
+        description="Send an email using this tool only if user confirms/authorises you to send the email.",
+    )
+
+    you = UserProxyAgent(
+        "you",
+        human_input_mode="NEVER",
+        is_termination_msg=lambda x: x.get(
+            "content", "").find("TERMINATE") >= 0,
+        max_consecutive_auto_reply=0
+    )
+
+    agent_list = [
+        you,
+        email_sending_agent
+    ]
 
-        register_function(
-            email_sending_tool,
-            caller=email_sending_agent,
-            executor=email_sending_agent,
-            name="email_sending_tool",
-            description="Send an email using this tool only if user confirms/authorises you to send the email.",
-        )
+    transitions_list = {
+        you: [email_sending_agent],
+        email_sending_agent: [you]
+    }
 
-        you = UserProxyAgent(
-            "you",
-            human_input_mode="NEVER",
-            is_termination_msg=lambda x: x.get(
-                "content", "").find("TERMINATE") >= 0,
-            max_consecutive_auto_reply=0
-        )
+    group_chat = GroupChat(
+        agents=agent_list,
+        messages=[],
+        max_round=15,
+        allowed_or_disallowed_speaker_transitions=transitions_list,
+        speaker_transitions_type="allowed"
+    )
 
-        agent_list = [
-            you,
-            email_sending_agent
-        ]
+    group_chat_manager = GroupChatManager(
+        groupchat=group_chat,
+        llm_config={"config_list": config_list_gpt_4o_mini},
+    )
 
-        transitions_list = {
-            you: [email_sending_agent],
-            email_sending_agent: [you]
-        }
+    return Team(agent_list, group_chat, group_chat_manager)
 
-        group_chat = GroupChat(
-            agents=agent_list,
-            messages=[],
-            max_round=15,
-            allowed_or_disallowed_speaker_transitions=transitions_list,
-            speaker_transitions_type="allowed"
-        )
 
-        group_chat_manager = GroupChatManager(
-            groupchat=group_chat,
-            llm_config={"config_list": config_list_gpt_4o_mini},
-        )
+def send_email_workflow(orchestration_mssg: list, query: str, chat_summary: str):
+    print("Chat Summary:\n\n"+chat_summary)
+    if chat_summary.strip() != "":
+        print("CHAT SUMMARY:\n`"+chat_summary+"`")
 
-        chat_result = agent_list[0].initiate_chat(
-            group_chat_manager,
-            message="**"+final_query+"**\n\n" +
-            datetime.now().strftime("Today's Date is %d-%b-%Y"),
-            summary_method="last_msg"
-        )
+        final_query = f"""
+        **Chat Summary of Previous Conversation:** {chat_summary}
+        \n
+        **New  Query:** {query}
+        """
+    else:
+        final_query = query
 
-        orchestration_mssg = [{
-            "content": "Preparing plan for execution. Selecting relevant agents",
-            "role": "assistant",
-            "name": "optibuy_agent"
-        }
-        ]
+    start_time = time.time()
+    try:
+        with workflow_teams.acquire("send_email_workflow") as team:
+            chat_result = team.agents[0].initiate_chat(
+                team.manager,
+                message="**"+final_query+"**\n\n" +
+                datetime.now().strftime("Today's Date is %d-%b-%Y"),
+                summary_method="last_msg"
+            )
 
-        orchestration_mssg.extend(chat_result.chat_history[1:])
+            orchestration_mssg = [{
+                "content": "Preparing plan for execution. Selecting relevant agents",
+                "role": "assistant",
+                "name": "optibuy_agent"
+            }
+            ]
 
-        return_dict = {
-            'chat_history': orchestration_mssg,
-            'chat_summary': chat_result.summary,
-            'total_time': time.time()-start_time
-        }
-        print(json.dumps(return_dict, indent=4))
+            orchestration_mssg.extend(chat_result.chat_history[1:])
+
+            return_dict = {
+                'chat_history': orchestration_mssg,
+                'chat_summary': chat_result.summary,
+                'total_time': time.time()-start_time
+            }
+            print(json.dumps(return_dict, indent=4))
 
     except Exception as err:
 
@@ -882,28 +1109,14 @@ Your task is to read the user's last message, extract Purchase Order details, an
     return return_dict
 
 
-def draft_po_workflow(orchestration_mssg: list, query: str, chat_summary: str):
-    print("Chat Summary:\n\n"+chat_summary)
-    if chat_summary.strip() != "":
-        print("CHAT SUMMARY:\n`"+chat_summary+"`")
-
-        final_query = f"""
-        **Chat Summary of Previous Conversation:** {chat_summary}
-        \n
-        **New  Query:** {query}
-        """
-    else:
-        final_query = query
-
-    start_time = time.time()
-    try:
-
-        p2p_compliance_agent = ConversableAgent(
-            "p2p_compliance_agent",
-            llm_config={"config_list": config_list_gpt_4o_mini},
-            max_consecutive_auto_reply=3,
-            human_input_mode='NEVER',
-            system_message="""
+@workflow_teams.register("draft_po_workflow")
+def build_draft_po_team():
+    p2p_compliance_agent = ConversableAgent(
+        "p2p_compliance_agent",
+        llm_config={"config_list": config_list_gpt_4o_mini},
+        max_consecutive_auto_reply=3,
+        human_input_mode='NEVER',
+        system_message="""
             # Basic Information:
             You are **p2p_compliance_agent**.
             # Role:
@@ -939,61 +1152,80 @@ def draft_po_workflow(orchestration_mssg: list, query: str, chat_summary: str):
 
         
             """,
-        )
+    )
+
+    you = UserProxyAgent(
+        "you",
+        human_input_mode="NEVER",
+        is_termination_msg=lambda x: x.get(
+            "content", "").find("TERMINATE") >= 0,
+        max_consecutive_auto_reply=0
+    )
+
+    agent_list = [
+        you,
+        p2p_compliance_agent
+    ]
 
-        you = UserProxyAgent(
-            "you",
-            human_input_mode="NEVER",
-            is_termination_msg=lambda x: x.get(
-                "content", "").find("TERMINATE") >= 0,
-            max_consecutive_auto_reply=0
-        )
+    transitions_list = {
+        you: [p2p_compliance_agent],
+        p2p_compliance_agent: [you]
+    }
 
-        agent_list = [
-            you,
-            p2p_compliance_agent
-        ]
+    group_chat = GroupChat(
+        agents=agent_list,
+        messages=[],
+        max_round=15,
+        allowed_or_disallowed_speaker_transitions=transitions_list,
+        speaker_transitions_type="allowed"
+    )
 
-        transitions_list = {
-            you: [p2p_compliance_agent],
-            p2p_compliance_agent: [you]
-        }
+    group_chat_manager = GroupChatManager(
+        groupchat=group_chat,
+        llm_config={"config_list": config_list_gpt_4o_mini},
+    )
 
-        group_chat = GroupChat(
-            agents=agent_list,
-            messages=[],
-            max_round=15,
-            allowed_or_disallowed_speaker_transitions=transitions_list,
-            speaker_transitions_type="allowed"
-        )
+    return Team(agent_list, group_chat, group_chat_manager)
 
-        group_chat_manager = GroupChatManager(
-            groupchat=group_chat,
-            llm_config={"config_list": config_list_gpt_4o_mini},
-        )
 
-        chat_result = agent_list[0].initiate_chat(
-            group_chat_manager,
-            message="**"+final_query+"**\n\n" +
-            datetime.now().strftime("Today's Date is %d-%b-%Y"),
-            summary_method="last_msg"
-        )
+def draft_po_workflow(orchestration_mssg: list, query: str, chat_summary: str):
+    print("Chat Summary:\n\n"+chat_summary)
+    if chat_summary.strip() != "":
+        print("CHAT SUMMARY:\n`"+chat_summary+"`")
 
-        orchestration_mssg = [{
-            "content": "Preparing plan for execution. Selecting relevant agents",
-            "role": "assistant",
-            "name": "optibuy_agent"
-        }
-        ]
+        final_query = f"""
+        **Chat Summary of Previous Conversation:** {chat_summary}
+        \n
+        **New  Query:** {query}
+        """
+    else:
+        final_query = query
 
-        orchestration_mssg.extend(chat_result.chat_history[1:])
+    start_time = time.time()
+    try:
+        with workflow_teams.acquire("draft_po_workflow") as team:
+            chat_result = team.agents[0].initiate_chat(
+                team.manager,
+                message="**"+final_query+"**\n\n" +
+                datetime.now().strftime("Today's Date is %d-%b-%Y"),
+                summary_method="last_msg"
+            )
 
-        return_dict = {
-            'chat_history': orchestration_mssg,
-            'chat_summary': chat_result.summary,
-            'total_time': time.time()-start_time
-        }
-        print(json.dumps(return_dict, indent=4))
+            orchestration_mssg = [{
+                "content": "Preparing plan for execution. Selecting relevant agents",
+                "role": "assistant",
+                "name": "optibuy_agent"
+            }
+            ]
+
+            orchestration_mssg.extend(chat_result.chat_history[1:])
+
+            return_dict = {
+                'chat_history': orchestration_mssg,
+                'chat_summary': chat_result.summary,
+                'total_time': time.time()-start_time
+            }
+            print(json.dumps(return_dict, indent=4))
 
     except Exception as err:
 
@@ -1006,28 +1238,75 @@ def draft_po_workflow(orchestration_mssg: list, query: str, chat_summary: str):
     return return_dict
 
 
-def route_disruption_workflow(orchestration_mssg: list, query: str, chat_summary: str):
-    print("Chat Summary:\n\n"+chat_summary)
-    if chat_summary.strip() != "":
-        print("CHAT SUMMARY:\n`"+chat_summary+"`")
+# Text results of tools that failed or found nothing ("No PO found with number ...")
+PREFETCH_MISS_PATTERN = re.compile(r"^\s*(?:Error\b|No\b[^\n]*\bfound\b)", re.IGNORECASE)
 
-        final_query = f"""
-        **Chat Summary of Previous Conversation:** {chat_summary}
-        \n
-        **New  Query:** {query}
-        """
-    else:
-        final_query = query
 
-    start_time = time.time()
-    try:
+def prefetch_miss(result) -> bool:
+    """
+    Whether a prefetched tool result is unusable: None or empty, a typed
+    result carrying a message (nothing found, bad input, error), or an error /
+    "No ... found" string.
+    """
+    if isinstance(result, BaseModel):
+        return getattr(result, "message", None) is not None
+    if isinstance(result, str):
+        return not result.strip() or bool(PREFETCH_MISS_PATTERN.match(result))
+    return not result
+
+
+def prefetch_tool_results(calls: list):
+    """
+    Run a workflow's first tool calls directly, with arguments resolved by
+    extract_entities, instead of waiting for an agent turn to read them from
+    the query.
+
+    Args:
+        calls: (agent name, tool function, kwargs) in the order the agents
+            would have called them; kwargs may be a function of the list of
+            earlier results that returns the kwargs. Consecutive calls with
+            plain kwargs run concurrently.
 
-        p2p_compliance_agent = ConversableAgent(
-            "p2p_compliance_agent",
-            llm_config={"config_list": config_list_gpt_4o_mini},
-            max_consecutive_auto_reply=3,
-            human_input_mode='NEVER',
-            system_message="""
+    Returns:
+        (text, history): the results formatted for the initial chat message,
+        and tool messages for the returned chat history. ("", []) if any call
+        fails or finds nothing, so the workflow falls back to its agents.
+    """
+    results = []
+    start = 0
+    while start < len(calls):
+        # Calls with fixed kwargs do not depend on earlier results, so each run
+        # of them (after a call that may) executes concurrently
+        end = start + 1
+        while end < len(calls) and not callable(calls[end][2]):
+            end += 1
+        batch = calls[start:end]
+        try:
+            batch = [(agent_name, tool, kwargs([r.result for r in results]) if callable(kwargs) else kwargs)
+                     for agent_name, tool, kwargs in batch]
+            batch_results = run_parallel(batch)
+        except Exception as e:
+            print(f"Prefetch of {', '.join(tool.__name__ for _, tool, _ in batch)} failed: {e}")
+            return "", []
+        if any(prefetch_miss(r.result) for r in batch_results):
+            return "", []
+        results.extend(batch_results)
+        start = end
+    # Typed results are passed on as JSON so agents can hand them to the next tool
+    text = "\n\n**Pre-fetched tool results (already run, do not call these tools again):**\n\n" + \
+        "\n\n".join(r.section() for r in results)
+    history = [r.history_message() for r in results]
+    return text, history
+
+
+@workflow_teams.register("route_disruption_workflow", data_paths=[SUPPLIER_DATA_PATH])
+def build_route_disruption_team(prefetched: bool = False):
+    p2p_compliance_agent = ConversableAgent(
+        "p2p_compliance_agent",
+        llm_config={"config_list": config_list_gpt_4o_mini},
+        max_consecutive_auto_reply=3,
+        human_input_mode='NEVER',
+        system_message="""
             # Basic Information:
             You are **p2p_compliance_agent**.
             # Role:
@@ -1035,14 +1314,14 @@ def route_disruption_workflow(orchestration_mssg: list, query: str, chat_summary
             Extract PO number from user query and pass it to the tool. If PO number is not explicitly mentioned in new query, take PO from  **Chat Summary of Previous Conversation:**
             in the format: 'PO-XXXXXX'
             """,
-        )
-
-        strategic_needs_agent = ConversableAgent(
-            "strategic_needs_agent",
-            llm_config={"config_list": config_list_gpt_4o_mini},
-            max_consecutive_auto_reply=10,
-            human_input_mode='NEVER',
-            system_message="""
+    )
+
+    strategic_needs_agent = ConversableAgent(
+        "strategic_needs_agent",
+        llm_config={"config_list": config_list_gpt_4o_mini},
+        max_consecutive_auto_reply=10,
+        human_input_mode='NEVER',
+        system_message="""
             # Basic Information:
 
             You are **strategic_needs_agent**.
@@ -1054,14 +1333,14 @@ def route_disruption_workflow(orchestration_mssg: list, query: str, chat_summary
             in the format: 'PO-XXXXXX'.
             Example: 'PO-104007'
             """,
-        )
-
-        supplier_evaluation_agent = ConversableAgent(
-            "supplier_evaluation_agent",
-            llm_config={"config_list": config_list_gpt_4o_mini},
-            max_consecutive_auto_reply=10,
-            human_input_mode='NEVER',
-            system_message="""
+    )
+
+    supplier_evaluation_agent = ConversableAgent(
+        "supplier_evaluation_agent",
+        llm_config={"config_list": config_list_gpt_4o_mini},
+        max_consecutive_auto_reply=10,
+        human_input_mode='NEVER',
+        system_message="""
             # Basic Information:
             You are **supplier_evaluation_agent**.
             # Role:
@@ -1078,28 +1357,28 @@ def route_disruption_workflow(orchestration_mssg: list, query: str, chat_summary
             - Provide all details about the Recommended Supplier: Supplier Name, Supplier Code, Item Number, Item Name, Unit Cost, Air Shipping Costs, Landed Cost per Item, Supplier ETA [by default: take 24/06/2025]
             - only after this select the best supplier basis total landed cost.
             """,
-        )
-
-        logistics_tracker_agent = ConversableAgent(
-            "logistics_tracker_agent",
-            llm_config={"config_list": config_list_gpt_4o_mini},
-            max_consecutive_auto_reply=10,
-            human_input_mode='NEVER',
-            system_message="""
+    )
+
+    logistics_tracker_agent = ConversableAgent(
+        "logistics_tracker_agent",
+        llm_config={"config_list": config_list_gpt_4o_mini},
+        max_consecutive_auto_reply=10,
+        human_input_mode='NEVER',
+        system_message="""
             Your Task is to initiate the **get_import_duties** tool to fetch exact import duties applicable for items. 
             
             # NOTE:
 
             - YOU ARE ONLY SUPPOSED TO RUN THE **get_import_duties** tool to fetch exact import duty values, do not give any other explanation.
             """,
-        )
-
-        supplier_analysis_agent = ConversableAgent(
-            "supplier_analysis_agent",
-            llm_config={"config_list": config_list_gpt_4o_mini},
-            max_consecutive_auto_reply=10,
-            human_input_mode='NEVER',
-            system_message=f"""
+    )
+
+    supplier_analysis_agent = ConversableAgent(
+        "supplier_analysis_agent",
+        llm_config={"config_list": config_list_gpt_4o_mini},
+        max_consecutive_auto_reply=10,
+        human_input_mode='NEVER',
+        system_message=f"""
             # Basic Information:
             You are **supplier_analysis_agent**.
             # Role:
@@ -1114,56 +1393,56 @@ def route_disruption_workflow(orchestration_mssg: list, query: str, chat_summary
 
             These are the delivery locations:
             
-            {pd.read_csv('./updated_docs/Supplier_data.csv')["Delivery location"].unique()}"
+            {load_csv(SUPPLIER_DATA_PATH)["Delivery location"].unique()}"
             """,
-        )
-
-        register_function(
-            get_open_po_data,
-            caller=p2p_compliance_agent,
-            executor=p2p_compliance_agent,
-            name="get_open_po_data",
-            description="Use this tool to get Data regarding Open Purchase order based on PO Number",
-        )
-
-        register_function(
-            get_best_suppliers_by_lead_cost,
-            caller=supplier_analysis_agent,
-            executor=supplier_analysis_agent,
-            name="get_best_suppliers_by_lead_cost",
-            description=f"""Use this tool to get top suppliers for a specific item to a delivery location for all supplying countries.\nWrite Item number in this format: ITM-001 or ITM-002. \nThese are the delivery locations: {pd.read_csv('./updated_docs/Supplier_data.csv')["Delivery location"].unique()}""",
-        )
-
-        register_function(
-            analyze_po_requirements,
-            caller=strategic_needs_agent,
-            executor=strategic_needs_agent,
-            name="analyze_po_requirements",
-            description=f"""Use this tool to get details about Purchase Orders that might get disrupted and production orders that might get disrupted, hence providing details on what items can be procured and by when. PO Number must always be provided in this format: PO-XXXXXX.\nExample: 'PO-104007'""",
-        )
-
-        register_function(
-            update_import_duties,
-            caller=logistics_tracker_agent,
-            executor=logistics_tracker_agent,
-            name="get_import_duties",
-            description="""Use this tool to get import duties.""",
-        )
-
-        you = UserProxyAgent(
-            "you",
-            human_input_mode="NEVER",
-            is_termination_msg=lambda x: x.get(
-                "content", "").find("TERMINATE") >= 0,
-            max_consecutive_auto_reply=0
-        )
-
-        optibuy_agent = ConversableAgent(
-            "optibuy_agent",
-            llm_config={"config_list": config_list_gpt_4o_mini},
-            max_consecutive_auto_reply=1,
-            human_input_mode='NEVER',
-            system_message=f"""
+    )
+
+    register_function(
+        get_open_po_data,
+        caller=p2p_compliance_agent,
+        executor=p2p_compliance_agent,
+        name="get_open_po_data",
+        description="Use this tool to get Data regarding Open Purchase order based on PO Number",
+    )
+
+    register_function(
+        get_best_suppliers_by_lead_cost,
+        caller=supplier_analysis_agent,
+        executor=supplier_analysis_agent,
+        name="get_best_suppliers_by_lead_cost",
+        description=f"""Use this tool to get top suppliers for a specific item to a delivery location for all supplying countries.\nWrite Item number in this format: ITM-001 or ITM-002. \nThese are the delivery locations: {load_csv(SUPPLIER_DATA_PATH)["Delivery location"].unique()}""",
+    )
+
+    register_function(
+        analyze_po_requirements,
+        caller=strategic_needs_agent,
+        executor=strategic_needs_agent,
+        name="analyze_po_requirements",
+        description=f"""Use this tool to get details about Purchase Orders that might get disrupted and production orders that might get disrupted, hence providing details on what items can be procured and by when. PO Number must always be provided in this format: PO-XXXXXX.\nExample: 'PO-104007'\nOptionally pass as_of_date ('dd/mm/yyyy') and window_days to look at a different production window; by default the window is June 2025.""",
+    )
+
+    register_function(
+        update_import_duties,
+        caller=logistics_tracker_agent,
+        executor=logistics_tracker_agent,
+        name="get_import_duties",
+        description="""Use this tool to get import duties.""",
+    )
+
+    you = UserProxyAgent(
+        "you",
+        human_input_mode="NEVER",
+        is_termination_msg=lambda x: x.get(
+            "content", "").find("TERMINATE") >= 0,
+        max_consecutive_auto_reply=0
+    )
+
+    optibuy_agent = ConversableAgent(
+        "optibuy_agent",
+        llm_config={"config_list": config_list_gpt_4o_mini},
+        max_consecutive_auto_reply=1,
+        human_input_mode='NEVER',
+        system_message=f"""
             # Role Definition
 
             You are **optibuy_agent**, an analytical reasoning agent specialized in generating structured reports and data-driven insights from tabular data.
@@ -1262,76 +1541,52 @@ def route_disruption_workflow(orchestration_mssg: list, query: str, chat_summary
             **IMPORTANT: End your response with "TERMINATE" to properly conclude the analysis workflow.**
 
             """
-        )
-
-        agent_list = [
-            you,
-            p2p_compliance_agent,
-            strategic_needs_agent,
-            logistics_tracker_agent,
-            supplier_analysis_agent,
-            supplier_evaluation_agent,
-            optibuy_agent
-        ]
-
-        transitions_list = {
-            you: [p2p_compliance_agent],
-            p2p_compliance_agent: [p2p_compliance_agent, strategic_needs_agent],
-            strategic_needs_agent: [strategic_needs_agent, supplier_analysis_agent],
-            supplier_analysis_agent: [supplier_analysis_agent, logistics_tracker_agent],
-            logistics_tracker_agent: [logistics_tracker_agent, supplier_evaluation_agent],
-            supplier_evaluation_agent: [optibuy_agent],
-            optibuy_agent: [you]
-        }
-
-        group_chat = GroupChat(
-            agents=agent_list,
-            messages=[],
-            max_round=15,
-            allowed_or_disallowed_speaker_transitions=transitions_list,
-            speaker_transitions_type="allowed"
-        )
-
-        group_chat_manager = GroupChatManager(
-            groupchat=group_chat,
-            llm_config={"config_list": config_list_gpt_4o_mini},
-        )
-
-        chat_result = agent_list[0].initiate_chat(
-            group_chat_manager,
-            message="**"+final_query+"**\n\n" +
-            datetime.now().strftime("Today's Date is %d-%b-%Y"),
-            summary_method="last_msg"
-        )
+    )
+
+    agent_list = [
+        you,
+        p2p_compliance_agent,
+        strategic_needs_agent,
+        logistics_tracker_agent,
+        supplier_analysis_agent,
+        supplier_evaluation_agent,
+        optibuy_agent
+    ]
 
-        orchestration_mssg = [{
-            "content": "Preparing plan for execution. Selecting relevant agents",
-            "role": "assistant",
-            "name": "optibuy_agent"
-        }
-        ]
+    transitions_list = {
+        you: [p2p_compliance_agent],
+        p2p_compliance_agent: [p2p_compliance_agent, strategic_needs_agent],
+        strategic_needs_agent: [strategic_needs_agent, supplier_analysis_agent],
+        supplier_analysis_agent: [supplier_analysis_agent, logistics_tracker_agent],
+        logistics_tracker_agent: [logistics_tracker_agent, supplier_evaluation_agent],
+        supplier_evaluation_agent: [optibuy_agent],
+        optibuy_agent: [you]
+    }
 
-        orchestration_mssg.extend(chat_result.chat_history[1:])
+    # The pre-fetched tool results stand in for these agents' turns
+    if prefetched:
+        for agent in (p2p_compliance_agent, strategic_needs_agent):
+            agent_list.remove(agent)
+            del transitions_list[agent]
+        transitions_list[you] = [supplier_analysis_agent]
 
-        return_dict = {
-            'chat_history': orchestration_mssg,
-            'chat_summary': chat_result.summary,
-            'total_time': time.time()-start_time
-        }
-        print(json.dumps(return_dict, indent=4))
+    group_chat = GroupChat(
+        agents=agent_list,
+        messages=[],
+        max_round=15,
+        allowed_or_disallowed_speaker_transitions=transitions_list,
+        speaker_transitions_type="allowed"
+    )
 
-    except Exception as err:
+    group_chat_manager = GroupChatManager(
+        groupchat=group_chat,
+        llm_config={"config_list": config_list_gpt_4o_mini},
+    )
 
-        print(err)
-        return_dict = {
-            'chat_history': None,
-            'chat_summary': "error while executing the agentic workflow",
-            'total_time': time.time()-start_time
-        }
-    return return_dict
+    return Team(agent_list, group_chat, group_chat_manager)
 
 
-def tariff_impact_workflow(orchestration_mssg: list, query: str, chat_summary: str):
+def route_disruption_workflow(orchestration_mssg: list, query: str, chat_summary: str):
     print("Chat Summary:\n\n"+chat_summary)
     if chat_summary.strip() != "":
         print("CHAT SUMMARY:\n`"+chat_summary+"`")
@@ -1346,13 +1601,60 @@ def tariff_impact_workflow(orchestration_mssg: list, query: str, chat_summary: s
 
     start_time = time.time()
     try:
+        # With the PO number resolved from the query, run the PO lookups of
+        # p2p_compliance_agent and strategic_needs_agent directly
+        entities = extract_entities(query, chat_summary)
+        prefetch_text, prefetch_history = "", []
+        if len(entities.po_numbers) == 1:
+            prefetch_text, prefetch_history = prefetch_tool_results([
+                ("p2p_compliance_agent", get_open_po_data, {"po_number": entities.po_numbers[0]}),
+                ("strategic_needs_agent", analyze_po_requirements, {"po_number": entities.po_numbers[0]}),
+            ])
+
+        with workflow_teams.acquire("route_disruption_workflow", bool(prefetch_history)) as team:
+            chat_result = team.agents[0].initiate_chat(
+                team.manager,
+                message="**"+final_query+"**\n\n" +
+                datetime.now().strftime("Today's Date is %d-%b-%Y") + prefetch_text,
+                summary_method="last_msg"
+            )
+
+            orchestration_mssg = [{
+                "content": "Preparing plan for execution. Selecting relevant agents",
+                "role": "assistant",
+                "name": "optibuy_agent"
+            }
+            ]
+
+            orchestration_mssg.extend(prefetch_history)
+            orchestration_mssg.extend(chat_result.chat_history[1:])
+
+            return_dict = {
+                'chat_history': orchestration_mssg,
+                'chat_summary': chat_result.summary,
+                'total_time': time.time()-start_time
+            }
+            print(json.dumps(return_dict, indent=4))
+
+    except Exception as err:
 
-        supplier_evaluation_agent = ConversableAgent(
-            "supplier_evaluation_agent",
-            llm_config={"config_list": config_list_gpt_4o_mini},
-            max_consecutive_auto_reply=10,
-            human_input_mode='NEVER',
-            system_message="""
+        print(err)
+        return_dict = {
+            'chat_history': None,
+            'chat_summary': "error while executing the agentic workflow",
+            'total_time': time.time()-start_time
+        }
+    return return_dict
+
+
+@workflow_teams.register("tariff_impact_workflow", data_paths=[SUPPLIER_DATA_PATH])
+def build_tariff_impact_team():
+    supplier_evaluation_agent = ConversableAgent(
+        "supplier_evaluation_agent",
+        llm_config={"config_list": config_list_gpt_4o_mini},
+        max_consecutive_auto_reply=10,
+        human_input_mode='NEVER',
+        system_message="""
             # Basic Information:
             You are **supplier_evaluation_agent**.
             # Role:
@@ -1366,14 +1668,14 @@ def tariff_impact_workflow(orchestration_mssg: list, query: str, chat_summary: s
             - Perform this calculation for every single supplier including supplier even if in the same country.
             - only after this select the best supplier basis total landed cost.
             """,
-        )
-
-        tariff_correction_agent = ConversableAgent(
-            "tariff_correction_agent",
-            llm_config={"config_list": config_list_gpt_4o_mini},
-            max_consecutive_auto_reply=10,
-            human_input_mode='NEVER',
-            system_message="""
+    )
+
+    tariff_correction_agent = ConversableAgent(
+        "tariff_correction_agent",
+        llm_config={"config_list": config_list_gpt_4o_mini},
+        max_consecutive_auto_reply=10,
+        human_input_mode='NEVER',
+        system_message="""
             # Basic Information:
             You are **tariff_correction_agent**.
             # Role:
@@ -1388,14 +1690,14 @@ def tariff_impact_workflow(orchestration_mssg: list, query: str, chat_summary: s
             Remember: Just change the values for which the tariffs have been updated, otherwise keep the same import duty as before,
             ensure that you share all rows [whether tariffs have been increased or not].
             """,
-        )
-
-        logistics_tracker_agent = ConversableAgent(
-            "logistics_tracker_agent",
-            llm_config={"config_list": config_list_gpt_4o_mini},
-            max_consecutive_auto_reply=10,
-            human_input_mode='NEVER',
-            system_message="""
+    )
+
+    logistics_tracker_agent = ConversableAgent(
+        "logistics_tracker_agent",
+        llm_config={"config_list": config_list_gpt_4o_mini},
+        max_consecutive_auto_reply=10,
+        human_input_mode='NEVER',
+        system_message="""
             # Basic Information:
             You are **logistics_tracker_agent**.
             # Role:
@@ -1425,14 +1727,14 @@ def tariff_impact_workflow(orchestration_mssg: list, query: str, chat_summary: s
 
                 ```
             """,
-        )
-
-        supplier_analysis_agent = ConversableAgent(
-            "supplier_analysis_agent",
-            llm_config={"config_list": config_list_gpt_4o_mini},
-            max_consecutive_auto_reply=10,
-            human_input_mode='NEVER',
-            system_message=f"""
+    )
+
+    supplier_analysis_agent = ConversableAgent(
+        "supplier_analysis_agent",
+        llm_config={"config_list": config_list_gpt_4o_mini},
+        max_consecutive_auto_reply=10,
+        human_input_mode='NEVER',
+        system_message=f"""
             # Basic Information:
             You are **supplier_analysis_agent**.
             # Role:
@@ -1442,24 +1744,24 @@ def tariff_impact_workflow(orchestration_mssg: list, query: str, chat_summary: s
 
             These are the delivery locations:
             
-            {pd.read_csv('./updated_docs/Supplier_data.csv')["Delivery location"].unique()}"
+            {load_csv(SUPPLIER_DATA_PATH)["Delivery location"].unique()}"
             """,
-        )
-
-        register_function(
-            get_best_suppliers,
-            caller=supplier_analysis_agent,
-            executor=supplier_analysis_agent,
-            name="get_best_suppliers",
-            description=f"""Use this tool to get top suppliers for a specific item to a delivery location for all supplying countries.\nWrite Item number in this format: ITM-001 or ITM-002. \nThese are the delivery locations: {pd.read_csv('./updated_docs/Supplier_data.csv')["Delivery location"].unique()}""",
-        )
-
-        register_function(
-            update_import_duties,
-            caller=logistics_tracker_agent,
-            executor=logistics_tracker_agent,
-            name="update_import_duties",
-            description="""Use this tool to get import duties. While this tool, params have to be sent in following format:
+    )
+
+    register_function(
+        get_best_suppliers,
+        caller=supplier_analysis_agent,
+        executor=supplier_analysis_agent,
+        name="get_best_suppliers",
+        description=f"""Use this tool to get top suppliers for a specific item to a delivery location for all supplying countries.\nWrite Item number in this format: ITM-001 or ITM-002. \nThese are the delivery locations: {load_csv(SUPPLIER_DATA_PATH)["Delivery location"].unique()}""",
+    )
+
+    register_function(
+        update_import_duties,
+        caller=logistics_tracker_agent,
+        executor=logistics_tracker_agent,
+        name="update_import_duties",
+        description="""Use this tool to get import duties. While this tool, params have to be sent in following format:
             
             updates (dict): A dictionary where each key is a tuple (supplier, delivery)
             and the value is the new import duty (as a string, e.g., '35%').
@@ -1472,22 +1774,22 @@ def tariff_impact_workflow(orchestration_mssg: list, query: str, chat_summary: s
 
                 ```
             """,
-        )
-
-        you = UserProxyAgent(
-            "you",
-            human_input_mode="NEVER",
-            is_termination_msg=lambda x: x.get(
-                "content", "").find("TERMINATE") >= 0,
-            max_consecutive_auto_reply=0
-        )
-
-        optibuy_agent = ConversableAgent(
-            "optibuy_agent",
-            llm_config={"config_list": config_list_gpt_4o_mini},
-            max_consecutive_auto_reply=1,
-            human_input_mode='NEVER',
-            system_message=f"""
+    )
+
+    you = UserProxyAgent(
+        "you",
+        human_input_mode="NEVER",
+        is_termination_msg=lambda x: x.get(
+            "content", "").find("TERMINATE") >= 0,
+        max_consecutive_auto_reply=0
+    )
+
+    optibuy_agent = ConversableAgent(
+        "optibuy_agent",
+        llm_config={"config_list": config_list_gpt_4o_mini},
+        max_consecutive_auto_reply=1,
+        human_input_mode='NEVER',
+        system_message=f"""
             # Role Definition
 
             You are **optibuy_agent**, an analytical reasoning agent specialized in generating structured reports and data-driven insights from tabular data.
@@ -1586,74 +1888,43 @@ def tariff_impact_workflow(orchestration_mssg: list, query: str, chat_summary: s
             **IMPORTANT: End your response with "TERMINATE" to properly conclude the analysis workflow.**
 
             """
-        )
-
-        agent_list = [
-            you,
-            tariff_correction_agent,
-            logistics_tracker_agent,
-            supplier_analysis_agent,
-            supplier_evaluation_agent,
-            optibuy_agent
-        ]
-
-        transitions_list = {
-            you: [supplier_analysis_agent],
-            supplier_analysis_agent: [logistics_tracker_agent],
-            logistics_tracker_agent: [logistics_tracker_agent, tariff_correction_agent],
-            tariff_correction_agent: [supplier_evaluation_agent],
-            supplier_evaluation_agent: [optibuy_agent],
-            optibuy_agent: [you]
-        }
-
-        group_chat = GroupChat(
-            agents=agent_list,
-            messages=[],
-            max_round=25,
-            allowed_or_disallowed_speaker_transitions=transitions_list,
-            speaker_transitions_type="allowed"
-        )
-
-        group_chat_manager = GroupChatManager(
-            groupchat=group_chat,
-            llm_config={"config_list": config_list_gpt_4o_mini},
-        )
-
-        chat_result = agent_list[0].initiate_chat(
-            group_chat_manager,
-            message="**"+final_query+"**\n\n" +
-            datetime.now().strftime("Today's Date is %d-%b-%Y"),
-            summary_method="last_msg"
-        )
-
-        orchestration_mssg = [{
-            "content": "Preparing plan for execution. Selecting relevant agents",
-            "role": "assistant",
-            "name": "optibuy_agent"
-        }
-        ]
+    )
+
+    agent_list = [
+        you,
+        tariff_correction_agent,
+        logistics_tracker_agent,
+        supplier_analysis_agent,
+        supplier_evaluation_agent,
+        optibuy_agent
+    ]
 
-        orchestration_mssg.extend(chat_result.chat_history[1:])
+    transitions_list = {
+        you: [supplier_analysis_agent],
+        supplier_analysis_agent: [logistics_tracker_agent],
+        logistics_tracker_agent: [logistics_tracker_agent, tariff_correction_agent],
+        tariff_correction_agent: [supplier_evaluation_agent],
+        supplier_evaluation_agent: [optibuy_agent],
+        optibuy_agent: [you]
+    }
 
-        return_dict = {
-            'chat_history': orchestration_mssg,
-            'chat_summary': chat_result.summary,
-            'total_time': time.time()-start_time
-        }
-        print(json.dumps(return_dict, indent=4))
+    group_chat = GroupChat(
+        agents=agent_list,
+        messages=[],
+        max_round=25,
+        allowed_or_disallowed_speaker_transitions=transitions_list,
+        speaker_transitions_type="allowed"
+    )
 
-    except Exception as err:
+    group_chat_manager = GroupChatManager(
+        groupchat=group_chat,
+        llm_config={"config_list": config_list_gpt_4o_mini},
+    )
 
-        print(err)
-        return_dict = {
-            'chat_history': None,
-            'chat_summary': "error while executing the agentic workflow",
-            'total_time': time.time()-start_time
-        }
-    return return_dict
+    return Team(agent_list, group_chat, group_chat_manager)
 
 
-def expedite_supply_workflow(orchestration_mssg: list, query: str, chat_summary: str):
+def tariff_impact_workflow(orchestration_mssg: list, query: str, chat_summary: str):
     print("Chat Summary:\n\n"+chat_summary)
     if chat_summary.strip() != "":
         print("CHAT SUMMARY:\n`"+chat_summary+"`")
@@ -1668,13 +1939,49 @@ def expedite_supply_workflow(orchestration_mssg: list, query: str, chat_summary:
 
     start_time = time.time()
     try:
+        with workflow_teams.acquire("tariff_impact_workflow") as team:
+            chat_result = team.agents[0].initiate_chat(
+                team.manager,
+                message="**"+final_query+"**\n\n" +
+                datetime.now().strftime("Today's Date is %d-%b-%Y"),
+                summary_method="last_msg"
+            )
+
+            orchestration_mssg = [{
+                "content": "Preparing plan for execution. Selecting relevant agents",
+                "role": "assistant",
+                "name": "optibuy_agent"
+            }
+            ]
+
+            orchestration_mssg.extend(chat_result.chat_history[1:])
+
+            return_dict = {
+                'chat_history': orchestration_mssg,
+                'chat_summary': chat_result.summary,
+                'total_time': time.time()-start_time
+            }
+            print(json.dumps(return_dict, indent=4))
+
+    except Exception as err:
+
+        print(err)
+        return_dict = {
+            'chat_history': None,
+            'chat_summary': "error while executing the agentic workflow",
+            'total_time': time.time()-start_time
+        }
+    return return_dict
 
-        p2p_compliance_agent = ConversableAgent(
-            "p2p_compliance_agent",
-            llm_config={"config_list": config_list_gpt_4o_mini},
-            max_consecutive_auto_reply=3,
-            human_input_mode='NEVER',
-            system_message="""
+
+@workflow_teams.register("expedite_supply_workflow")
+def build_expedite_supply_team():
+    p2p_compliance_agent = ConversableAgent(
+        "p2p_compliance_agent",
+        llm_config={"config_list": config_list_gpt_4o_mini},
+        max_consecutive_auto_reply=3,
+        human_input_mode='NEVER',
+        system_message="""
             # Basic Information:
                 You are **p2p_compliance_agent**.
             # Role:
@@ -1683,14 +1990,14 @@ def expedite_supply_workflow(orchestration_mssg: list, query: str, chat_summary:
                 "If PO number is not explicitly mentioned in new query, take PO from Chat Summary "
                 "in the format: 'PO-XXXXXX'."
             """,
-        )
-
-        logistics_tracker_agent = ConversableAgent(
-            "logistics_tracker_agent",
-            llm_config={"config_list": config_list_gpt_4o_mini},
-            max_consecutive_auto_reply=3,
-            human_input_mode='NEVER',
-            system_message="""
+    )
+
+    logistics_tracker_agent = ConversableAgent(
+        "logistics_tracker_agent",
+        llm_config={"config_list": config_list_gpt_4o_mini},
+        max_consecutive_auto_reply=3,
+        human_input_mode='NEVER',
+        system_message="""
             # Role: logistics_tracker_agent
                 
                 You are the **logistics_tracker_agent**.  
@@ -1713,68 +2020,68 @@ def expedite_supply_workflow(orchestration_mssg: list, query: str, chat_summary:
                 - **User:** "Tell me the lead time for bulk shipments from India to USA."  
                 **Agent:** Choose **Sea** → call `get_avg_lead_time(mode="Sea")`.
             """,
-        )
-
-        supplier_analysis_agent = ConversableAgent(
-            "supplier_analysis_agent",
-            llm_config={"config_list": config_list_gpt_4o_mini},
-            max_consecutive_auto_reply=3,
-            human_input_mode='NEVER',
-            system_message="""
+    )
+
+    supplier_analysis_agent = ConversableAgent(
+        "supplier_analysis_agent",
+        llm_config={"config_list": config_list_gpt_4o_mini},
+        max_consecutive_auto_reply=3,
+        human_input_mode='NEVER',
+        system_message="""
             # Basic Information:
             You are **supplier_analysis_agent**.
             # Role:
             Your task is to initiate the **expedite_po_tool** tool that is alloted to you. Extract PO number from user query and pass it to the tool.
             in the format: 'PO-XXXXXX'
             """,
-        )
-
-        register_function(
-            get_avg_lead_time,
-            caller=logistics_tracker_agent,
-            executor=logistics_tracker_agent,
-            name="get_avg_lead_time",
-            description="Use this tool to get average lead times for open purchase orders",
-        )
-
-        register_function(
-            get_open_po_data,
-            caller=p2p_compliance_agent,
-            executor=p2p_compliance_agent,
-            name="get_open_po_data",
-            description="Use this tool to get Data regarding Open Purchase order based on PO Number",
-        )
-
-        register_function(
-            expedite_po_by_lead,
-            caller=supplier_analysis_agent,
-            executor=supplier_analysis_agent,
-            name="expedite_po_by_lead",
-            description="Helps in calculating expedite options on the basis of, fastest shipping possible (always go for this in case they just mention expedite a purchase order)",
-        )
-
-        register_function(
-            expedite_po_by_cost,
-            caller=supplier_analysis_agent,
-            executor=supplier_analysis_agent,
-            name="expedite_po_by_cost",
-            description="Helps in calculating expedite options on the basis of low impact on cost, (go for this tool only if users asks for partial expediting or alternate expediting suggestion.)",
-        )
-
-        you = UserProxyAgent(
-            "you",
-            human_input_mode="NEVER",
-            is_termination_msg=lambda x: x.get(
-                "content", "").find("TERMINATE") >= 0,
-            max_consecutive_auto_reply=0
-        )
-
-        optibuy_agent = ConversableAgent(
-            "optibuy_agent",
-            llm_config={"config_list": config_list_gpt_4o_mini},
-            max_consecutive_auto_reply=1,
-            human_input_mode='NEVER',
-            system_message=f"""
+    )
+
+    register_function(
+        get_avg_lead_time,
+        caller=logistics_tracker_agent,
+        executor=logistics_tracker_agent,
+        name="get_avg_lead_time",
+        description="Use this tool to get average lead times for open purchase orders",
+    )
+
+    register_function(
+        get_open_po_data,
+        caller=p2p_compliance_agent,
+        executor=p2p_compliance_agent,
+        name="get_open_po_data",
+        description="Use this tool to get Data regarding Open Purchase order based on PO Number",
+    )
+
+    register_function(
+        expedite_po_by_lead,
+        caller=supplier_analysis_agent,
+        executor=supplier_analysis_agent,
+        name="expedite_po_by_lead",
+        description="Helps in calculating expedite options on the basis of, fastest shipping possible (always go for this in case they just mention expedite a purchase order)",
+    )
+
+    register_function(
+        expedite_po_by_cost,
+        caller=supplier_analysis_agent,
+        executor=supplier_analysis_agent,
+        name="expedite_po_by_cost",
+        description="Helps in calculating expedite options on the basis of low impact on cost, (go for this tool only if users asks for partial expediting or alternate expediting suggestion.)",
+    )
+
+    you = UserProxyAgent(
+        "you",
+        human_input_mode="NEVER",
+        is_termination_msg=lambda x: x.get(
+            "content", "").find("TERMINATE") >= 0,
+        max_consecutive_auto_reply=0
+    )
+
+    optibuy_agent = ConversableAgent(
+        "optibuy_agent",
+        llm_config={"config_list": config_list_gpt_4o_mini},
+        max_consecutive_auto_reply=1,
+        human_input_mode='NEVER',
+        system_message=f"""
             # Role Definition
 
             You are **optibuy_agent**, an analytical reasoning agent specialized in generating structured reports and data-driven insights from tabular data.
@@ -1873,74 +2180,43 @@ def expedite_supply_workflow(orchestration_mssg: list, query: str, chat_summary:
             **IMPORTANT: End your response with "TERMINATE" to properly conclude the analysis workflow.**
 
             """
-        )
-
-        agent_list = [
-            you,
-            p2p_compliance_agent,
-            logistics_tracker_agent,
-            supplier_analysis_agent,
-            optibuy_agent
-        ]
-
-        transitions_list = {
-            you: [
-                p2p_compliance_agent
-            ],
-            p2p_compliance_agent: [p2p_compliance_agent, logistics_tracker_agent],
-            logistics_tracker_agent: [logistics_tracker_agent, supplier_analysis_agent],
-            supplier_analysis_agent: [supplier_analysis_agent, optibuy_agent],
-            optibuy_agent: [you]
-        }
-
-        group_chat = GroupChat(
-            agents=agent_list,
-            messages=[],
-            max_round=15,
-            allowed_or_disallowed_speaker_transitions=transitions_list,
-            speaker_transitions_type="allowed"
-        )
-
-        group_chat_manager = GroupChatManager(
-            groupchat=group_chat,
-            llm_config={"config_list": config_list_gpt_4o_mini}
-        )
-
-        chat_result = agent_list[0].initiate_chat(
-            group_chat_manager,
-            message="**"+final_query+"**\n\n" +
-            datetime.now().strftime("Today's Date is %d-%b-%Y"),
-            summary_method="last_msg"
-        )
-
-        orchestration_mssg = [{
-            "content": "Preparing plan for execution. Selecting relevant agents",
-            "role": "assistant",
-            "name": "optibuy_agent"
-        }
-        ]
+    )
+
+    agent_list = [
+        you,
+        p2p_compliance_agent,
+        logistics_tracker_agent,
+        supplier_analysis_agent,
+        optibuy_agent
+    ]
 
-        orchestration_mssg.extend(chat_result.chat_history[1:])
+    transitions_list = {
+        you: [
+            p2p_compliance_agent
+        ],
+        p2p_compliance_agent: [p2p_compliance_agent, logistics_tracker_agent],
+        logistics_tracker_agent: [logistics_tracker_agent, supplier_analysis_agent],
+        supplier_analysis_agent: [supplier_analysis_agent, optibuy_agent],
+        optibuy_agent: [you]
+    }
 
-        return_dict = {
-            'chat_history': orchestration_mssg,
-            'chat_summary': chat_result.summary,
-            'total_time': time.time()-start_time
-        }
-        print(json.dumps(return_dict, indent=4))
+    group_chat = GroupChat(
+        agents=agent_list,
+        messages=[],
+        max_round=15,
+        allowed_or_disallowed_speaker_transitions=transitions_list,
+        speaker_transitions_type="allowed"
+    )
 
-    except Exception as err:
+    group_chat_manager = GroupChatManager(
+        groupchat=group_chat,
+        llm_config={"config_list": config_list_gpt_4o_mini}
+    )
 
-        print(err)
-        return_dict = {
-            'chat_history': None,
-            'chat_summary': "error while executing the agentic workflow",
-            'total_time': time.time()-start_time
-        }
-    return return_dict
+    return Team(agent_list, group_chat, group_chat_manager)
 
 
-def extract_invoice_details_workflow(orchestration_mssg: list, query: str, chat_summary: str):
+def expedite_supply_workflow(orchestration_mssg: list, query: str, chat_summary: str):
     print("Chat Summary:\n\n"+chat_summary)
     if chat_summary.strip() != "":
         print("CHAT SUMMARY:\n`"+chat_summary+"`")
@@ -1955,13 +2231,49 @@ def extract_invoice_details_workflow(orchestration_mssg: list, query: str, chat_
 
     start_time = time.time()
     try:
+        with workflow_teams.acquire("expedite_supply_workflow") as team:
+            chat_result = team.agents[0].initiate_chat(
+                team.manager,
+                message="**"+final_query+"**\n\n" +
+                datetime.now().strftime("Today's Date is %d-%b-%Y"),
+                summary_method="last_msg"
+            )
 
-        p2p_compliance_agent = ConversableAgent(
-            "p2p_compliance_agent",
-            llm_config={"config_list": config_list_gpt_4o_mini},
-            max_consecutive_auto_reply=3,
-            human_input_mode='NEVER',
-            system_message="""
+            orchestration_mssg = [{
+                "content": "Preparing plan for execution. Selecting relevant agents",
+                "role": "assistant",
+                "name": "optibuy_agent"
+            }
+            ]
+
+            orchestration_mssg.extend(chat_result.chat_history[1:])
+
+            return_dict = {
+                'chat_history': orchestration_mssg,
+                'chat_summary': chat_result.summary,
+                'total_time': time.time()-start_time
+            }
+            print(json.dumps(return_dict, indent=4))
+
+    except Exception as err:
+
+        print(err)
+        return_dict = {
+            'chat_history': None,
+            'chat_summary': "error while executing the agentic workflow",
+            'total_time': time.time()-start_time
+        }
+    return return_dict
+
+
+@workflow_teams.register("extract_invoice_details_workflow")
+def build_extract_invoice_details_team():
+    p2p_compliance_agent = ConversableAgent(
+        "p2p_compliance_agent",
+        llm_config={"config_list": config_list_gpt_4o_mini},
+        max_consecutive_auto_reply=3,
+        human_input_mode='NEVER',
+        system_message="""
             # Basic Information:
             You are **p2p_compliance_agent**.
             # Role:
@@ -1970,14 +2282,14 @@ def extract_invoice_details_workflow(orchestration_mssg: list, query: str, chat_
             
             PO in the format: 'PO-XXXXXX'
             """,
-        )
-
-        documentation_agent = ConversableAgent(
-            "documentation_agent",
-            llm_config={"config_list": config_list_gpt_4o_mini},
-            max_consecutive_auto_reply=10,
-            human_input_mode='NEVER',
-            system_message="""
+    )
+
+    documentation_agent = ConversableAgent(
+        "documentation_agent",
+        llm_config={"config_list": config_list_gpt_4o_mini},
+        max_consecutive_auto_reply=10,
+        human_input_mode='NEVER',
+        system_message="""
             # Basic Information:
 
             You are **documentation_agent**.
@@ -1986,14 +2298,14 @@ def extract_invoice_details_workflow(orchestration_mssg: list, query: str, chat_
             
             Your job is to run the **extract_invoice_details** tool to extract details present in invoice.
             """,
-        )
-
-        logistics_tracker_agent = ConversableAgent(
-            "logistics_tracker_agent",
-            llm_config={"config_list": config_list_gpt_4o_mini},
-            max_consecutive_auto_reply=10,
-            human_input_mode='NEVER',
-            system_message="""
+    )
+
+    logistics_tracker_agent = ConversableAgent(
+        "logistics_tracker_agent",
+        llm_config={"config_list": config_list_gpt_4o_mini},
+        max_consecutive_auto_reply=10,
+        human_input_mode='NEVER',
+        system_message="""
             # Basic Information:
 
             You are **logistics_tracker_agent**.
@@ -2028,38 +2340,38 @@ def extract_invoice_details_workflow(orchestration_mssg: list, query: str, chat_
             | Taiwan           | USA                | 15%         |
             | Taiwan           | Taiwan             | 0%          |
             """,
-        )
-
-        register_function(
-            get_po_grn_details,
-            caller=p2p_compliance_agent,
-            executor=p2p_compliance_agent,
-            name="get_po_grn_details",
-            description="Use this tool to get Data regarding Purchase order based on PO Number and Goods Recieved Note based on GRN.",
-        )
-
-        register_function(
-            extract_invoice_details,
-            caller=documentation_agent,
-            executor=documentation_agent,
-            name="extract_invoice_details",
-            description="""Use this tool to extract all details from the Invoice PDF.""",
-        )
-
-        you = UserProxyAgent(
-            "you",
-            human_input_mode="NEVER",
-            is_termination_msg=lambda x: x.get(
-                "content", "").find("TERMINATE") >= 0,
-            max_consecutive_auto_reply=0
-        )
-
-        optibuy_agent = ConversableAgent(
-            "optibuy_agent",
-            llm_config={"config_list": config_list_gpt_4o_mini},
-            max_consecutive_auto_reply=1,
-            human_input_mode='NEVER',
-            system_message=f"""
+    )
+
+    register_function(
+        get_po_grn_details,
+        caller=p2p_compliance_agent,
+        executor=p2p_compliance_agent,
+        name="get_po_grn_details",
+        description="Use this tool to get Data regarding Purchase order based on PO Number and Goods Recieved Note based on GRN.",
+    )
+
+    register_function(
+        extract_invoice_details,
+        caller=documentation_agent,
+        executor=documentation_agent,
+        name="extract_invoice_details",
+        description="""Use this tool to extract all details from the Invoice PDF.""",
+    )
+
+    you = UserProxyAgent(
+        "you",
+        human_input_mode="NEVER",
+        is_termination_msg=lambda x: x.get(
+            "content", "").find("TERMINATE") >= 0,
+        max_consecutive_auto_reply=0
+    )
+
+    optibuy_agent = ConversableAgent(
+        "optibuy_agent",
+        llm_config={"config_list": config_list_gpt_4o_mini},
+        max_consecutive_auto_reply=1,
+        human_input_mode='NEVER',
+        system_message=f"""
             # Role Definition
 
             You are **optibuy_agent**, an analytical reasoning agent specialized in generating structured reports and data-driven insights from tabular data.
@@ -2159,75 +2471,44 @@ def extract_invoice_details_workflow(orchestration_mssg: list, query: str, chat_
             You are now ready to receive a query from `you` and all associated tables. Produce your “table → insight” series in one concise, data-grounded response.
 
             """,
-        )
-
-        agent_list = [
-            you,
-            documentation_agent,
-            p2p_compliance_agent,
-            logistics_tracker_agent,
-            optibuy_agent
-        ]
-
-        transitions_list = {
-            you: [documentation_agent, logistics_tracker_agent],
-            documentation_agent: [documentation_agent, p2p_compliance_agent],
-            p2p_compliance_agent: [p2p_compliance_agent, optibuy_agent],
-            logistics_tracker_agent: [logistics_tracker_agent, optibuy_agent],
-            optibuy_agent: [you]
-        }
+    )
+
+    agent_list = [
+        you,
+        documentation_agent,
+        p2p_compliance_agent,
+        logistics_tracker_agent,
+        optibuy_agent
+    ]
 
-        group_chat = GroupChat(
-            agents=agent_list,
-            messages=[],
-            max_round=15,
-            allowed_or_disallowed_speaker_transitions=transitions_list,
-            speaker_transitions_type="allowed"
-        )
+    transitions_list = {
+        you: [documentation_agent, logistics_tracker_agent],
+        documentation_agent: [documentation_agent, p2p_compliance_agent],
+        p2p_compliance_agent: [p2p_compliance_agent, optibuy_agent],
+        logistics_tracker_agent: [logistics_tracker_agent, optibuy_agent],
+        optibuy_agent: [you]
+    }
 
-        group_chat_manager = GroupChatManager(
-            groupchat=group_chat,
-            llm_config={"config_list": config_list_gpt_4o_mini},
-            system_message=f"""
+    group_chat = GroupChat(
+        agents=agent_list,
+        messages=[],
+        max_round=15,
+        allowed_or_disallowed_speaker_transitions=transitions_list,
+        speaker_transitions_type="allowed"
+    )
+
+    group_chat_manager = GroupChatManager(
+        groupchat=group_chat,
+        llm_config={"config_list": config_list_gpt_4o_mini},
+        system_message=f"""
             Choose p2p_compliance agent if user asks for Three way PO matching with Invoice and GRN Note. Choose logistics tracker agent only if user asks to check tax value and total landing cost.
             """
-        )
-
-        chat_result = agent_list[0].initiate_chat(
-            group_chat_manager,
-            message="**"+final_query+"**\n\n" +
-            datetime.now().strftime("Today's Date is %d-%b-%Y"),
-            summary_method="last_msg"
-        )
-
-        orchestration_mssg = [{
-            "content": "Preparing plan for execution. Selecting relevant agents",
-            "role": "assistant",
-            "name": "optibuy_agent"
-        }
-        ]
+    )
 
-        orchestration_mssg.extend(chat_result.chat_history[1:])
-
-        return_dict = {
-            'chat_history': orchestration_mssg,
-            'chat_summary': chat_result.summary,
-            'total_time': time.time()-start_time
-        }
-        print(json.dumps(return_dict, indent=4))
-
-    except Exception as err:
-
-        print(err)
-        return_dict = {
-            'chat_history': None,
-            'chat_summary': "error while executing the agentic workflow",
-            'total_time': time.time()-start_time
-        }
-    return return_dict
+    return Team(agent_list, group_chat, group_chat_manager)
 
 
-def seek_supplier_correction_email_workflow(orchestration_mssg: list, query: str, chat_summary: str):
+def extract_invoice_details_workflow(orchestration_mssg: list, query: str, chat_summary: str):
     print("Chat Summary:\n\n"+chat_summary)
     if chat_summary.strip() != "":
         print("CHAT SUMMARY:\n`"+chat_summary+"`")
@@ -2242,13 +2523,49 @@ def seek_supplier_correction_email_workflow(orchestration_mssg: list, query: str
 
     start_time = time.time()
     try:
+        with workflow_teams.acquire("extract_invoice_details_workflow") as team:
+            chat_result = team.agents[0].initiate_chat(
+                team.manager,
+                message="**"+final_query+"**\n\n" +
+                datetime.now().strftime("Today's Date is %d-%b-%Y"),
+                summary_method="last_msg"
+            )
+
+            orchestration_mssg = [{
+                "content": "Preparing plan for execution. Selecting relevant agents",
+                "role": "assistant",
+                "name": "optibuy_agent"
+            }
+            ]
+
+            orchestration_mssg.extend(chat_result.chat_history[1:])
+
+            return_dict = {
+                'chat_history': orchestration_mssg,
+                'chat_summary': chat_result.summary,
+                'total_time': time.time()-start_time
+            }
+            print(json.dumps(return_dict, indent=4))
+
+    except Exception as err:
 
-        email_sending_agent = ConversableAgent(
-            "email_sending_agent",
-            llm_config={"config_list": config_list_gpt_4o_mini},
-            max_consecutive_auto_reply=3,
-            human_input_mode='NEVER',
-            system_message=f"""
+        print(err)
+        return_dict = {
+            'chat_history': None,
+            'chat_summary': "error while executing the agentic workflow",
+            'total_time': time.time()-start_time
+        }
+    return return_dict
+
+
+@workflow_teams.register("seek_supplier_correction_email_workflow")
+def build_seek_supplier_correction_email_team():
+    email_sending_agent = ConversableAgent(
+        "email_sending_agent",
+        llm_config={"config_list": config_list_gpt_4o_mini},
+        max_consecutive_auto_reply=3,
+        human_input_mode='NEVER',
+        system_message=f"""
             You are **email\_sending\_agent**.
 
             Your Task is to seek clarification from the supplier on incorrect values present in their Invoice when compared with the GRN
@@ -2406,7 +2723,7 @@ def seek_supplier_correction_email_workflow(orchestration_mssg: list, query: str
       <div class="accent-bar"></div>
       <div class="card-header">
         <h2>Inaccuracies in Invoice: [Invoice Number]</h2>
-        <p class="date"><strong>Date:</strong> {datetime.now().strftime('%d-%m-%Y ( at %H:%M )')}</p>
+        <p class="date"><strong>Date:</strong> {CURRENT_TIME}</p>
         <p>Authorized by Procurement Mananger: <b>Priya Sharma</b></p>
       </div>
       <div class="card-body">
@@ -2436,69 +2753,88 @@ Also Provide a Subject Line for the same.
 
 Also Provide a post sending message for the same
             """,
-        )
+    )
+
+    register_function(
+        email_sending_tool_generic,
+        caller=email_sending_agent,
+        executor=email_sending_agent,
+        name="email_sending_tool_generic",
+        description="Send an email using this tool only if user confirms/authorises you to send the email. Pass the Subject First and then the HTML_BODY",
+    )
+
+    you = UserProxyAgent(
+        "you",
+        human_input_mode="NEVER",
+        is_termination_msg=lambda x: x.get(
+            "content", "").find("TERMINATE") >= 0,
+        max_consecutive_auto_reply=0
+    )
+
+    agent_list = [
+        you,
+        email_sending_agent
+    ]
 
-        register_function(
-            email_sending_tool_generic,
-            caller=email_sending_agent,
-            executor=email_sending_agent,
-            name="email_sending_tool_generic",
-            description="Send an email using this tool only if user confirms/authorises you to send the email. Pass the Subject First and then the HTML_BODY",
-        )
+    transitions_list = {
+        you: [email_sending_agent],
+        email_sending_agent: [you]
+    }
 
-        you = UserProxyAgent(
-            "you",
-            human_input_mode="NEVER",
-            is_termination_msg=lambda x: x.get(
-                "content", "").find("TERMINATE") >= 0,
-            max_consecutive_auto_reply=0
-        )
+    group_chat = GroupChat(
+        agents=agent_list,
+        messages=[],
+        max_round=15,
+        allowed_or_disallowed_speaker_transitions=transitions_list,
+        speaker_transitions_type="allowed"
+    )
 
-        agent_list = [
-            you,
-            email_sending_agent
-        ]
+    group_chat_manager = GroupChatManager(
+        groupchat=group_chat,
+        llm_config={"config_list": config_list_gpt_4o_mini},
+    )
 
-        transitions_list = {
-            you: [email_sending_agent],
-            email_sending_agent: [you]
-        }
+    return Team(agent_list, group_chat, group_chat_manager)
 
-        group_chat = GroupChat(
-            agents=agent_list,
-            messages=[],
-            max_round=15,
-            allowed_or_disallowed_speaker_transitions=transitions_list,
-            speaker_transitions_type="allowed"
-        )
 
-        group_chat_manager = GroupChatManager(
-            groupchat=group_chat,
-            llm_config={"config_list": config_list_gpt_4o_mini},
-        )
+def seek_supplier_correction_email_workflow(orchestration_mssg: list, query: str, chat_summary: str):
+    print("Chat Summary:\n\n"+chat_summary)
+    if chat_summary.strip() != "":
+        print("CHAT SUMMARY:\n`"+chat_summary+"`")
 
-        chat_result = agent_list[0].initiate_chat(
-            group_chat_manager,
-            message="**"+final_query+"**\n\n" +
-            datetime.now().strftime("Today's Date is %d-%b-%Y"),
-            summary_method="last_msg"
-        )
+        final_query = f"""
+        **Chat Summary of Previous Conversation:** {chat_summary}
+        \n
+        **New  Query:** {query}
+        """
+    else:
+        final_query = query
 
-        orchestration_mssg = [{
-            "content": "Preparing plan for execution. Selecting relevant agents",
-            "role": "assistant",
-            "name": "optibuy_agent"
-        }
-        ]
+    start_time = time.time()
+    try:
+        with workflow_teams.acquire("seek_supplier_correction_email_workflow") as team:
+            chat_result = team.agents[0].initiate_chat(
+                team.manager,
+                message="**"+final_query+"**\n\n" +
+                datetime.now().strftime("Today's Date is %d-%b-%Y"),
+                summary_method="last_msg"
+            )
 
-        orchestration_mssg.extend(chat_result.chat_history[1:])
+            orchestration_mssg = [{
+                "content": "Preparing plan for execution. Selecting relevant agents",
+                "role": "assistant",
+                "name": "optibuy_agent"
+            }
+            ]
 
-        return_dict = {
-            'chat_history': orchestration_mssg,
-            'chat_summary': chat_result.summary,
-            'total_time': time.time()-start_time
-        }
-        print(json.dumps(return_dict, indent=4))
+            orchestration_mssg.extend(chat_result.chat_history[1:])
+
+            return_dict = {
+                'chat_history': orchestration_mssg,
+                'chat_summary': chat_result.summary,
+                'total_time': time.time()-start_time
+            }
+            print(json.dumps(return_dict, indent=4))
 
     except Exception as err:
 
@@ -2511,41 +2847,27 @@ Also Provide a post sending message for the same
     return return_dict
 
 
-def read_pr_emails_workflow(orchestration_mssg: list, query: str, chat_summary: str):
-    print("Chat Summary:\n\n"+chat_summary)
-    if chat_summary.strip() != "":
-        print("CHAT SUMMARY:\n`"+chat_summary+"`")
-
-        final_query = f"""
-        **Chat Summary of Previous Conversation:** {chat_summary}
-        \n
-        **New  Query:** {query}
-        """
-    else:
-        final_query = query
-
-    start_time = time.time()
-    try:
-
-        email_agent = ConversableAgent(
-            "email_agent",
-            llm_config={"config_list": config_list_gpt_4o_mini},
-            max_consecutive_auto_reply=3,
-            human_input_mode='NEVER',
-            system_message="""
+@workflow_teams.register("read_pr_emails_workflow")
+def build_read_pr_emails_team():
+    email_agent = ConversableAgent(
+        "email_agent",
+        llm_config={"config_list": config_list_gpt_4o_mini},
+        max_consecutive_auto_reply=3,
+        human_input_mode='NEVER',
+        system_message="""
             
 Read PR Request emails and send them to **p2p_compliance_agent** to extract so that it can be prepared for PR release.
 
 
             """,
-        )
-
-        p2p_compliance_agent = ConversableAgent(
-            "p2p_compliance_agent",
-            llm_config={"config_list": config_list_gpt_4o_mini},
-            max_consecutive_auto_reply=3,
-            human_input_mode='NEVER',
-            system_message=f"""
+    )
+
+    p2p_compliance_agent = ConversableAgent(
+        "p2p_compliance_agent",
+        llm_config={"config_list": config_list_gpt_4o_mini},
+        max_consecutive_auto_reply=3,
+        human_input_mode='NEVER',
+        system_message=f"""
             
             You are an information extraction assistant. When given a request message related to procurement or purchase requisition, extract and return the following details in a clean, structured format. Ensure all field names and their corresponding values are displayed exactly as specified below:
 
@@ -2577,7 +2899,7 @@ Read PR Request emails and send them to **p2p_compliance_agent** to extract so t
 
             - Related Production Order
 
-            - Priority: [Guess based on current date: {datetime.now().strftime('%d-%m-%Y ( at %H:%M )')} and Need by Date. By Default: High]
+            - Priority: [Guess based on current date: {CURRENT_TIME} and Need by Date. By Default: High]
 
             ## Formatting Instructions:
 
@@ -2595,14 +2917,14 @@ Read PR Request emails and send them to **p2p_compliance_agent** to extract so t
             You are talking to Procurement Manager: Priya Sharma. Finally in a professional manner ask if the user wants to release the PR with above details.
 
             """,
-        )
-
-        optibuy_agent = ConversableAgent(
-            "optibuy_agent",
-            llm_config={"config_list": config_list_gpt_4o_mini},
-            max_consecutive_auto_reply=1,
-            human_input_mode='NEVER',
-            system_message=f"""
+    )
+
+    optibuy_agent = ConversableAgent(
+        "optibuy_agent",
+        llm_config={"config_list": config_list_gpt_4o_mini},
+        max_consecutive_auto_reply=1,
+        human_input_mode='NEVER',
+        system_message=f"""
             # Role Definition
 
             You are **optibuy_agent**, an analytical reasoning agent specialized in generating structured reports and data-driven insights from tabular data.
@@ -2670,86 +2992,55 @@ Read PR Request emails and send them to **p2p_compliance_agent** to extract so t
             You are now ready to receive a query from `you` and all associated tables. Produce your “table → insight” series in one concise, data-grounded response.
 
             """
-        )
-
-        register_function(
-            fetch_pr_emails,
-            caller=email_agent,
-            executor=email_agent,
-            name="fetch_pr_emails",
-            description="Use this tool to read unread Purchase Requistion request emails.",
-        )
-
-        you = UserProxyAgent(
-            "you",
-            human_input_mode="NEVER",
-            is_termination_msg=lambda x: x.get(
-                "content", "").find("TERMINATE") >= 0,
-            max_consecutive_auto_reply=0
-        )
-
-        agent_list = [
-            you,
-            email_agent,
-            p2p_compliance_agent,
-            optibuy_agent
-        ]
-
-        transitions_list = {
-            you: [email_agent],
-            email_agent: [p2p_compliance_agent],
-            p2p_compliance_agent: [optibuy_agent],
-            optibuy_agent: [you]
-        }
-
-        group_chat = GroupChat(
-            agents=agent_list,
-            messages=[],
-            max_round=15,
-            allowed_or_disallowed_speaker_transitions=transitions_list,
-            speaker_transitions_type="allowed"
-        )
-
-        group_chat_manager = GroupChatManager(
-            groupchat=group_chat,
-            llm_config={"config_list": config_list_gpt_4o_mini},
-        )
-
-        chat_result = agent_list[0].initiate_chat(
-            group_chat_manager,
-            message="**"+final_query+"**\n\n" +
-            datetime.now().strftime("Today's Date is %d-%b-%Y"),
-            summary_method="last_msg"
-        )
-
-        orchestration_mssg = [{
-            "content": "Preparing plan for execution. Selecting relevant agents",
-            "role": "assistant",
-            "name": "optibuy_agent"
-        }
-        ]
+    )
+
+    register_function(
+        fetch_pr_emails,
+        caller=email_agent,
+        executor=email_agent,
+        name="fetch_pr_emails",
+        description="Use this tool to read unread Purchase Requistion request emails.",
+    )
+
+    you = UserProxyAgent(
+        "you",
+        human_input_mode="NEVER",
+        is_termination_msg=lambda x: x.get(
+            "content", "").find("TERMINATE") >= 0,
+        max_consecutive_auto_reply=0
+    )
+
+    agent_list = [
+        you,
+        email_agent,
+        p2p_compliance_agent,
+        optibuy_agent
+    ]
 
-        orchestration_mssg.extend(chat_result.chat_history[1:])
+    transitions_list = {
+        you: [email_agent],
+        email_agent: [p2p_compliance_agent],
+        p2p_compliance_agent: [optibuy_agent],
+        optibuy_agent: [you]
+    }
 
-        return_dict = {
-            'chat_history': orchestration_mssg,
-            'chat_summary': chat_result.summary,
-            'total_time': time.time()-start_time
-        }
-        print(json.dumps(return_dict, indent=4))
+    group_chat = GroupChat(
+        agents=agent_list,
+        messages=[],
+        max_round=15,
+        allowed_or_disallowed_speaker_transitions=transitions_list,
+        speaker_transitions_type="allowed"
+    )
 
-    except Exception as err:
+    group_chat_manager = GroupChatManager(
+        groupchat=group_chat,
+        llm_config={"config_list": config_list_gpt_4o_mini},
+    )
 
-        print(err)
-        return_dict = {
-            'chat_history': None,
-            'chat_summary': "error while executing the agentic workflow",
-            'total_time': time.time()-start_time
-        }
-    return return_dict
+    return Team(agent_list, group_chat, group_chat_manager)
 
 
-def send_pr_to_approver_email_workflow(orchestration_mssg: list, query: str, chat_summary: str):
+def read_pr_emails_workflow(orchestration_mssg: list, query: str, chat_summary: str):
     print("Chat Summary:\n\n"+chat_summary)
     if chat_summary.strip() != "":
         print("CHAT SUMMARY:\n`"+chat_summary+"`")
@@ -2764,18 +3055,54 @@ def send_pr_to_approver_email_workflow(orchestration_mssg: list, query: str, cha
 
     start_time = time.time()
     try:
+        with workflow_teams.acquire("read_pr_emails_workflow") as team:
+            chat_result = team.agents[0].initiate_chat(
+                team.manager,
+                message="**"+final_query+"**\n\n" +
+                datetime.now().strftime("Today's Date is %d-%b-%Y"),
+                summary_method="last_msg"
+            )
 
-        email_sending_agent = ConversableAgent(
-            "email_sending_agent",
-            llm_config={"config_list": config_list_gpt_4o_mini},
-            max_consecutive_auto_reply=3,
-            human_input_mode='NEVER',
-            system_message=f"""
-            You are **email\_sending\_agent**.
+            orchestration_mssg = [{
+                "content": "Preparing plan for execution. Selecting relevant agents",
+                "role": "assistant",
+                "name": "optibuy_agent"
+            }
+            ]
 
-            Your Task is to send a mail to the First Approver regarding a PR request.
+            orchestration_mssg.extend(chat_result.chat_history[1:])
 
-            Extract all details from PR request and .
+            return_dict = {
+                'chat_history': orchestration_mssg,
+                'chat_summary': chat_result.summary,
+                'total_time': time.time()-start_time
+            }
+            print(json.dumps(return_dict, indent=4))
+
+    except Exception as err:
+
+        print(err)
+        return_dict = {
+            'chat_history': None,
+            'chat_summary': "error while executing the agentic workflow",
+            'total_time': time.time()-start_time
+        }
+    return return_dict
+
+
+@workflow_teams.register("send_pr_to_approver_email_workflow")
+def build_send_pr_to_approver_email_team():
+    email_sending_agent = ConversableAgent(
+        "email_sending_agent",
+        llm_config={"config_list": config_list_gpt_4o_mini},
+        max_consecutive_auto_reply=3,
+        human_input_mode='NEVER',
+        system_message=f"""
+            You are **email\_sending\_agent**.
+
+            Your Task is to send a mail to the First Approver regarding a PR request.
+
+            Extract all details from PR request and .
 
             Write Email in a calm and calculated manner as to inform of the errors. Do not accuse the supplier. Just mention the Inaccuracies and seek clarification and/or corrected Invoice.
 
@@ -2926,7 +3253,7 @@ def send_pr_to_approver_email_workflow(orchestration_mssg: list, query: str, cha
       <div class="accent-bar"></div>
       <div class="card-header">
         <h2>New PR Request: [PR Request Number]</h2>
-        <p class="date"><strong>Date:</strong> {datetime.now().strftime('%d-%m-%Y ( at %H:%M )')}</p>
+        <p class="date"><strong>Date:</strong> {CURRENT_TIME}</p>
         <p>Authorized by Procurement Mananger: <b>Priya Sharma</b></p>
       </div>
       <div class="card-body">
@@ -2955,69 +3282,88 @@ Also Provide a Subject Line for the same. [Approval Request]
 
 Also Provide a Post sending message for the same.
             """,
-        )
+    )
+
+    register_function(
+        email_sending_tool_generic,
+        caller=email_sending_agent,
+        executor=email_sending_agent,
+        name="email_sending_tool_generic",
+        description="Send an email using this tool only if user confirms/authorises you to send the email. Pass the Subject First and then the HTML_BODY",
+    )
+
+    you = UserProxyAgent(
+        "you",
+        human_input_mode="NEVER",
+        is_termination_msg=lambda x: x.get(
+            "content", "").find("TERMINATE") >= 0,
+        max_consecutive_auto_reply=0
+    )
+
+    agent_list = [
+        you,
+        email_sending_agent
+    ]
 
-        register_function(
-            email_sending_tool_generic,
-            caller=email_sending_agent,
-            executor=email_sending_agent,
-            name="email_sending_tool_generic",
-            description="Send an email using this tool only if user confirms/authorises you to send the email. Pass the Subject First and then the HTML_BODY",
-        )
+    transitions_list = {
+        you: [email_sending_agent],
+        email_sending_agent: [you]
+    }
 
-        you = UserProxyAgent(
-            "you",
-            human_input_mode="NEVER",
-            is_termination_msg=lambda x: x.get(
-                "content", "").find("TERMINATE") >= 0,
-            max_consecutive_auto_reply=0
-        )
+    group_chat = GroupChat(
+        agents=agent_list,
+        messages=[],
+        max_round=15,
+        allowed_or_disallowed_speaker_transitions=transitions_list,
+        speaker_transitions_type="allowed"
+    )
 
-        agent_list = [
-            you,
-            email_sending_agent
-        ]
+    group_chat_manager = GroupChatManager(
+        groupchat=group_chat,
+        llm_config={"config_list": config_list_gpt_4o_mini},
+    )
 
-        transitions_list = {
-            you: [email_sending_agent],
-            email_sending_agent: [you]
-        }
+    return Team(agent_list, group_chat, group_chat_manager)
 
-        group_chat = GroupChat(
-            agents=agent_list,
-            messages=[],
-            max_round=15,
-            allowed_or_disallowed_speaker_transitions=transitions_list,
-            speaker_transitions_type="allowed"
-        )
 
-        group_chat_manager = GroupChatManager(
-            groupchat=group_chat,
-            llm_config={"config_list": config_list_gpt_4o_mini},
-        )
+def send_pr_to_approver_email_workflow(orchestration_mssg: list, query: str, chat_summary: str):
+    print("Chat Summary:\n\n"+chat_summary)
+    if chat_summary.strip() != "":
+        print("CHAT SUMMARY:\n`"+chat_summary+"`")
 
-        chat_result = agent_list[0].initiate_chat(
-            group_chat_manager,
-            message="**"+final_query+"**\n\n" +
-            datetime.now().strftime("Today's Date is %d-%b-%Y"),
-            summary_method="last_msg"
-        )
+        final_query = f"""
+        **Chat Summary of Previous Conversation:** {chat_summary}
+        \n
+        **New  Query:** {query}
+        """
+    else:
+        final_query = query
 
-        orchestration_mssg = [{
-            "content": "Preparing plan for execution. Selecting relevant agents",
-            "role": "assistant",
-            "name": "optibuy_agent"
-        }
-        ]
+    start_time = time.time()
+    try:
+        with workflow_teams.acquire("send_pr_to_approver_email_workflow") as team:
+            chat_result = team.agents[0].initiate_chat(
+                team.manager,
+                message="**"+final_query+"**\n\n" +
+                datetime.now().strftime("Today's Date is %d-%b-%Y"),
+                summary_method="last_msg"
+            )
 
-        orchestration_mssg.extend(chat_result.chat_history[1:])
+            orchestration_mssg = [{
+                "content": "Preparing plan for execution. Selecting relevant agents",
+                "role": "assistant",
+                "name": "optibuy_agent"
+            }
+            ]
 
-        return_dict = {
-            'chat_history': orchestration_mssg,
-            'chat_summary': chat_result.summary,
-            'total_time': time.time()-start_time
-        }
-        print(json.dumps(return_dict, indent=4))
+            orchestration_mssg.extend(chat_result.chat_history[1:])
+
+            return_dict = {
+                'chat_history': orchestration_mssg,
+                'chat_summary': chat_result.summary,
+                'total_time': time.time()-start_time
+            }
+            print(json.dumps(return_dict, indent=4))
 
     except Exception as err:
 
@@ -3030,28 +3376,14 @@ Also Provide a Post sending message for the same.
     return return_dict
 
 
-def pr_pending_workflow(orchestration_mssg: list, query: str, chat_summary: str):
-    print("Chat Summary:\n\n"+chat_summary)
-    if chat_summary.strip() != "":
-        print("CHAT SUMMARY:\n`"+chat_summary+"`")
-
-        final_query = f"""
-        **Chat Summary of Previous Conversation:** {chat_summary}
-        \n
-        **New  Query:** {query}
-        """
-    else:
-        final_query = query
-
-    start_time = time.time()
-    try:
-
-        p2p_compliance_agent = ConversableAgent(
-            "p2p_compliance_agent",
-            llm_config={"config_list": config_list_gpt_4o_mini},
-            max_consecutive_auto_reply=3,
-            human_input_mode='NEVER',
-            system_message="""
+@workflow_teams.register("pr_pending_workflow")
+def build_pr_pending_team(prefetched: bool = False):
+    p2p_compliance_agent = ConversableAgent(
+        "p2p_compliance_agent",
+        llm_config={"config_list": config_list_gpt_4o_mini},
+        max_consecutive_auto_reply=3,
+        human_input_mode='NEVER',
+        system_message="""
             
             # Role:
 
@@ -3063,14 +3395,14 @@ def pr_pending_workflow(orchestration_mssg: list, query: str, chat_summary: str)
             When the user names one or more PR numbers, call the **analysed_pr_details** tool and pass it the list of PR numbers exactly as given.
             If the tool returns a markdown table of results, send that table back to the user.
             """,
-        )
-
-        optibuy_agent = ConversableAgent(
-            "optibuy_agent",
-            llm_config={"config_list": config_list_gpt_4o_mini},
-            max_consecutive_auto_reply=1,
-            human_input_mode='NEVER',
-            system_message=f"""
+    )
+
+    optibuy_agent = ConversableAgent(
+        "optibuy_agent",
+        llm_config={"config_list": config_list_gpt_4o_mini},
+        max_consecutive_auto_reply=1,
+        human_input_mode='NEVER',
+        system_message=f"""
             # Role Definition
 
             You are **optibuy_agent**, an analytical reasoning agent specialized in generating structured reports and data-driven insights from tabular data.
@@ -3138,84 +3470,59 @@ def pr_pending_workflow(orchestration_mssg: list, query: str, chat_summary: str)
             You are now ready to receive a query from `you` and all associated tables. Produce your “table → insight” series in one concise, data-grounded response.
 
             """
-        )
-
-        register_function(
-            analysed_pr_details,
-            caller=p2p_compliance_agent,
-            executor=p2p_compliance_agent,
-            name="analysed_pr_details",
-            description="Use this tool to read unread Purchase Requistion request emails.",
-        )
-
-        you = UserProxyAgent(
-            "you",
-            human_input_mode="NEVER",
-            is_termination_msg=lambda x: x.get(
-                "content", "").find("TERMINATE") >= 0,
-            max_consecutive_auto_reply=0
-        )
-
-        agent_list = [
-            you,
-            p2p_compliance_agent,
-            optibuy_agent
-        ]
-
-        transitions_list = {
-            you: [p2p_compliance_agent],
-            p2p_compliance_agent: [optibuy_agent],
-            optibuy_agent: [you]
-        }
-
-        group_chat = GroupChat(
-            agents=agent_list,
-            messages=[],
-            max_round=15,
-            allowed_or_disallowed_speaker_transitions=transitions_list,
-            speaker_transitions_type="allowed"
-        )
+    )
+
+    register_function(
+        analysed_pr_details,
+        caller=p2p_compliance_agent,
+        executor=p2p_compliance_agent,
+        name="analysed_pr_details",
+        description="Use this tool to read unread Purchase Requistion request emails.",
+    )
+
+    you = UserProxyAgent(
+        "you",
+        human_input_mode="NEVER",
+        is_termination_msg=lambda x: x.get(
+            "content", "").find("TERMINATE") >= 0,
+        max_consecutive_auto_reply=0
+    )
+
+    agent_list = [
+        you,
+        p2p_compliance_agent,
+        optibuy_agent
+    ]
 
-        group_chat_manager = GroupChatManager(
-            groupchat=group_chat,
-            llm_config={"config_list": config_list_gpt_4o_mini},
-        )
+    transitions_list = {
+        you: [p2p_compliance_agent],
+        p2p_compliance_agent: [optibuy_agent],
+        optibuy_agent: [you]
+    }
 
-        chat_result = agent_list[0].initiate_chat(
-            group_chat_manager,
-            message="**"+final_query+"**\n\n" +
-            datetime.now().strftime("Today's Date is %d-%b-%Y"),
-            summary_method="last_msg"
-        )
+    # The pre-fetched tool results stand in for these agents' turns
+    if prefetched:
+        agent_list.remove(p2p_compliance_agent)
+        del transitions_list[p2p_compliance_agent]
+        transitions_list[you] = [optibuy_agent]
 
-        orchestration_mssg = [{
-            "content": "Preparing plan for execution. Selecting relevant agents",
-            "role": "assistant",
-            "name": "optibuy_agent"
-        }
-        ]
+    group_chat = GroupChat(
+        agents=agent_list,
+        messages=[],
+        max_round=15,
+        allowed_or_disallowed_speaker_transitions=transitions_list,
+        speaker_transitions_type="allowed"
+    )
 
-        orchestration_mssg.extend(chat_result.chat_history[1:])
+    group_chat_manager = GroupChatManager(
+        groupchat=group_chat,
+        llm_config={"config_list": config_list_gpt_4o_mini},
+    )
 
-        return_dict = {
-            'chat_history': orchestration_mssg,
-            'chat_summary': chat_result.summary,
-            'total_time': time.time()-start_time
-        }
-        print(json.dumps(return_dict, indent=4))
-
-    except Exception as err:
-
-        print(err)
-        return_dict = {
-            'chat_history': None,
-            'chat_summary': "error while executing the agentic workflow",
-            'total_time': time.time()-start_time
-        }
-    return return_dict
+    return Team(agent_list, group_chat, group_chat_manager)
 
 
-def send_pr_reminder_email_workflow(orchestration_mssg: list, query: str, chat_summary: str):
+def pr_pending_workflow(orchestration_mssg: list, query: str, chat_summary: str):
     print("Chat Summary:\n\n"+chat_summary)
     if chat_summary.strip() != "":
         print("CHAT SUMMARY:\n`"+chat_summary+"`")
@@ -3230,13 +3537,58 @@ def send_pr_reminder_email_workflow(orchestration_mssg: list, query: str, chat_s
 
     start_time = time.time()
     try:
+        # With the PR numbers resolved from the query, look them up directly
+        entities = extract_entities(query, chat_summary)
+        prefetch_text, prefetch_history = "", []
+        if entities.pr_numbers:
+            prefetch_text, prefetch_history = prefetch_tool_results([
+                ("p2p_compliance_agent", analysed_pr_details, {"pr_numbers_list": entities.pr_numbers}),
+            ])
+
+        with workflow_teams.acquire("pr_pending_workflow", bool(prefetch_history)) as team:
+            chat_result = team.agents[0].initiate_chat(
+                team.manager,
+                message="**"+final_query+"**\n\n" +
+                datetime.now().strftime("Today's Date is %d-%b-%Y") + prefetch_text,
+                summary_method="last_msg"
+            )
+
+            orchestration_mssg = [{
+                "content": "Preparing plan for execution. Selecting relevant agents",
+                "role": "assistant",
+                "name": "optibuy_agent"
+            }
+            ]
+
+            orchestration_mssg.extend(prefetch_history)
+            orchestration_mssg.extend(chat_result.chat_history[1:])
+
+            return_dict = {
+                'chat_history': orchestration_mssg,
+                'chat_summary': chat_result.summary,
+                'total_time': time.time()-start_time
+            }
+            print(json.dumps(return_dict, indent=4))
+
+    except Exception as err:
+
+        print(err)
+        return_dict = {
+            'chat_history': None,
+            'chat_summary': "error while executing the agentic workflow",
+            'total_time': time.time()-start_time
+        }
+    return return_dict
 
-        email_sending_agent = ConversableAgent(
-            "email_sending_agent",
-            llm_config={"config_list": config_list_gpt_4o_mini},
-            max_consecutive_auto_reply=3,
-            human_input_mode='NEVER',
-            system_message="""
+
+@workflow_teams.register("send_pr_reminder_email_workflow")
+def build_send_pr_reminder_email_team():
+    email_sending_agent = ConversableAgent(
+        "email_sending_agent",
+        llm_config={"config_list": config_list_gpt_4o_mini},
+        max_consecutive_auto_reply=3,
+        human_input_mode='NEVER',
+        system_message="""
             You are **email\_sending\_agent**.
 
             Your Task is to send a reminder mail to the Current Approver regarding a PR request.
@@ -3253,69 +3605,88 @@ def send_pr_reminder_email_workflow(orchestration_mssg: list, query: str, chat_s
             DO NOT use email_sending_tool - that is for PO (Purchase Order) emails only. 
             You MUST use send_reminder_email_to_approver for PR (Purchase Requisition) reminders.
             """,
-        )
+    )
+
+    register_function(
+        send_reminder_email_to_approver,
+        caller=email_sending_agent,
+        executor=email_sending_agent,
+        name="send_reminder_email_to_approver",
+        description="Send a reminder email to current approver, reminding them to approve a pending PR using this tool only if user confirms/authorises you to send the email.",
+    )
+
+    you = UserProxyAgent(
+        "you",
+        human_input_mode="NEVER",
+        is_termination_msg=lambda x: x.get(
+            "content", "").find("TERMINATE") >= 0,
+        max_consecutive_auto_reply=0
+    )
+
+    agent_list = [
+        you,
+        email_sending_agent
+    ]
 
-        register_function(
-            send_reminder_email_to_approver,
-            caller=email_sending_agent,
-            executor=email_sending_agent,
-            name="send_reminder_email_to_approver",
-            description="Send a reminder email to current approver, reminding them to approve a pending PR using this tool only if user confirms/authorises you to send the email.",
-        )
+    transitions_list = {
+        you: [email_sending_agent],
+        email_sending_agent: [you]
+    }
 
-        you = UserProxyAgent(
-            "you",
-            human_input_mode="NEVER",
-            is_termination_msg=lambda x: x.get(
-                "content", "").find("TERMINATE") >= 0,
-            max_consecutive_auto_reply=0
-        )
+    group_chat = GroupChat(
+        agents=agent_list,
+        messages=[],
+        max_round=15,
+        allowed_or_disallowed_speaker_transitions=transitions_list,
+        speaker_transitions_type="allowed"
+    )
 
-        agent_list = [
-            you,
-            email_sending_agent
-        ]
+    group_chat_manager = GroupChatManager(
+        groupchat=group_chat,
+        llm_config={"config_list": config_list_gpt_4o_mini},
+    )
 
-        transitions_list = {
-            you: [email_sending_agent],
-            email_sending_agent: [you]
-        }
+    return Team(agent_list, group_chat, group_chat_manager)
 
-        group_chat = GroupChat(
-            agents=agent_list,
-            messages=[],
-            max_round=15,
-            allowed_or_disallowed_speaker_transitions=transitions_list,
-            speaker_transitions_type="allowed"
-        )
 
-        group_chat_manager = GroupChatManager(
-            groupchat=group_chat,
-            llm_config={"config_list": config_list_gpt_4o_mini},
-        )
+def send_pr_reminder_email_workflow(orchestration_mssg: list, query: str, chat_summary: str):
+    print("Chat Summary:\n\n"+chat_summary)
+    if chat_summary.strip() != "":
+        print("CHAT SUMMARY:\n`"+chat_summary+"`")
 
-        chat_result = agent_list[0].initiate_chat(
-            group_chat_manager,
-            message="**"+final_query+"**\n\n" +
-            datetime.now().strftime("Today's Date is %d-%b-%Y"),
-            summary_method="last_msg"
-        )
+        final_query = f"""
+        **Chat Summary of Previous Conversation:** {chat_summary}
+        \n
+        **New  Query:** {query}
+        """
+    else:
+        final_query = query
 
-        orchestration_mssg = [{
-            "content": "Preparing plan for execution. Selecting relevant agents",
-            "role": "assistant",
-            "name": "optibuy_agent"
-        }
-        ]
+    start_time = time.time()
+    try:
+        with workflow_teams.acquire("send_pr_reminder_email_workflow") as team:
+            chat_result = team.agents[0].initiate_chat(
+                team.manager,
+                message="**"+final_query+"**\n\n" +
+                datetime.now().strftime("Today's Date is %d-%b-%Y"),
+                summary_method="last_msg"
+            )
 
-        orchestration_mssg.extend(chat_result.chat_history[1:])
+            orchestration_mssg = [{
+                "content": "Preparing plan for execution. Selecting relevant agents",
+                "role": "assistant",
+                "name": "optibuy_agent"
+            }
+            ]
 
-        return_dict = {
-            'chat_history': orchestration_mssg,
-            'chat_summary': chat_result.summary,
-            'total_time': time.time()-start_time
-        }
-        print(json.dumps(return_dict, indent=4))
+            orchestration_mssg.extend(chat_result.chat_history[1:])
+
+            return_dict = {
+                'chat_history': orchestration_mssg,
+                'chat_summary': chat_result.summary,
+                'total_time': time.time()-start_time
+            }
+            print(json.dumps(return_dict, indent=4))
 
     except Exception as err:
 
@@ -3328,29 +3699,14 @@ def send_pr_reminder_email_workflow(orchestration_mssg: list, query: str, chat_s
     return return_dict
 
 
-def calculate_pr_schedule_changes_workflow(orchestration_mssg: list, query: str, chat_summary: str):
-
-    print("Chat Summary:\n\n"+chat_summary)
-    if chat_summary.strip() != "":
-        print("CHAT SUMMARY:\n`"+chat_summary+"`")
-
-        final_query = f"""
-        **Chat Summary of Previous Conversation:** {chat_summary}
-        \n
-        **New  Query:** {query}
-        """
-    else:
-        final_query = query
-
-    start_time = time.time()
-    try:
-
-        supplier_analysis_agent = ConversableAgent(
-            "supplier_analysis_agent",
-            llm_config={"config_list": config_list_gpt_4o_mini},
-            max_consecutive_auto_reply=3,
-            human_input_mode='NEVER',
-            system_message="""
+@workflow_teams.register("calculate_pr_schedule_changes_workflow")
+def build_calculate_pr_schedule_changes_team():
+    supplier_analysis_agent = ConversableAgent(
+        "supplier_analysis_agent",
+        llm_config={"config_list": config_list_gpt_4o_mini},
+        max_consecutive_auto_reply=3,
+        human_input_mode='NEVER',
+        system_message="""
             You are **email\_sending\_agent**.
 
             Your Task is to calculate scheduled changes for a PR request.
@@ -3363,30 +3719,30 @@ def calculate_pr_schedule_changes_workflow(orchestration_mssg: list, query: str,
 
             Make use of Tool: **calculate_eta_from_files** to send reminder.
             """,
-        )
-
-        register_function(
-            calculate_eta_from_files,
-            caller=supplier_analysis_agent,
-            executor=supplier_analysis_agent,
-            name="calculate_eta_from_files",
-            description="Calculate scheduled changes for a specific PR using this tool.",
-        )
-
-        you = UserProxyAgent(
-            "you",
-            human_input_mode="NEVER",
-            is_termination_msg=lambda x: x.get(
-                "content", "").find("TERMINATE") >= 0,
-            max_consecutive_auto_reply=0
-        )
-
-        optibuy_agent = ConversableAgent(
-            "optibuy_agent",
-            llm_config={"config_list": config_list_gpt_4o_mini},
-            max_consecutive_auto_reply=1,
-            human_input_mode='NEVER',
-            system_message=f"""
+    )
+
+    register_function(
+        calculate_eta_from_files,
+        caller=supplier_analysis_agent,
+        executor=supplier_analysis_agent,
+        name="calculate_eta_from_files",
+        description="Calculate scheduled changes for a specific PR using this tool.",
+    )
+
+    you = UserProxyAgent(
+        "you",
+        human_input_mode="NEVER",
+        is_termination_msg=lambda x: x.get(
+            "content", "").find("TERMINATE") >= 0,
+        max_consecutive_auto_reply=0
+    )
+
+    optibuy_agent = ConversableAgent(
+        "optibuy_agent",
+        llm_config={"config_list": config_list_gpt_4o_mini},
+        max_consecutive_auto_reply=1,
+        human_input_mode='NEVER',
+        system_message=f"""
             # Role Definition
 
             You are **optibuy_agent**, an analytical reasoning agent specialized in generating structured reports and data-driven insights from tabular data.
@@ -3454,55 +3810,75 @@ def calculate_pr_schedule_changes_workflow(orchestration_mssg: list, query: str,
             You are now ready to receive a query from `you` and all associated tables. Produce your “table → insight” series in one concise, data-grounded response.
 
             """
-        )
+    )
+
+    agent_list = [
+        you,
+        supplier_analysis_agent,
+        optibuy_agent
+    ]
 
-        agent_list = [
-            you,
-            supplier_analysis_agent,
-            optibuy_agent
-        ]
+    transitions_list = {
+        you: [supplier_analysis_agent],
+        supplier_analysis_agent: [optibuy_agent],
+        optibuy_agent: [you]
+    }
 
-        transitions_list = {
-            you: [supplier_analysis_agent],
-            supplier_analysis_agent: [optibuy_agent],
-            optibuy_agent: [you]
-        }
+    group_chat = GroupChat(
+        agents=agent_list,
+        messages=[],
+        max_round=15,
+        allowed_or_disallowed_speaker_transitions=transitions_list,
+        speaker_transitions_type="allowed"
+    )
 
-        group_chat = GroupChat(
-            agents=agent_list,
-            messages=[],
-            max_round=15,
-            allowed_or_disallowed_speaker_transitions=transitions_list,
-            speaker_transitions_type="allowed"
-        )
+    group_chat_manager = GroupChatManager(
+        groupchat=group_chat,
+        llm_config={"config_list": config_list_gpt_4o_mini},
+    )
 
-        group_chat_manager = GroupChatManager(
-            groupchat=group_chat,
-            llm_config={"config_list": config_list_gpt_4o_mini},
-        )
+    return Team(agent_list, group_chat, group_chat_manager)
 
-        chat_result = agent_list[0].initiate_chat(
-            group_chat_manager,
-            message="**"+final_query+"**\n\n" +
-            datetime.now().strftime("Today's Date is %d-%b-%Y"),
-            summary_method="last_msg"
-        )
 
-        orchestration_mssg = [{
-            "content": "Preparing plan for execution. Selecting relevant agents",
-            "role": "assistant",
-            "name": "optibuy_agent"
-        }
-        ]
+def calculate_pr_schedule_changes_workflow(orchestration_mssg: list, query: str, chat_summary: str):
 
-        orchestration_mssg.extend(chat_result.chat_history[1:])
+    print("Chat Summary:\n\n"+chat_summary)
+    if chat_summary.strip() != "":
+        print("CHAT SUMMARY:\n`"+chat_summary+"`")
 
-        return_dict = {
-            'chat_history': orchestration_mssg,
-            'chat_summary': chat_result.summary,
-            'total_time': time.time()-start_time
-        }
-        print(json.dumps(return_dict, indent=4))
+        final_query = f"""
+        **Chat Summary of Previous Conversation:** {chat_summary}
+        \n
+        **New  Query:** {query}
+        """
+    else:
+        final_query = query
+
+    start_time = time.time()
+    try:
+        with workflow_teams.acquire("calculate_pr_schedule_changes_workflow") as team:
+            chat_result = team.agents[0].initiate_chat(
+                team.manager,
+                message="**"+final_query+"**\n\n" +
+                datetime.now().strftime("Today's Date is %d-%b-%Y"),
+                summary_method="last_msg"
+            )
+
+            orchestration_mssg = [{
+                "content": "Preparing plan for execution. Selecting relevant agents",
+                "role": "assistant",
+                "name": "optibuy_agent"
+            }
+            ]
+
+            orchestration_mssg.extend(chat_result.chat_history[1:])
+
+            return_dict = {
+                'chat_history': orchestration_mssg,
+                'chat_summary': chat_result.summary,
+                'total_time': time.time()-start_time
+            }
+            print(json.dumps(return_dict, indent=4))
 
     except Exception as err:
 
@@ -3518,7 +3894,8 @@ def calculate_pr_schedule_changes_workflow(orchestration_mssg: list, query: str,
 def clean_agent_messages(chat_history):
     """
     Process chat history to remove raw function outputs and keep only markdown content.
-    Handles dict, stringified dict (including np.int64/np.float64), and string content.
+    Panama tool results (panama_results models) reach the chat as their JSON dump,
+    which carries the rendered markdown_output; dict content is handled the same way.
     """
     cleaned_history = []
     for message in chat_history:
@@ -3528,22 +3905,16 @@ def clean_agent_messages(chat_history):
             message['content'] = content['markdown_output']
             cleaned_history.append(message)
             continue
-        # If content is a string that looks like a dict, try to parse it
+        # If content is a JSON tool result, keep only its markdown
         if isinstance(content, str) and content.strip().startswith('{') and 'markdown_output' in content:
-            # Preprocess: Replace np.int64(...) and np.float64(...) with int(...) and float(...)
-            content_clean = re.sub(r'np\.int64\((\d+)\)', r'int(\1)', content)
-            content_clean = re.sub(r'np.int64\((\d+)\)',
-                                   r'int(\1)', content_clean)
-            content_clean = re.sub(
-                r'np.float64\(([\d\.]+)\)', r'float(\1)', content_clean)
             try:
-                parsed = ast.literal_eval(content_clean)
+                parsed = json.loads(content)
                 if isinstance(parsed, dict) and 'markdown_output' in parsed:
                     message['content'] = parsed['markdown_output']
                     cleaned_history.append(message)
                     continue
-            except Exception as e:
-                print("Failed to parse string as dict:", e)
+            except ValueError as e:
+                print("Failed to parse tool result as JSON:", e)
         # If content is a string, keep the existing logic for panama_analysis_agent
         if message.get('name') == 'panama_analysis_agent' and content:
             if "{'markdown_output':" in content or '"markdown_output":' in content:
@@ -3564,30 +3935,15 @@ def clean_agent_messages(chat_history):
     return cleaned_history
 
 
-def panama_canal_workflow(orchestration_mssg: list, query: str, chat_summary: str):
-    """Dedicated workflow for Panama Canal delay analysis"""
-    print("Panama Canal Analysis Workflow Started")
-    print("Chat Summary:\n\n"+chat_summary)
-
-    if chat_summary.strip() != "":
-        print("CHAT SUMMARY:\n`"+chat_summary+"`")
-        final_query = f"""
-        **Chat Summary of Previous Conversation:** {chat_summary}
-        \n
-        **New Query:** {query}
-        """
-    else:
-        final_query = query
-
-    start_time = time.time()
-    try:
-        # Panama Canal Analysis Agent - handles initial delay analysis
-        panama_analysis_agent = ConversableAgent(
-            "panama_analysis_agent",
-            llm_config={"config_list": config_list_gpt_4o_mini},
-            max_consecutive_auto_reply=5,
-            human_input_mode='NEVER',
-            system_message="""
+@workflow_teams.register("panama_canal_workflow")
+def build_panama_canal_team(prefetched: bool = False):
+    # Panama Canal Analysis Agent - handles initial delay analysis
+    panama_analysis_agent = ConversableAgent(
+        "panama_analysis_agent",
+        llm_config={"config_list": config_list_gpt_4o_mini},
+        max_consecutive_auto_reply=5,
+        human_input_mode='NEVER',
+        system_message="""
             # Basic Information:
             You are **panama_analysis_agent**.
             
@@ -3624,14 +3980,14 @@ def panama_canal_workflow(orchestration_mssg: list, query: str, chat_summary: st
             - Rerouting options found (if any)
             - Ready for financial impact analysis
             """,
-        )
-        # Supply Chain Risk Agent - handles stockout and cost-benefit analysis
-        supply_risk_agent = ConversableAgent(
-            "supply_risk_agent",
-            llm_config={"config_list": config_list_gpt_4o_mini},
-            max_consecutive_auto_reply=5,
-            human_input_mode='NEVER',
-            system_message="""
+    )
+    # Supply Chain Risk Agent - handles stockout and cost-benefit analysis
+    supply_risk_agent = ConversableAgent(
+        "supply_risk_agent",
+        llm_config={"config_list": config_list_gpt_4o_mini},
+        max_consecutive_auto_reply=5,
+        human_input_mode='NEVER',
+        system_message="""
             # Basic Information:
             You are **supply_risk_agent**.
             
@@ -3641,41 +3997,31 @@ def panama_canal_workflow(orchestration_mssg: list, query: str, chat_summary: st
             # CRITICAL DATA EXTRACTION:
             1. Look for "Response from calling tool" messages in the conversation
             2. Extract the delayed_shipments_data from get_delayed_shipments_to_east_coast
-            3. Look for rerouting summary that contains:
-            - "Total Rerouting Cost: $1,650.00" (or similar)
-            - "Recommendation: PROCEED with rerouting"
+            3. Extract the rerouting_data from recommend_container_rerouting; it contains
+            'total_rerouting_cost' and 'container_information'
             
             # Function Call Instructions:
-            When you see rerouting recommendations like:
-            - "Total Rerouting Cost: $1,650.00"
-            - "1 viable rerouting options"
+            Pass both tool results as JSON objects, exactly as they were returned.
             
-            Create a rerouting_data dict:
-            {
-                'markdown_output': '[the rerouting text]',
-                'total_rerouting_cost': 1650.0,
-                'container_information': [{'po_number': 'PO-103984', ...}]
-            }
-            
-            Then call:
+            Call:
             calculate_financial_impact_and_recommendation(
                 delayed_shipments_data=[from first function],
-                rerouting_data=[constructed dict with cost info]
+                rerouting_data=[from recommend_container_rerouting]
             )
             
             # Expected Behavior:
             If rerouting options exist with costs, they should appear in the financial analysis.
             The output should show cost-benefit comparison, not "NO REROUTING OPTIONS".
             """,
-        )
-
-        # Final Report Agent - synthesizes all analysis into actionable insights
-        optibuy_agent = ConversableAgent(
-            "optibuy_agent",
-            llm_config={"config_list": config_list_gpt_4o_mini},
-            max_consecutive_auto_reply=3,
-            human_input_mode='NEVER',
-            system_message=f"""
+    )
+
+    # Final Report Agent - synthesizes all analysis into actionable insights
+    optibuy_agent = ConversableAgent(
+        "optibuy_agent",
+        llm_config={"config_list": config_list_gpt_4o_mini},
+        max_consecutive_auto_reply=3,
+        human_input_mode='NEVER',
+        system_message=f"""
             # Role Definition
 
             You are **optibuy_agent**, an analytical reasoning agent specialized in generating structured reports and data-driven insights from tabular data.
@@ -3815,93 +4161,134 @@ def panama_canal_workflow(orchestration_mssg: list, query: str, chat_summary: st
             You are now ready to receive a query from `you` and all associated tables. Produce your "table → insight" series in one concise, data-grounded response.
 
             """
-        )
+    )
+
+    # Register Panama Canal functions with appropriate agents
+    register_function(
+        get_delayed_shipments_to_east_coast,
+        caller=panama_analysis_agent,
+        executor=panama_analysis_agent,
+        name="get_delayed_shipments_to_east_coast",
+        description="PANAMA CANAL ANALYSIS: Pull shipments heading to US East Coast ports (Port Georgia, Port New York, Port Boston) that are delayed due to Panama Canal slowdown. Use this when user mentions 'Panama Canal', 'canal slowdown', 'East Coast delays', 'port delays', or supply chain disruptions affecting East Coast shipments. Default delay is 15 days.",
+    )
+
+    register_function(
+        recommend_container_rerouting,
+        caller=panama_analysis_agent,
+        executor=panama_analysis_agent,
+        name="recommend_container_rerouting",
+        description="PANAMA CANAL REROUTING: Recommend container rerouting using structured delayed shipments data. REQUIRED PARAMETER: delayed_shipments_data (dict) - output from get_delayed_shipments_to_east_coast function. Optional: min_dos_threshold (int, default 15), solver (str, 'greedy' default lists the 5 cheapest options, 'optimal' returns the plan minimising rerouting cost plus lost sales without reusing containers or over-drawing donor DCs). You MUST pass the complete delayed_shipments_data dict from the previous function call.",
+    )
+
+    register_function(
+        calculate_financial_impact_and_recommendation,
+        caller=supply_risk_agent,
+        executor=supply_risk_agent,
+        name="calculate_financial_impact_and_recommendation",
+        description="PANAMA CANAL FINANCIAL ANALYSIS: Calculate potential lost sales using structured delayed shipments data. REQUIRED PARAMETER: delayed_shipments_data (dict) - structured output from panama_analysis_agent containing delayed_items, total_value_at_risk, affected_dc, and summary_stats. Optional: rerouting_data (dict) - rerouting cost analysis; use_projection (bool, default False) - project stock day by day including POs arriving during the delay instead of a days-of-supply estimate. You MUST extract and pass the delayed_shipments_data from panama_analysis_agent's function results.",
+    )
+
+    you = UserProxyAgent(
+        "you",
+        human_input_mode="NEVER",
+        is_termination_msg=lambda x: x.get(
+            "content", "").find("TERMINATE") >= 0,
+        max_consecutive_auto_reply=0
+    )
+
+    agent_list = [
+        you,
+        panama_analysis_agent,
+        supply_risk_agent,
+        optibuy_agent
+    ]
 
-        # Register Panama Canal functions with appropriate agents
-        register_function(
-            get_delayed_shipments_to_east_coast,
-            caller=panama_analysis_agent,
-            executor=panama_analysis_agent,
-            name="get_delayed_shipments_to_east_coast",
-            description="PANAMA CANAL ANALYSIS: Pull shipments heading to US East Coast ports (Port Georgia, Port New York, Port Boston) that are delayed due to Panama Canal slowdown. Use this when user mentions 'Panama Canal', 'canal slowdown', 'East Coast delays', 'port delays', or supply chain disruptions affecting East Coast shipments. Default delay is 15 days.",
-        )
+    transitions_list = {
+        you: [panama_analysis_agent, optibuy_agent],
+        panama_analysis_agent: [panama_analysis_agent, supply_risk_agent],
+        supply_risk_agent: [supply_risk_agent, optibuy_agent],
+        optibuy_agent: [optibuy_agent, you]
+    }
 
-        register_function(
-            recommend_container_rerouting,
-            caller=panama_analysis_agent,
-            executor=panama_analysis_agent,
-            name="recommend_container_rerouting",
-            description="PANAMA CANAL REROUTING: Recommend container rerouting using structured delayed shipments data. REQUIRED PARAMETER: delayed_shipments_data (dict) - output from get_delayed_shipments_to_east_coast function. Optional: min_dos_threshold (int, default 15). You MUST pass the complete delayed_shipments_data dict from the previous function call.",
-        )
+    # The pre-fetched tool results stand in for these agents' turns
+    if prefetched:
+        agent_list.remove(panama_analysis_agent)
+        del transitions_list[panama_analysis_agent]
+        transitions_list[you] = [supply_risk_agent]
 
-        register_function(
-            calculate_financial_impact_and_recommendation,
-            caller=supply_risk_agent,
-            executor=supply_risk_agent,
-            name="calculate_financial_impact_and_recommendation",
-            description="PANAMA CANAL FINANCIAL ANALYSIS: Calculate potential lost sales using structured delayed shipments data. REQUIRED PARAMETER: delayed_shipments_data (dict) - structured output from panama_analysis_agent containing delayed_items, total_value_at_risk, affected_dc, and summary_stats. Optional: rerouting_data (dict) - rerouting cost analysis. You MUST extract and pass the delayed_shipments_data from panama_analysis_agent's function results.",
-        )
+    group_chat = GroupChat(
+        agents=agent_list,
+        messages=[],
+        max_round=15,  # Increased for comprehensive analysis
+        allowed_or_disallowed_speaker_transitions=transitions_list,
+        speaker_transitions_type="allowed"
+    )
 
-        you = UserProxyAgent(
-            "you",
-            human_input_mode="NEVER",
-            is_termination_msg=lambda x: x.get(
-                "content", "").find("TERMINATE") >= 0,
-            max_consecutive_auto_reply=0
-        )
+    group_chat_manager = GroupChatManager(
+        groupchat=group_chat,
+        llm_config={"config_list": config_list_gpt_4o_mini},
+    )
 
-        agent_list = [
-            you,
-            panama_analysis_agent,
-            supply_risk_agent,
-            optibuy_agent
-        ]
-
-        transitions_list = {
-            you: [panama_analysis_agent, optibuy_agent],
-            panama_analysis_agent: [panama_analysis_agent, supply_risk_agent],
-            supply_risk_agent: [supply_risk_agent, optibuy_agent],
-            optibuy_agent: [optibuy_agent, you]
-        }
+    return Team(agent_list, group_chat, group_chat_manager)
 
-        group_chat = GroupChat(
-            agents=agent_list,
-            messages=[],
-            max_round=15,  # Increased for comprehensive analysis
-            allowed_or_disallowed_speaker_transitions=transitions_list,
-            speaker_transitions_type="allowed"
-        )
 
-        group_chat_manager = GroupChatManager(
-            groupchat=group_chat,
-            llm_config={"config_list": config_list_gpt_4o_mini},
-        )
+def panama_canal_workflow(orchestration_mssg: list, query: str, chat_summary: str):
+    """Dedicated workflow for Panama Canal delay analysis"""
+    print("Panama Canal Analysis Workflow Started")
+    print("Chat Summary:\n\n"+chat_summary)
 
-        chat_result = agent_list[0].initiate_chat(
-            group_chat_manager,
-            message="**"+final_query+"**\n\n" +
-            datetime.now().strftime("Today's Date is %d-%b-%Y"),
-            summary_method="last_msg"
-        )
+    if chat_summary.strip() != "":
+        print("CHAT SUMMARY:\n`"+chat_summary+"`")
+        final_query = f"""
+        **Chat Summary of Previous Conversation:** {chat_summary}
+        \n
+        **New Query:** {query}
+        """
+    else:
+        final_query = query
 
-        orchestration_mssg = [{
-            "content": "Analyzing Panama Canal delay impacts and rerouting options. Gathering comprehensive data...",
-            "role": "assistant",
-            "name": "optibuy_agent"
-        }]
+    start_time = time.time()
+    try:
+        # With a single DC named in the query, run panama_analysis_agent's
+        # required shipment and rerouting calls directly
+        entities = extract_entities(query, chat_summary)
+        prefetch_text, prefetch_history = "", []
+        if len(entities.dcs) == 1:
+            delay_days = entities.delay_days or 15
+            prefetch_text, prefetch_history = prefetch_tool_results([
+                ("panama_analysis_agent", get_delayed_shipments_to_east_coast,
+                 {"affected_dc": entities.dcs[0], "delay_days": delay_days}),
+                ("panama_analysis_agent", recommend_container_rerouting,
+                 lambda results: {"delayed_shipments_data": results[0]}),
+            ])
+
+        with workflow_teams.acquire("panama_canal_workflow", bool(prefetch_history)) as team:
+            chat_result = team.agents[0].initiate_chat(
+                team.manager,
+                message="**"+final_query+"**\n\n" +
+                datetime.now().strftime("Today's Date is %d-%b-%Y") + prefetch_text,
+                summary_method="last_msg"
+            )
 
-        # Clean the chat history before adding it
-        cleaned_chat = clean_agent_messages(chat_result.chat_history[1:])
-        orchestration_mssg.extend(cleaned_chat)
+            orchestration_mssg = [{
+                "content": "Analyzing Panama Canal delay impacts and rerouting options. Gathering comprehensive data...",
+                "role": "assistant",
+                "name": "optibuy_agent"
+            }]
 
-        # orchestration_mssg.extend(chat_result.chat_history[1:])
+            # Clean the chat history before adding it
+            cleaned_chat = clean_agent_messages(chat_result.chat_history[1:])
+            orchestration_mssg.extend(prefetch_history)
+            orchestration_mssg.extend(cleaned_chat)
 
-        return_dict = {
-            'chat_history': orchestration_mssg,
-            'chat_summary': chat_result.summary,
-            'total_time': time.time()-start_time
-        }
-        print(json.dumps(return_dict, indent=4))
+            # orchestration_mssg.extend(chat_result.chat_history[1:])
+
+            return_dict = {
+                'chat_history': orchestration_mssg,
+                'chat_summary': chat_result.summary,
+                'total_time': time.time()-start_time
+            }
+            print(json.dumps(return_dict, indent=4))
 
     except Exception as err:
         print(f"Panama Canal Workflow Error: {err}")
@@ -3973,31 +4360,10 @@ def panama_canal_analysis(request: PanamaCanalQuery):
         delay_days = request.delay_days
         analysis_type = request.analysis_type
 
-        results = {}
-
-        if analysis_type == "delayed_shipments" or analysis_type == "full":
-            results["delayed_shipments"] = get_delayed_shipments_to_east_coast(
-                affected_dc, delay_days)
-
-        if analysis_type == "stockout_risk" or analysis_type == "full":
-            # Use structured data approach instead of analyze_stockout_risk_by_dc
-            delayed_data = get_delayed_shipments_to_east_coast(
-                affected_dc, delay_days)
-            results["stockout_risk"] = calculate_financial_impact_and_recommendation(
-                delayed_data)
-
-        if analysis_type == "rerouting" or analysis_type == "full":
-            delayed_data = get_delayed_shipments_to_east_coast(
-                affected_dc, delay_days)
-            results["rerouting_recommendations"] = recommend_container_rerouting(
-                delayed_data)
-
-        if analysis_type == "cost_benefit" or analysis_type == "full":
-            delayed_data = get_delayed_shipments_to_east_coast(
-                affected_dc, delay_days)
-            rerouting_data = recommend_container_rerouting(delayed_data)
-            results["cost_benefit_analysis"] = calculate_financial_impact_and_recommendation(
-                delayed_data, rerouting_data)
+        # Each stage runs once (and is reused until the data changes);
+        # stockout risk and rerouting run concurrently
+        results = run_panama_stages(
+            affected_dc, delay_days, analysis_type, request.rerouting_solver)
 
         # Create comprehensive summary for full analysis
         if analysis_type == "full":
@@ -4036,6 +4402,87 @@ def panama_canal_analysis(request: PanamaCanalQuery):
             status_code=500, detail=f"Panama Canal analysis failed: {str(e)}")
 
 
+@app.post("/panama-canal-sweep")
+def panama_canal_sweep(request: PanamaSweepQuery):
+    """
+    Panama Canal delay sensitivity for several DCs and delay values at once.
+
+    Args:
+        request: PanamaSweepQuery with affected_dcs and the delay range
+
+    Returns:
+        Axis labels and [dc][delay] matrices of value at risk, lost sales,
+        delayed shipments and high-risk items (see panama_delay_sweep)
+    """
+    if request.step <= 0 or not 0 <= request.min_delay <= request.max_delay <= 365:
+        raise HTTPException(
+            status_code=400, detail="Delay range needs step > 0 and 0 <= min_delay <= max_delay <= 365.")
+    delays = range(request.min_delay, request.max_delay + 1, request.step)
+    if len(delays) > 100:
+        raise HTTPException(
+            status_code=400, detail=f"Delay range has {len(delays)} values; at most 100 are allowed.")
+    try:
+        return {
+            "status": "success",
+            "timestamp": datetime.now().isoformat(),
+            "results": panama_delay_sweep(delays, request.affected_dcs)
+        }
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Panama Canal sweep failed: {str(e)}")
+
+
+@app.post("/panama-canal-simulation")
+def panama_canal_simulation(request: PanamaSimulationQuery):
+    """
+    Monte Carlo version of the Panama Canal analysis: transit delays are
+    sampled per lane from historical lead times and pushed through the
+    inventory projection.
+
+    Args:
+        request: PanamaSimulationQuery with delay_days, scenarios, horizon_days,
+                 affected_dcs and seed
+
+    Returns:
+        Percentile lost sales and stockout outcomes (see simulate_disruption)
+    """
+    if not 1 <= request.scenarios <= 100000 or not 1 <= request.horizon_days <= 365:
+        raise HTTPException(
+            status_code=400, detail="scenarios must be 1-100000 and horizon_days 1-365.")
+    try:
+        return {
+            "status": "success",
+            "timestamp": datetime.now().isoformat(),
+            "results": simulate_disruption(
+                request.delay_days, request.scenarios, request.horizon_days,
+                dcs=request.affected_dcs, seed=request.seed)
+        }
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Panama Canal simulation failed: {str(e)}")
+
+
+@app.get("/router-metrics")
+def router_metrics():
+    """Local vs LLM routing counts and per-workflow confidence of the intent router."""
+    return intent_router.metrics()
+
+
+@app.get("/workflow-teams")
+def workflow_team_stats():
+    """Agent teams built and currently idle per workflow."""
+    return workflow_teams.stats()
+
+
+@app.on_event("startup")
+def warm_workflow_teams():
+    # Build every workflow's agents before the first request instead of during it
+    if os.getenv("WARM_WORKFLOW_TEAMS", "1") == "1":
+        workflow_teams.warm()
+
+
 @app.get("/health", status_code=200)
 def health():
     return JSONResponse(content={"status": "ok"})
@@ -0,0 +1,111 @@
+"""
+Opt-in sink for intermediate tool tables (the old suppl_loc.csv, s1.csv,
+itm_*.csv and best_suppliers_*.csv debug files).
+
+Disabled by default: record_artifact() is then a no-op and the request path
+does no file I/O. With TOOL_ARTIFACTS=1 the latest tables are kept in memory
+(see recent_artifacts) and written as CSV by a background thread to
+TOOL_ARTIFACTS_DIR, keeping at most TOOL_ARTIFACTS_MAX_FILES files.
+Every file gets a unique name, so concurrent requests never overwrite each
+other's output.
+"""
+import glob
+import itertools
+import os
+import queue
+import re
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+import pandas as pd
+
+
+ARTIFACTS_ENABLED = os.getenv("TOOL_ARTIFACTS", "0").lower() in ("1", "true", "yes")
+ARTIFACTS_DIR = os.getenv("TOOL_ARTIFACTS_DIR", "./tool_artifacts")
+MAX_FILES = int(os.getenv("TOOL_ARTIFACTS_MAX_FILES", "200"))
+MAX_IN_MEMORY = int(os.getenv("TOOL_ARTIFACTS_MAX_IN_MEMORY", "50"))
+
+
+class ArtifactSink:
+    """In-memory ring buffer of recent tables plus a background CSV writer."""
+
+    def __init__(self, directory: str = ARTIFACTS_DIR, max_files: int = MAX_FILES,
+                 max_in_memory: int = MAX_IN_MEMORY, enabled: bool = ARTIFACTS_ENABLED):
+        self.directory = directory
+        self.max_files = max_files
+        self.enabled = enabled
+        self._recent = deque(maxlen=max_in_memory)
+        self._queue = queue.Queue()
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._writer = None
+
+    def record(self, name: str, df: pd.DataFrame):
+        """Buffer a table and queue it for writing; no-op when disabled."""
+        if not self.enabled:
+            return
+        entry = (time.time(), name, df.copy())
+        with self._lock:
+            self._recent.append(entry)
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+                self._writer.start()
+        self._queue.put(entry)
+
+    def recent(self, name: Optional[str] = None) -> list:
+        """[(timestamp, name, DataFrame)] still held in memory, oldest first."""
+        with self._lock:
+            return [e for e in self._recent if name is None or e[1] == name]
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until queued tables are written. Returns False on timeout."""
+        if self._writer is None:
+            return True
+        deadline = None if timeout is None else time.time() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.time() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def _path_for(self, ts: float, name: str) -> str:
+        safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", name)
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(ts))
+        return os.path.join(self.directory, f"{stamp}_{os.getpid()}_{next(self._counter):06d}_{safe}.csv")
+
+    def _run(self):
+        while True:
+            ts, name, df = self._queue.get()
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                path = self._path_for(ts, name)
+                df.to_csv(path + ".tmp", index=False)
+                os.replace(path + ".tmp", path)
+                self._prune()
+            except Exception as e:
+                print(f"Could not write artifact {name}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _prune(self):
+        files = sorted(glob.glob(os.path.join(self.directory, "*.csv")))
+        for old in files[:max(len(files) - self.max_files, 0)]:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+
+sink = ArtifactSink()
+
+
+def record_artifact(name: str, df: pd.DataFrame):
+    """Hand an intermediate table to the process-wide artifact sink."""
+    sink.record(name, df)
+
+
+def recent_artifacts(name: Optional[str] = None) -> list:
+    """Recent tables held by the process-wide artifact sink."""
+    return sink.recent(name)
@@ -0,0 +1,343 @@
+import os
+import threading
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+import snapshots
+
+
+DATA_DIR = "./updated_docs"
+
+# Column parsing rules per dataset. String columns listed here are converted
+# once per file version, so tools never re-parse "27.40%", "$1.76/pc",
+# "2 days", "1,250" or dd/mm/yy dates on the request path.
+DATASET_SCHEMAS = {
+    "open_po": {
+        "path": f"{DATA_DIR}/Open_PO_data.csv",
+        "numbers": ["Qnty Ordered", "Item value/pc with shipping", "Total PO value"],
+        "dates": {"PO date": "%d/%m/%y", "PO Due Date": "%d/%m/%y", "Supplier ETA": "%d/%m/%y"},
+    },
+    "inventory": {
+        "path": f"{DATA_DIR}/Inventory_data.csv",
+        "numbers": ["Qty", "Unit Price (USD)", "Valuation",
+                    "daily_sales_forecast_quantity", "selling_price_usd"],
+        "dates": {"Mfg Date": "%d/%m/%y", "Expiry Date": "%d/%m/%y"},
+    },
+    "production": {
+        "path": f"{DATA_DIR}/Production_data.csv",
+        "numbers": ["Qnty planned", "Qnty produced", "Planned cycle time/unit"],
+        "dates": {"Production plan date": "%d/%m/%y", "Production start date": "%d/%m/%y",
+                  "Production end date": "%d/%m/%y"},
+    },
+    "supplier": {
+        "path": f"{DATA_DIR}/Supplier_data.csv",
+        "numbers": ["Lead time (Weeks)", "Unit Price (USD)", "Air shipping cost/pc",
+                    "Sea shipping cost/pc", "Total Unit Cost with Sea shipping",
+                    "Total Unit Cost with Air shipping", "MOQ"],
+        "dates": {"Contract Date": "%d/%m/%y", "Contract Validity": "%d/%m/%y"},
+    },
+    "supplier_capacity": {
+        "path": f"{DATA_DIR}/Supplier_capacity_data.csv",
+        "numbers": ["Total monthly capacity (units)", "MOQ", "Current committed capacity (units)",
+                    "Current Output volume (units)", "Expedite Qnty possible"],
+        "percents": ["Percentage allocation to company"],
+        "currency": ["Premium to expedite"],
+        "days": ["Lead time", "Expedite Lead time"],
+    },
+    "supplier_performance": {
+        "path": f"{DATA_DIR}/Supplier_performance.csv",
+        "numbers": ["Total Deliveries", "Ontime Deliveries", "Delivery Performance (%)"],
+    },
+    "port_transfer_cost": {
+        "path": f"{DATA_DIR}/Port_transfer_cost.csv",
+        "numbers": ["transfer_cost_usd"],
+    },
+    "import_duty": {
+        "path": f"{DATA_DIR}/Import Duty.csv",
+        "percents": ["Import Duty"],
+    },
+    "grn": {
+        "path": f"{DATA_DIR}/GRN.csv",
+        "numbers": ["Qnty received"],
+    },
+    "pr": {
+        "path": f"{DATA_DIR}/pr_data.csv",
+        "numbers": ["Qnty Requested", "Estimated cost/pc with shipping", "Total PR value"],
+        "dates": {"Request Date": "%d/%m/%Y", "Need By Date": "%d/%m/%Y",
+                  "Action date (Stage 1)": "%d/%m/%Y", "Action date (Stage 2)": "%d/%m/%Y",
+                  "Action date (Stage 3)": "%d/%m/%Y"},
+    },
+    "shipment_tracker": {
+        "path": f"{DATA_DIR}/Shipment_tracker_data.csv",
+        "numbers": ["Lead time (days)"],
+    },
+}
+
+
+def parse_number(s: pd.Series) -> pd.Series:
+    """'1,250' -> 1250.0; non-numeric values become NaN."""
+    if s.dtype == object:
+        s = s.str.replace(",", "", regex=False).str.strip()
+    return pd.to_numeric(s, errors="coerce")
+
+
+def parse_percent(s: pd.Series) -> pd.Series:
+    """'27.40%' -> 27.4 (kept in percent units)."""
+    if s.dtype == object:
+        s = s.str.replace("%", "", regex=False)
+    return parse_number(s)
+
+
+def parse_currency(s: pd.Series) -> pd.Series:
+    """'$1.76/pc' -> 1.76"""
+    if s.dtype == object:
+        s = s.str.replace(r"[$,]|/pc", "", regex=True)
+    return parse_number(s)
+
+
+def parse_days(s: pd.Series) -> pd.Series:
+    """'2 days' -> 2.0; bare numbers pass through."""
+    if s.dtype == object:
+        s = s.str.extract(r"(\d+(?:\.\d+)?)", expand=False)
+    return pd.to_numeric(s, errors="coerce")
+
+
+_PARSERS = {
+    "numbers": parse_number,
+    "percents": parse_percent,
+    "currency": parse_currency,
+    "days": parse_days,
+}
+
+
+def apply_schema(df: pd.DataFrame, schema: dict) -> pd.DataFrame:
+    """Convert the columns named in a DATASET_SCHEMAS entry to numeric/datetime dtypes."""
+    for kind, parser in _PARSERS.items():
+        for col in schema.get(kind, []):
+            if col in df.columns:
+                df[col] = parser(df[col])
+    for col, fmt in schema.get("dates", {}).items():
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], format=fmt, errors="coerce")
+    return df
+
+
+def _freeze(value):
+    """
+    Turn read_csv keyword arguments into a hashable cache key.
+    Callables (e.g. converters) are keyed by their qualified name so that a
+    lambda re-created on every call still maps to the same cache entry.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    if callable(value):
+        return (getattr(value, "__module__", None), getattr(value, "__qualname__", repr(value)))
+    return value
+
+
+def _make_read_only(df: pd.DataFrame) -> pd.DataFrame:
+    """Mark every numpy block of the frame as non-writeable."""
+    for block in df._mgr.blocks:
+        values = block.values
+        if isinstance(values, np.ndarray):
+            values.flags.writeable = False
+    return df
+
+
+class KeyIndex:
+    """
+    Hash index from a business key (or composite key) to row positions.
+
+    Built once per file version from a cached frame, so ``rows(key)`` costs a
+    dict lookup plus an ``iloc`` instead of a full-column comparison.
+    Keys are plain values for a single column and tuples for composite keys,
+    e.g. ``index.rows(("SUP-001", "ITM-002"))``.
+    """
+
+    def __init__(self, df: pd.DataFrame, keys):
+        self.frame = df
+        self.keys = (keys,) if isinstance(keys, str) else tuple(keys)
+        by = self.keys[0] if len(self.keys) == 1 else list(self.keys)
+        self._positions = df.groupby(by, sort=False).indices
+
+    def __contains__(self, key) -> bool:
+        return key in self._positions
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def positions(self, key) -> np.ndarray:
+        """Row positions for key (empty array when absent)."""
+        return self._positions.get(key, np.empty(0, dtype=np.intp))
+
+    def rows(self, key) -> pd.DataFrame:
+        """Rows matching key, in file order."""
+        return self.frame.iloc[self.positions(key)]
+
+    def rows_many(self, keys) -> pd.DataFrame:
+        """Rows matching any of keys, in file order (like ``isin``)."""
+        pos = [self._positions[k] for k in dict.fromkeys(keys) if k in self._positions]
+        pos = np.sort(np.concatenate(pos)) if pos else np.empty(0, dtype=np.intp)
+        return self.frame.iloc[pos]
+
+
+class DatasetRegistry:
+    """
+    Process-wide cache of parsed CSV datasets.
+
+    Each file is parsed once per (path, read_csv kwargs) and re-parsed only when
+    its mtime or size changes. Callers receive a shallow copy of the cached frame
+    whose underlying arrays are read-only: adding or replacing columns is safe,
+    but in-place writes (e.g. ``df.loc[...] = ...``) raise, so tools that need
+    to edit cells must take a ``.copy()`` first.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._entries = {}
+
+    @staticmethod
+    def signature(path: str) -> tuple:
+        """Return the (mtime_ns, size) pair used to detect file changes."""
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+
+    def _key_lock(self, key) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _cached(self, key, abs_path: str, build):
+        # Every cache key starts with abs_path so invalidate() can find it.
+        with self._key_lock(key):
+            sig = self.signature(abs_path)
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != sig:
+                entry = (sig, build())
+                self._entries[key] = entry
+
+        return entry[1]
+
+    def _get(self, key, abs_path: str, build) -> pd.DataFrame:
+        return self._cached(key, abs_path, lambda: _make_read_only(build())).copy(deep=False)
+
+    def read_csv(self, path: str, **read_kwargs) -> pd.DataFrame:
+        """
+        Drop-in replacement for ``pd.read_csv`` backed by the cache.
+
+        Args:
+            path: CSV file path.
+            **read_kwargs: Passed through to ``pd.read_csv``.
+
+        Returns:
+            Read-only shallow copy of the parsed DataFrame.
+        """
+        abs_path = os.path.abspath(path)
+        key = (abs_path, _freeze(read_kwargs))
+        return self._get(key, abs_path, lambda: pd.read_csv(abs_path, **read_kwargs))
+
+    def dataset(self, name: str, path: Optional[str] = None) -> pd.DataFrame:
+        """
+        Load a dataset from DATASET_SCHEMAS with its columns already typed.
+
+        Args:
+            name: Key in DATASET_SCHEMAS, e.g. 'open_po' or 'inventory'.
+            path: Optional file to parse with that schema instead of the default
+                  path (tools accept CSV path overrides).
+
+        Returns:
+            Read-only shallow copy of the typed DataFrame.
+        """
+        schema = DATASET_SCHEMAS[name]
+        abs_path = os.path.abspath(path or schema["path"])
+        key = (abs_path, "typed", name)
+        return self._get(key, abs_path, lambda: self._load_typed(abs_path, schema))
+
+    def _load_typed(self, abs_path: str, schema: dict) -> pd.DataFrame:
+        if not snapshots.SNAPSHOTS_ENABLED:
+            return apply_schema(pd.read_csv(abs_path), schema)
+
+        sig = self.signature(abs_path)
+        df = snapshots.read_snapshot(abs_path, sig, schema)
+        if df is None:
+            df = apply_schema(pd.read_csv(abs_path), schema)
+            try:
+                snapshots.write_snapshot(df, abs_path, sig, schema)
+            except OSError as e:
+                print(f"Could not write snapshot for {abs_path}: {e}")
+        return df
+
+    def index(self, path: str, keys, **read_kwargs) -> KeyIndex:
+        """
+        Key index over a raw CSV (same kwargs as ``read_csv``).
+
+        Args:
+            path: CSV file path.
+            keys: Column name, or list of column names for a composite key.
+            **read_kwargs: Passed through to ``pd.read_csv``.
+
+        Returns:
+            KeyIndex, rebuilt only when the file changes.
+        """
+        abs_path = os.path.abspath(path)
+        key = (abs_path, "index", _freeze(keys), _freeze(read_kwargs))
+        return self._cached(key, abs_path, lambda: KeyIndex(self.read_csv(abs_path, **read_kwargs), keys))
+
+    def dataset_index(self, name: str, keys, path: Optional[str] = None) -> KeyIndex:
+        """Key index over a typed dataset (see ``dataset``)."""
+        abs_path = os.path.abspath(path or DATASET_SCHEMAS[name]["path"])
+        key = (abs_path, "index", _freeze(keys), name)
+        return self._cached(key, abs_path, lambda: KeyIndex(self.dataset(name, abs_path), keys))
+
+    def derived(self, path: str, name: str, build):
+        """
+        Cache any structure derived from a file (e.g. an on-disk store),
+        calling build() again only when the file's mtime or size changes.
+        """
+        abs_path = os.path.abspath(path)
+        return self._cached((abs_path, "derived", name), abs_path, build)
+
+    def version(self, path: str) -> tuple:
+        """
+        Return an opaque version token for a dataset file.
+        Derived structures (indexes, snapshots) should be rebuilt when it changes.
+        """
+        abs_path = os.path.abspath(path)
+        return (abs_path,) + self.signature(abs_path)
+
+    def invalidate(self, path: Optional[str] = None):
+        """Drop cached frames for one file, or for every file if path is None."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                return
+            abs_path = os.path.abspath(path)
+            for key in [k for k in self._entries if k[0] == abs_path]:
+                del self._entries[key]
+
+
+registry = DatasetRegistry()
+
+
+def load_dataset(name: str, path: Optional[str] = None) -> pd.DataFrame:
+    """Load a typed dataset (see DATASET_SCHEMAS) through the registry."""
+    return registry.dataset(name, path)
+
+
+def load_csv(path: str, **read_kwargs) -> pd.DataFrame:
+    """Load a CSV through the process-wide dataset registry."""
+    return registry.read_csv(path, **read_kwargs)
+
+
+def load_index(path: str, keys, **read_kwargs) -> KeyIndex:
+    """Key index over a raw CSV through the process-wide dataset registry."""
+    return registry.index(path, keys, **read_kwargs)
+
+
+def load_dataset_index(name: str, keys, path: Optional[str] = None) -> KeyIndex:
+    """Key index over a typed dataset through the process-wide dataset registry."""
+    return registry.dataset_index(name, keys, path)
@@ -0,0 +1,191 @@
+"""
+Data-first execution of workflows whose answer is a fixed tool chain.
+
+panama_canal_workflow, pr_pending_workflow,
+calculate_pr_schedule_changes_workflow and extract_invoice_details_workflow
+spend most of their agent turns reading identifiers out of the query and
+handing tool output from one agent to the next. run_direct() resolves the
+identifiers with extract_entities and calls the same tools straight away,
+independent calls in parallel:
+
+    panama_canal_workflow           delayed shipments --> rerouting --> financial impact
+                                    (panama_pipeline stage graph, cached; without a DC in
+                                    the query, for the DC with the most delayed value)
+    pr_pending_workflow             analysed_pr_details(all PRs)
+    calculate_pr_schedule_changes   calculate_eta_from_files, one call per PR
+    extract_invoice_details         extract_invoice_details || get_po_grn_details(POs in
+                                    the query), then get_po_grn_details(POs on the invoices)
+
+The caller turns the results into the workflow's chat history, optionally
+with a single narrative written by the workflow's final agent.
+"""
+import contextvars
+import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, NamedTuple, Optional
+
+from pydantic import BaseModel
+
+from entities import Entities, extract_entities
+from panama_pipeline import run_panama_stages
+from tools_manager import (
+    analysed_pr_details,
+    calculate_eta_from_files,
+    extract_invoice_details,
+    get_po_grn_details,
+)
+
+
+MAX_WORKERS = 4
+DEFAULT_DELAY_DAYS = 15
+
+# "| po_number | 104007 |" rows of the invoice tables extracted from PDFs
+INVOICE_PO_PATTERN = re.compile(r"po[_\s]?number\W*\|\s*(?:PO[-\s#]?)?(\d{5,6})\b", re.IGNORECASE)
+
+# Follow-ups approving a proposed rerouting; the panama team answers them
+# with a confirmation (its "Rerouting Approvals" prompt section), not with a
+# fresh analysis
+REROUTING_APPROVAL_PATTERN = re.compile(
+    r"\bupdate (?:the )?PO\b|\b(?:proceed|go ahead) with (?:the )?rerouting\b|\bapprove the rerouting\b"
+    r"|\binform (?:the )?(?:travel|transport) planners\b|\bnotify the logistics team\b",
+    re.IGNORECASE,
+)
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="direct-tool")
+
+
+class ToolResult(NamedTuple):
+    """Output of one tool call, attributed to the agent that would have made it."""
+    agent: str
+    tool: str
+    kwargs: dict
+    result: object
+
+    @property
+    def content(self) -> str:
+        """Result as passed to an LLM (typed results as JSON)."""
+        return self.result.model_dump_json() if isinstance(self.result, BaseModel) else str(self.result)
+
+    @property
+    def markdown(self) -> str:
+        """Result as shown in the chat history."""
+        return self.result.markdown_output if isinstance(self.result, BaseModel) else str(self.result)
+
+    def section(self) -> str:
+        """'**Response from agent (tool(args)):**' followed by the content."""
+        args = ", ".join(f"{k}={v!r}" if isinstance(v, (str, int, list)) or v is None else f"{k}=<{type(v).__name__}>"
+                         for k, v in self.kwargs.items())
+        return f"**Response from {self.agent} ({self.tool}({args})):**\n{self.content}"
+
+    def history_message(self) -> dict:
+        return {"content": self.markdown, "role": "tool", "name": self.agent}
+
+
+def run_parallel(calls: List[tuple]) -> List[ToolResult]:
+    """Run (agent name, tool function, kwargs) calls concurrently; results in call order."""
+    if len(calls) == 1:
+        agent, tool, kwargs = calls[0]
+        return [ToolResult(agent, tool.__name__, kwargs, tool(**kwargs))]
+    futures = [_executor.submit(contextvars.copy_context().run, tool, **kwargs) for _, tool, kwargs in calls]
+    return [ToolResult(agent, tool.__name__, kwargs, future.result())
+            for (agent, tool, kwargs), future in zip(calls, futures)]
+
+
+def _most_critical_dc(delay_days: int, ports: List[str]) -> Optional[str]:
+    """
+    East Coast DC with the highest value of delayed shipments (arriving at
+    one of ports, if any are named), the one the panama agents analyse first.
+    """
+    delayed = run_panama_stages(None, delay_days, "delayed_shipments")["delayed_shipments"]
+    items = [item for item in delayed.delayed_items if item.arrival_port in ports] or delayed.delayed_items
+    value_by_dc = defaultdict(float)
+    for item in items:
+        if item.destination_dc:
+            value_by_dc[item.destination_dc] += item.total_value
+    return max(value_by_dc, key=value_by_dc.get) if value_by_dc else None
+
+
+def _panama_chain(entities: Entities) -> Optional[List[ToolResult]]:
+    if len(entities.dcs) > 1:
+        return None
+    delay_days = entities.delay_days or DEFAULT_DELAY_DAYS
+    dc = entities.dcs[0] if entities.dcs else _most_critical_dc(delay_days, entities.ports)
+    if dc is None:
+        return None
+    stages = run_panama_stages(dc, delay_days, "rerouting_plan")
+    delayed = stages["delayed_shipments"]
+    return [
+        ToolResult("panama_analysis_agent", "get_delayed_shipments_to_east_coast",
+                   {"affected_dc": dc, "delay_days": delay_days}, delayed),
+        ToolResult("panama_analysis_agent", "recommend_container_rerouting",
+                   {"delayed_shipments_data": delayed}, stages["rerouting_recommendations"]),
+        ToolResult("supply_risk_agent", "calculate_financial_impact_and_recommendation",
+                   {"delayed_shipments_data": delayed, "rerouting_data": stages["rerouting_recommendations"]},
+                   stages["cost_benefit_analysis"]),
+    ]
+
+
+def _pr_pending_chain(entities: Entities) -> Optional[List[ToolResult]]:
+    if not entities.pr_numbers:
+        return None
+    return run_parallel([("p2p_compliance_agent", analysed_pr_details, {"pr_numbers_list": entities.pr_numbers})])
+
+
+def _pr_schedule_chain(entities: Entities) -> Optional[List[ToolResult]]:
+    if not entities.pr_numbers:
+        return None
+    return run_parallel([("supplier_analysis_agent", calculate_eta_from_files, {"pr_number": pr})
+                         for pr in entities.pr_numbers])
+
+
+def _invoice_chain(entities: Entities) -> Optional[List[ToolResult]]:
+    def grn_calls(po_numbers):
+        return [("p2p_compliance_agent", get_po_grn_details, {"po_number": po}) for po in po_numbers]
+
+    results = run_parallel([("documentation_agent", extract_invoice_details, {})] + grn_calls(entities.po_numbers))
+    invoices = str(results[0].result)
+    if not invoices.strip():
+        # No invoice attached: only the PO / GRN lookups remain
+        results = results[1:]
+
+    on_invoices = [f"PO-{n}" for n in INVOICE_PO_PATTERN.findall(invoices)] + extract_entities(invoices).po_numbers
+    missing = [po for po in dict.fromkeys(on_invoices) if po not in entities.po_numbers]
+    if missing:
+        results += run_parallel(grn_calls(missing))
+    return results or None
+
+
+# Queries a workflow's agents handle differently from its chain
+AGENTS_ONLY = {
+    "panama_canal_workflow": REROUTING_APPROVAL_PATTERN,
+}
+
+DIRECT_CHAINS = {
+    "panama_canal_workflow": _panama_chain,
+    "pr_pending_workflow": _pr_pending_chain,
+    "calculate_pr_schedule_changes_workflow": _pr_schedule_chain,
+    "extract_invoice_details_workflow": _invoice_chain,
+}
+
+
+def run_direct(workflow: str, query: str, chat_summary: str = "") -> Optional[List[ToolResult]]:
+    """
+    Run a workflow's tool chain without agents.
+
+    Args:
+        workflow: Workflow name (key of DIRECT_CHAINS).
+        query: The user query.
+        chat_summary: Summary of the previous conversation; identifiers not
+            named in the query are taken from it, as the agents would.
+
+    Returns:
+        ToolResults in the order the agents would have produced them, or None
+        when the workflow has no direct chain, the query is one its agents
+        handle specially (AGENTS_ONLY) or the chain's inputs cannot be
+        resolved from the query (the caller then runs the agents).
+    """
+    chain = DIRECT_CHAINS.get(workflow)
+    if chain is None or (workflow in AGENTS_ONLY and AGENTS_ONLY[workflow].search(query)):
+        return None
+    return chain(extract_entities(query, chat_summary))
@@ -0,0 +1,211 @@
+"""
+Monte Carlo disruption simulator.
+
+Instead of one fixed delay, every scenario draws a transit deviation for
+each lane (Supplier Code, Mode of Transport, delivery country) from its
+historical lead times in Shipment_tracker_data.csv, the data behind
+get_avg_lead_time / calculate_transit_time, and applies it to all open POs
+on that lane, so POs travelling together are late together. Deviations are
+taken relative to the lane median, so a lane that usually takes 30 +/- 5
+days shifts its POs by -5..+5 days around their due date. POs arriving at
+the disrupted ports also get delay_days on top.
+
+Each scenario is pushed through the day-by-day inventory projection
+(inventory_projection.simulate_stock) and the run reports percentile lost
+sales and stockout outcomes. Scenarios are simulated in vectorized batches,
+and large runs are split across a process pool. The pool's workers are
+spawned rather than forked: the API process runs threads that may hold the
+dataset registry or team pool locks at fork time.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from data_registry import load_dataset
+from inventory_projection import DateLike, arrivals_array, projection_inputs, simulate_stock
+from rerouting import EAST_COAST_PORTS
+
+
+# Cells (scenario x item x DC x day) simulated per vectorized batch
+BATCH_CELLS = 2_000_000
+CHUNK_SIZE = 2500
+MAX_WORKERS = int(os.getenv("SIM_MAX_WORKERS", str(os.cpu_count() or 1)))
+PERCENTILES = (5, 50, 95)
+
+_pool = None
+
+
+def _process_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=MAX_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def lane_deviations(pos: pd.DataFrame) -> tuple:
+    """
+    Historical (lead time - lane median) samples per lane, as one flat array
+    plus per-lane (offset, count), and the lane of every PO. Lanes without
+    history fall back to the deviations of all lanes with the same mode, then
+    to none (count 0).
+    """
+    po_lanes = pd.DataFrame({
+        'Supplier Code': pos['Supplier Code'].to_numpy(),
+        'Mode of Transport': pos['Requested Mode of Transport'].to_numpy(),
+        'Delivery Location': pos['Ship to Location'].str.split('/').str[0].to_numpy(),
+    })
+    lane_ids = {}
+    po_lane = np.array([lane_ids.setdefault(lane, len(lane_ids))
+                        for lane in po_lanes.itertuples(index=False, name=None)], dtype=np.int64)
+    lane_keys = list(lane_ids)
+    empty = np.zeros(0), np.zeros(len(lane_keys), dtype=np.int64), np.zeros(len(lane_keys), dtype=np.int64), po_lane
+    try:
+        hist = load_dataset('shipment_tracker')
+    except OSError as e:
+        print(f"Shipment tracker data unavailable, using fixed delays only: {e}")
+        return empty
+
+    lanes = list(po_lanes.columns)
+    hist = hist.dropna(subset=lanes + ['Lead time (days)'])
+    if hist.empty:
+        return empty
+    hist = hist.assign(__dev=hist['Lead time (days)'] - hist.groupby(lanes)['Lead time (days)'].transform('median'))
+
+    pools, offsets, counts = [], [], []
+    total = 0
+    by_lane = {k: v['__dev'].to_numpy() for k, v in hist.groupby(lanes)}
+    by_mode = {k: v['__dev'].to_numpy() for k, v in hist.groupby('Mode of Transport')}
+    for lane in lane_keys:
+        samples = by_lane.get(lane)
+        if samples is None:
+            samples = by_mode.get(lane[1], np.zeros(0))
+        pools.append(samples)
+        offsets.append(total)
+        counts.append(len(samples))
+        total += len(samples)
+    flat = np.concatenate(pools) if pools else np.zeros(0)
+    return flat, np.array(offsets, dtype=np.int64), np.array(counts, dtype=np.int64), po_lane
+
+
+def _simulate_chunk(args: tuple) -> tuple:
+    """Run n scenarios; returns per-scenario lost sales and per-[item, dc] stats."""
+    (seed, n, horizon_days, start_qty, daily_demand, price,
+     item, dc, due_day, qty, extra_delay, dev_flat, dev_offset, dev_count, po_lane) = args
+    rng = np.random.default_rng(seed)
+    shape = start_qty.shape
+    has_history = dev_count > 0
+    batch = max(1, BATCH_CELLS // max(start_qty.size * horizon_days, 1))
+
+    lost_sales = np.empty((n, ) + shape)
+    first_stockout = np.empty((n, ) + shape)
+    for lo in range(0, n, batch):
+        b = min(batch, n - lo)
+        deviation = 0.0
+        if len(dev_flat):
+            # One draw per lane, shared by all POs on it
+            draws = dev_offset + (rng.random((b, len(dev_count))) * np.maximum(dev_count, 1)).astype(np.int64)
+            lane_deviation = np.where(has_history, dev_flat[np.minimum(draws, len(dev_flat) - 1)], 0.0)
+            deviation = lane_deviation[:, po_lane]
+        day = np.rint(np.broadcast_to(due_day + extra_delay + deviation, (b, len(item)))).astype(np.int64)
+
+        scenario = np.repeat(np.arange(b), len(item))
+        arrivals = arrivals_array(
+            (b * shape[0], shape[1]),
+            scenario * shape[0] + np.tile(item, b), np.tile(dc, b), day.ravel(),
+            np.tile(qty, b), horizon_days,
+        ).reshape((b, ) + shape + (horizon_days, ))
+
+        _, lost_units = simulate_stock(start_qty, daily_demand, arrivals)
+        out = lost_units > 1e-9
+        lost_sales[lo:lo + b] = lost_units.sum(axis=-1) * price
+        first_stockout[lo:lo + b] = np.where(out.any(axis=-1), out.argmax(axis=-1), np.nan)
+    return lost_sales, first_stockout
+
+
+def simulate_disruption(
+    delay_days: int = 15,
+    scenarios: int = 10000,
+    horizon_days: int = 90,
+    delayed_ports: Iterable[str] = EAST_COAST_PORTS,
+    dcs: Optional[Iterable[str]] = None,
+    start_date: Optional[DateLike] = None,
+    seed: Optional[int] = None
+) -> dict:
+    """
+    Percentile lost sales and stockout outcomes over sampled transit delays.
+
+    Args:
+        delay_days: Fixed disruption delay for POs arriving at delayed_ports,
+            added to each sampled lane deviation.
+        scenarios: Number of Monte Carlo scenarios.
+        horizon_days: Days projected per scenario.
+        delayed_ports: Ports affected by the disruption.
+        dcs: DCs to simulate (default: all).
+        start_date: First projected day (default 12/06/2025).
+        seed: Random seed for reproducible runs.
+
+    Returns:
+        Dict with the run settings, 'lost_sales' percentiles and mean for the
+        whole network, 'by_dc' {dc: lost sales percentiles and stockout
+        probability} and 'items' (one record per item and DC with stockout
+        probability, median first stockout day and lost sales percentiles).
+    """
+    inputs = projection_inputs(start_date, dcs)
+    pos = inputs.pos
+    dev_flat, dev_offset, dev_count, po_lane = lane_deviations(pos)
+    extra_delay = np.where(pos['Arrival Port'].isin(list(delayed_ports)), delay_days, 0)
+    common = (
+        horizon_days, inputs.start_qty, inputs.daily_demand, inputs.price,
+        pos['__item'].to_numpy(), pos['__dc'].to_numpy(), pos['__due_day'].to_numpy(),
+        pos['__qty'].to_numpy(), extra_delay, dev_flat, dev_offset, dev_count, po_lane,
+    )
+
+    sizes = [min(CHUNK_SIZE, scenarios - lo) for lo in range(0, scenarios, CHUNK_SIZE)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(s, n) + common for s, n in zip(seeds, sizes)]
+    if len(jobs) > 1 and MAX_WORKERS > 1:
+        parts = list(_process_pool().map(_simulate_chunk, jobs))
+    else:
+        parts = [_simulate_chunk(job) for job in jobs]
+    lost_sales = np.concatenate([p[0] for p in parts])
+    first_stockout = np.concatenate([p[1] for p in parts])
+
+    def percentiles(values):
+        return {f"p{q}": round(float(v), 2) for q, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+
+    total = lost_sales.sum(axis=(1, 2))
+    by_dc = {}
+    for d, dc in enumerate(inputs.dcs):
+        dc_lost = lost_sales[:, :, d].sum(axis=1)
+        by_dc[dc] = {
+            **percentiles(dc_lost),
+            'stockout_probability': round(float((dc_lost > 0).mean()), 4),
+        }
+
+    stocked = (inputs.start_qty > 0) | (inputs.daily_demand > 0)
+    items = []
+    for i, d in zip(*np.nonzero(stocked)):
+        first = first_stockout[:, i, d]
+        hit = ~np.isnan(first)
+        items.append({
+            'item_number': inputs.items[i],
+            'dc': inputs.dcs[d],
+            'stockout_probability': round(float(hit.mean()), 4),
+            'median_stockout_day': float(np.median(first[hit])) if hit.any() else None,
+            'lost_sales': percentiles(lost_sales[:, i, d]),
+        })
+
+    return {
+        'scenarios': int(scenarios),
+        'delay_days': delay_days,
+        'horizon_days': horizon_days,
+        'start_date': inputs.start.strftime('%d/%m/%Y'),
+        'lanes_with_history': int((dev_count > 0).sum()),
+        'lost_sales': {**percentiles(total), 'mean': round(float(total.mean()), 2)},
+        'by_dc': by_dc,
+        'items': items,
+    }
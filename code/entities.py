@@ -0,0 +1,87 @@
+"""
+Deterministic extraction of business identifiers from a user query.
+
+extract_entities() pulls PO, PR, item, GRN, DC and port identifiers (and a
+delay in days) out of the query with regular expressions and normalizes them
+to the formats used in the CSVs ('po 104007' -> 'PO-104007', 'ITM-2' ->
+'ITM-002', 'dc 3' -> 'DC3'). Workflows use the result to call their first
+tools directly instead of spending an agent turn on reading an identifier
+out of the message.
+"""
+import re
+from typing import List, NamedTuple, Optional
+
+from data_registry import DATASET_SCHEMAS, load_dataset, registry
+
+
+PO_PATTERN = re.compile(r"\bPO[-\s#]?(\d{5,6})\b", re.IGNORECASE)
+PR_PATTERN = re.compile(r"\bPR[-\s#]?(\d{5,6})\b", re.IGNORECASE)
+ITEM_PATTERN = re.compile(r"\bITM[-\s]?(\d{1,3})\b", re.IGNORECASE)
+GRN_PATTERN = re.compile(r"\bGRN[-\s#]?(\d{6,})\b", re.IGNORECASE)
+DC_PATTERN = re.compile(r"\bDC[-\s]?(\d{1,2})\b", re.IGNORECASE)
+DELAY_PATTERN = re.compile(r"\b(\d{1,3})\s*-?\s*days?\b", re.IGNORECASE)
+
+
+class Entities(NamedTuple):
+    po_numbers: List[str]
+    pr_numbers: List[str]
+    item_numbers: List[str]
+    grn_numbers: List[str]
+    dcs: List[str]
+    ports: List[str]
+    delay_days: Optional[int]
+
+
+def _port_pattern() -> tuple:
+    """(regex, {lowercase place: port name}) for the ports in Port_transfer_cost.csv."""
+    def build():
+        ports = load_dataset('port_transfer_cost')
+        names = sorted(set(ports['from_port'].dropna()) | set(ports['to_port'].dropna()), key=len, reverse=True)
+        places = {re.sub(r"^port\s+", "", name, flags=re.IGNORECASE).lower(): name for name in names}
+        alternatives = "|".join(re.escape(place) for place in places)
+        # 'Port Georgia', 'port of Georgia' or 'Georgia port'
+        pattern = re.compile(rf"\bport\s+(?:of\s+)?({alternatives})\b|\b({alternatives})\s+port\b", re.IGNORECASE)
+        return pattern, places
+
+    return registry.derived(DATASET_SCHEMAS['port_transfer_cost']['path'], 'port_pattern', build)
+
+
+def _unique(values) -> list:
+    return list(dict.fromkeys(values))
+
+
+def _extract(text: str) -> Entities:
+    port_pattern, places = _port_pattern()
+    delay = DELAY_PATTERN.search(text)
+    return Entities(
+        po_numbers=_unique(f"PO-{n}" for n in PO_PATTERN.findall(text)),
+        pr_numbers=_unique(f"PR-{n}" for n in PR_PATTERN.findall(text)),
+        item_numbers=_unique(f"ITM-{int(n):03d}" for n in ITEM_PATTERN.findall(text)),
+        grn_numbers=_unique(f"GRN{n}" for n in GRN_PATTERN.findall(text)),
+        dcs=_unique(f"DC{int(n)}" for n in DC_PATTERN.findall(text)),
+        ports=_unique(places[(a or b).lower()] for a, b in port_pattern.findall(text)),
+        delay_days=int(delay.group(1)) if delay else None,
+    )
+
+
+def extract_entities(query: str, chat_summary: str = "") -> Entities:
+    """
+    Identifiers mentioned in the query.
+
+    As the workflow prompts instruct the agents, each kind of identifier is
+    taken from the new query when it mentions any, otherwise from the chat
+    summary of the previous conversation.
+
+    Args:
+        query: The new user query.
+        chat_summary: Summary of the previous conversation, if any.
+
+    Returns:
+        Entities with de-duplicated identifiers in order of appearance and
+        delay_days (None when no 'N days' is mentioned).
+    """
+    found = _extract(query or "")
+    if not (chat_summary or "").strip():
+        return found
+    previous = _extract(chat_summary)
+    return Entities(*(new if new not in ([], None) else old for new, old in zip(found, previous)))
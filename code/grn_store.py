@@ -0,0 +1,175 @@
+"""
+Memory-mapped GRN store for per-PO receipt lookups.
+
+With DATA_SNAPSHOTS=1, GRN.csv is compiled to an uncompressed Arrow IPC
+file sorted by PO number (updated_docs/.snapshots/GRN.by_po.arrow) and a
+small offset index next to it (GRN.by_po.index.arrow): one row per PO with
+its number as a fixed-width key and the (first row, row count) of its
+receipts, sorted by key. Both files are memory-mapped; a lookup binary
+searches the key column in place and slices that row range out of the
+table, so only the pages holding the PO's receipts are touched and every
+worker process shares the same page cache instead of holding its own copy
+of the GRN table or of the index.
+
+The store is rebuilt whenever GRN.csv's mtime or size changes. Without
+DATA_SNAPSHOTS nothing is written and lookups use the in-memory key index.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from data_registry import DATA_DIR, DatasetRegistry, load_dataset, load_dataset_index, registry
+from snapshots import SNAPSHOT_DIRNAME, SNAPSHOTS_ENABLED, table_to_frame
+
+
+GRN_CSV = f"{DATA_DIR}/GRN.csv"
+KEY_COLUMN = "PO number"
+
+_SOURCE_KEY = b"source_signature"
+
+
+class GRNStore:
+    """Arrow table sorted by PO number plus a sorted (key, start, length) index over it."""
+
+    def __init__(self, table: pa.Table, keys: np.ndarray, starts: np.ndarray, lengths: np.ndarray):
+        self.table = table
+        # Views over the memory-mapped index file
+        self.keys = keys
+        self.starts = starts
+        self.lengths = lengths
+
+    def _span(self, po_number) -> tuple:
+        key = str(po_number).encode()
+        i = int(np.searchsorted(self.keys, key))
+        if i < len(self.keys) and self.keys[i] == key:
+            return int(self.starts[i]), int(self.lengths[i])
+        return 0, 0
+
+    def __contains__(self, po_number) -> bool:
+        return self._span(po_number)[1] > 0
+
+    def rows(self, po_number: str) -> pd.DataFrame:
+        """Receipts for one PO, in GRN.csv order (empty frame if none)."""
+        start, length = self._span(po_number)
+        return table_to_frame(self.table.slice(start, length))
+
+
+def store_path(csv_path: str) -> str:
+    """updated_docs/GRN.csv -> updated_docs/.snapshots/GRN.by_po.arrow"""
+    folder, name = os.path.split(os.path.abspath(csv_path))
+    return os.path.join(folder, SNAPSHOT_DIRNAME, os.path.splitext(name)[0] + ".by_po.arrow")
+
+
+def index_path(csv_path: str) -> str:
+    """updated_docs/GRN.csv -> updated_docs/.snapshots/GRN.by_po.index.arrow"""
+    return store_path(csv_path)[:-len(".arrow")] + ".index.arrow"
+
+
+def _signature_bytes(csv_path: str) -> bytes:
+    return ("%d:%d" % DatasetRegistry.signature(csv_path)).encode()
+
+
+def build_store(csv_path: str = GRN_CSV) -> str:
+    """Sort the typed GRN data by PO number and write the Arrow store."""
+    signature = _signature_bytes(csv_path)
+    df = load_dataset("grn", csv_path)
+
+    # Stable sort keeps receipts of the same PO in file order; rows without
+    # a PO number can never be looked up, so they are dropped.
+    df = df[df[KEY_COLUMN].notna()].sort_values(KEY_COLUMN, kind="mergesort")
+    keys = df[KEY_COLUMN].astype(str).to_numpy()
+    starts = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+    starts = np.concatenate(([0], starts)) if len(keys) else starts
+    ends = np.append(starts[1:], len(keys))
+
+    # Fixed-width byte keys in byte order, so readers can searchsorted a
+    # zero-copy numpy view of the key column
+    key_bytes = np.array([k.encode() for k in keys[starts]], dtype=bytes)
+    order = np.argsort(key_bytes, kind="stable")
+    width = max(key_bytes.dtype.itemsize, 1)
+    index = pa.table({
+        "key": pa.array([k.ljust(width, b"\0") for k in key_bytes[order].tolist()], type=pa.binary(width)),
+        "start": pa.array(starts[order], type=pa.int64()),
+        "length": pa.array((ends - starts)[order], type=pa.int64()),
+    }, metadata={_SOURCE_KEY: signature})
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    meta = dict(table.schema.metadata or {})
+    meta[_SOURCE_KEY] = signature
+    table = table.replace_schema_metadata(meta)
+
+    path = store_path(csv_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    for target, data in ((path, table), (index_path(csv_path), index)):
+        tmp_path = f"{target}.{os.getpid()}.tmp"
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, data.schema) as writer:
+                writer.write_table(data)
+        os.replace(tmp_path, target)
+    return path
+
+
+def _read(path: str, signature: bytes):
+    if not os.path.exists(path):
+        return None
+    try:
+        table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+    except (OSError, pa.ArrowInvalid):
+        return None
+    if (table.schema.metadata or {}).get(_SOURCE_KEY) != signature:
+        return None
+    return table
+
+
+def _open(csv_path: str):
+    signature = _signature_bytes(csv_path)
+    table = _read(store_path(csv_path), signature)
+    index = _read(index_path(csv_path), signature)
+    if table is None or index is None:
+        return None
+    index = index.combine_chunks()
+    key = index.column("key").chunk(0) if index.num_rows else None
+    if key is None:
+        keys = np.array([], dtype="S1")
+    else:
+        # buffers() of a fixed-size binary array: validity, data
+        keys = np.frombuffer(key.buffers()[1], dtype=f"S{key.type.byte_width}",
+                             count=len(key), offset=key.offset * key.type.byte_width)
+    starts = index.column("start").to_numpy()
+    lengths = index.column("length").to_numpy()
+    return GRNStore(table, keys, starts, lengths)
+
+
+def _load_store(csv_path: str) -> GRNStore:
+    store = _open(csv_path)
+    if store is None:
+        build_store(csv_path)
+        store = _open(csv_path)
+    return store
+
+
+def get_grn_store(csv_path: str = GRN_CSV) -> GRNStore:
+    """Process-wide store for csv_path, reopened only when the CSV changes."""
+    return registry.derived(csv_path, "grn_store", lambda: _load_store(csv_path))
+
+
+def get_grn_rows(po_number: str, csv_path: str = GRN_CSV) -> pd.DataFrame:
+    """
+    GRN receipts for a PO number.
+
+    Served from the memory-mapped store when DATA_SNAPSHOTS is on, otherwise
+    (or when the store cannot be written, e.g. a read-only deployment) from
+    the in-memory key index.
+    """
+    if SNAPSHOTS_ENABLED:
+        try:
+            return get_grn_store(csv_path).rows(po_number)
+        except OSError as e:
+            print(f"GRN store unavailable, using in-memory index: {e}")
+    return load_dataset_index("grn", KEY_COLUMN, csv_path).rows(po_number)
+
+
+if __name__ == "__main__":
+    print(build_store())
@@ -0,0 +1,155 @@
+"""
+Local fast path for picking a workflow from a user query.
+
+IntentRouter is built from the few-shot examples of the LangChain routing
+prompt ("Q: ... Select: workflow()"). A query is matched against them with
+TF-IDF cosine similarity (stop words removed). It is routed locally only when
+the best workflow is clearly ahead of the others and a phrase typical of that
+workflow (its keyword rule) appears in the query as well; everything else,
+and every workflow that sends email, goes to the LLM pipeline.
+Identifiers such as PO-104007 or DC3 are replaced by placeholders before
+matching, so the examples generalize to other POs, PRs, items and DCs.
+
+Metrics (requests, fallback rate, per-workflow confidence) are kept in
+memory and served by the /router-metrics endpoint.
+"""
+import os
+import re
+import threading
+import time
+from typing import Callable, List, Tuple
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+
+# A query is routed locally when its best workflow scores at least MIN_SCORE
+# (cosine similarity to the closest example), leads the runner-up by
+# MIN_MARGIN and its keyword rule matches the query
+MIN_SCORE = float(os.getenv("INTENT_ROUTER_MIN_SCORE", "0.5"))
+MIN_MARGIN = 0.15
+
+EXAMPLE_PATTERN = re.compile(r"Q:\s*(.+?)\s*\n\s*Select:\s*(\w+)\(\)", re.DOTALL)
+IDENTIFIER_PATTERN = re.compile(r"\b(PO|PR|GRN|ITM|DC)[-\s#]?[\dX]+\b", re.IGNORECASE)
+
+# Workflows that send email are always left to the LLM: a wrong local guess
+# would mail an approver or supplier
+LLM_ONLY_PATTERN = re.compile(r"^send_|_email_workflow$")
+
+# Phrases typical of a workflow; a workflow without a rule is never routed locally
+KEYWORD_RULES = [
+    (re.compile(r"\bpanama\b|\breroute|\brerouting\b", re.IGNORECASE), "panama_canal_workflow"),
+    (re.compile(r"\btariffs?\b|\bimport dut(?:y|ies)\b", re.IGNORECASE), "tariff_impact_workflow"),
+    (re.compile(r"\bexpedit", re.IGNORECASE), "expedite_supply_workflow"),
+    (re.compile(r"\bdraft\b.*\bPO\b|\bemergency PO\b", re.IGNORECASE), "draft_po_workflow"),
+    (re.compile(r"\bschedule changes?\b", re.IGNORECASE), "calculate_pr_schedule_changes_workflow"),
+    (re.compile(r"\binvoice\b", re.IGNORECASE), "extract_invoice_details_workflow"),
+    (re.compile(r"\b(?:check|read)\b.*\bemails?\b", re.IGNORECASE), "read_pr_emails_workflow"),
+    (re.compile(r"\bstatus of (?:the )?PRs?\b|\bpending (?:approval|PRs?)\b", re.IGNORECASE), "pr_pending_workflow"),
+]
+
+
+def parse_examples(prompt_text: str) -> List[Tuple[str, str]]:
+    """(query, workflow name) pairs from the 'Q: ... Select: name()' examples of a prompt."""
+    return [(" ".join(q.split()), name) for q, name in EXAMPLE_PATTERN.findall(prompt_text)]
+
+
+def normalize(query: str) -> str:
+    """Lowercase the query and replace identifiers by placeholders ('PO-104007' -> 'po_id')."""
+    return IDENTIFIER_PATTERN.sub(lambda m: f" {m.group(1).lower()}_id ", query).lower()
+
+
+class IntentRouter:
+    """Nearest-example workflow classifier with LLM fallback and routing metrics."""
+
+    def __init__(self, examples: List[Tuple[str, str]], min_score: float = MIN_SCORE, min_margin: float = MIN_MARGIN):
+        self.min_score = min_score
+        self.min_margin = min_margin
+        self.intents = list(dict.fromkeys(name for _, name in examples))
+        self._labels = np.array([self.intents.index(name) for _, name in examples])
+        self._vectorizer = TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True, stop_words="english")
+        self._examples = self._vectorizer.fit_transform([normalize(q) for q, _ in examples])
+
+        self._lock = threading.Lock()
+        self._stats = {name: {"local": 0, "fallback": 0, "confidence_sum": 0.0, "agreed": 0}
+                       for name in self.intents}
+        self._requests = 0
+        self._fallbacks = 0
+        self._local_seconds = 0.0
+
+    @classmethod
+    def from_prompt(cls, prompt_text: str, **kwargs) -> "IntentRouter":
+        return cls(parse_examples(prompt_text), **kwargs)
+
+    def classify(self, query: str) -> Tuple[str, float, float]:
+        """
+        Best workflow for the query with its confidence (similarity of the
+        closest example) and its margin over the runner-up workflow.
+        """
+        similarity = (self._examples @ self._vectorizer.transform([normalize(query)]).T).toarray().ravel()
+        best = np.zeros(len(self.intents))
+        np.maximum.at(best, self._labels, similarity)
+        first, second = np.argsort(best)[::-1][:2]
+        return self.intents[first], float(best[first]), float(best[first] - best[second])
+
+    def routes_locally(self, query: str, intent: str, confidence: float, margin: float) -> bool:
+        """Whether a classification is trusted without asking the LLM."""
+        if LLM_ONLY_PATTERN.search(intent) or confidence < self.min_score or margin < self.min_margin:
+            return False
+        return any(name == intent and pattern.search(query) for pattern, name in KEYWORD_RULES)
+
+    def route(self, query: str, fallback: Callable[[str], str]) -> str:
+        """
+        Workflow name for the query: the local classification when it is
+        confident and agrees with a keyword rule, otherwise fallback(query)
+        (the LLM router).
+        """
+        start = time.perf_counter()
+        intent, confidence, margin = self.classify(query)
+        local = self.routes_locally(query, intent, confidence, margin)
+        elapsed = time.perf_counter() - start
+        chosen = intent if local else fallback(query)
+        print(f"Intent router: {intent} (confidence {confidence:.2f}, margin {margin:.2f}) -> "
+              f"{chosen} {'[local]' if local else '[LLM]'}")
+
+        with self._lock:
+            self._requests += 1
+            self._local_seconds += elapsed
+            stats = self._stats.get(chosen)
+            if stats is None:
+                stats = self._stats[chosen] = {"local": 0, "fallback": 0, "confidence_sum": 0.0, "agreed": 0}
+            if local:
+                stats["local"] += 1
+                stats["confidence_sum"] += confidence
+            else:
+                self._fallbacks += 1
+                stats["fallback"] += 1
+                stats["agreed"] += int(intent == chosen)
+        return chosen
+
+    def metrics(self) -> dict:
+        """
+        Routing counts: totals, fallback rate, mean local classification time
+        and, per workflow, local / LLM-routed requests, mean confidence of the
+        local ones and how often the LLM agreed with the local guess.
+        """
+        with self._lock:
+            intents = {
+                name: {
+                    "local": s["local"],
+                    "fallback": s["fallback"],
+                    "mean_confidence": round(s["confidence_sum"] / s["local"], 3) if s["local"] else None,
+                    "fallback_agreement": round(s["agreed"] / s["fallback"], 3) if s["fallback"] else None,
+                }
+                for name, s in self._stats.items()
+            }
+            return {
+                "requests": self._requests,
+                "local": self._requests - self._fallbacks,
+                "fallback": self._fallbacks,
+                "fallback_rate": round(self._fallbacks / self._requests, 3) if self._requests else None,
+                "mean_local_ms": round(self._local_seconds / self._requests * 1000, 3) if self._requests else None,
+                "min_score": self.min_score,
+                "min_margin": self.min_margin,
+                "intents": intents,
+            }
@@ -0,0 +1,229 @@
+"""
+Day-by-day inventory projection per item and DC.
+
+project_inventory() combines Inventory_data (stock on hand and daily sales
+forecast) with Open_PO_data due dates (inbound quantities, optionally delayed
+at some ports) into items x DCs x days arrays. Unmet demand is lost, not
+backordered, so end-of-day stock follows
+
+    x[t] = max(x[t-1] + arrivals[t] - demand, 0)
+
+which is evaluated for the whole horizon at once with cumulative sums
+(x[t] = S[t] - min(0, min(S[:t+1])) for S = x[-1] + cumsum(arrivals - demand))
+rather than a loop over days. A 180-day projection of the whole network
+takes a few milliseconds.
+"""
+from datetime import date
+from typing import Iterable, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from data_registry import load_dataset
+from production_index import DateLike, to_timestamp
+from rerouting import EAST_COAST_PORTS
+
+
+# Reference date of the bundled data (same default as analyze_po_requirements)
+DEFAULT_START_DATE = date(2025, 6, 12)
+DEFAULT_HORIZON_DAYS = 180
+
+
+def simulate_stock(start_qty: np.ndarray, daily_demand: np.ndarray, arrivals: np.ndarray) -> tuple:
+    """
+    End-of-day stock and lost units for arrivals[..., day], with start_qty and
+    daily_demand broadcast over the leading axes (e.g. [item, dc] or
+    [scenario, item, dc]). Returns (on_hand, lost_units), both shaped like
+    arrivals.
+    """
+    level = start_qty[..., None] + np.cumsum(arrivals - daily_demand[..., None], axis=-1)
+    shortfall = np.maximum(-np.minimum.accumulate(level, axis=-1), 0)
+    return level + shortfall, np.diff(shortfall, axis=-1, prepend=0)
+
+
+class InventoryProjection:
+    """
+    Projected stock for items x dcs x dates.
+
+    Attributes:
+        items, dcs: Axis labels.
+        dates: DatetimeIndex of the projected days.
+        start_qty: [item, dc] stock on hand at the start.
+        daily_demand: [item, dc] daily sales forecast.
+        price: [item, dc] selling price per unit.
+        arrivals: [item, dc, day] inbound PO quantity.
+        on_hand: [item, dc, day] stock at the end of each day.
+        lost_units: [item, dc, day] demand that could not be served.
+    """
+
+    def __init__(self, items, dcs, dates, start_qty, daily_demand, price, arrivals):
+        self.items = list(items)
+        self.dcs = list(dcs)
+        self.dates = dates
+        self.start_qty = start_qty
+        self.daily_demand = daily_demand
+        self.price = price
+        self.arrivals = arrivals
+
+        self.on_hand, self.lost_units = simulate_stock(start_qty, daily_demand, arrivals)
+
+    @property
+    def stockout(self) -> np.ndarray:
+        """[item, dc, day] True on days with unserved demand."""
+        return self.lost_units > 1e-9
+
+    def stockout_start(self) -> np.ndarray:
+        """[item, dc] index of the first stockout day, -1 if stock lasts the horizon."""
+        out = self.stockout
+        return np.where(out.any(axis=2), out.argmax(axis=2), -1)
+
+    def summary(self, days: Optional[int] = None) -> pd.DataFrame:
+        """
+        One row per (item, DC) with demand or stock: Item Number, DC,
+        Start Qty, Daily Forecast, Inbound Qty, Stockout Start (date or None),
+        Stockout Days, Lost Units and Lost Sales, over the first `days` days
+        (default: the whole horizon).
+        """
+        days = len(self.dates) if days is None else min(days, len(self.dates))
+        out = self.stockout[:, :, :days]
+        first = np.where(out.any(axis=2), out.argmax(axis=2), -1)
+        lost = self.lost_units[:, :, :days].sum(axis=2)
+
+        i, d = np.nonzero((self.start_qty > 0) | (self.daily_demand > 0))
+        start = first[i, d]
+        return pd.DataFrame({
+            'Item Number': np.asarray(self.items, dtype=object)[i],
+            'DC': np.asarray(self.dcs, dtype=object)[d],
+            'Start Qty': self.start_qty[i, d],
+            'Daily Forecast': self.daily_demand[i, d],
+            'Inbound Qty': self.arrivals[i, d, :days].sum(axis=1),
+            'Stockout Start': [self.dates[s].date() if s >= 0 else None for s in start],
+            'Stockout Days': out[i, d].sum(axis=1),
+            'Lost Units': lost[i, d],
+            'Lost Sales': lost[i, d] * self.price[i, d],
+        })
+
+
+class ProjectionInputs(NamedTuple):
+    """Arrays shared by the projection and the disruption simulator."""
+    items: list
+    dcs: list
+    start: pd.Timestamp
+    start_qty: np.ndarray
+    daily_demand: np.ndarray
+    price: np.ndarray
+    pos: pd.DataFrame
+
+
+def projection_inputs(
+    start_date: Optional[DateLike] = None,
+    dcs: Optional[Iterable[str]] = None,
+    items: Optional[Iterable[str]] = None
+) -> ProjectionInputs:
+    """
+    Stock, forecast and price per [item, dc], plus the open POs with their
+    __item/__dc axis positions and __due_day (days from start_date to the PO
+    due date, negative when already past due).
+    """
+    start = to_timestamp(start_date if start_date is not None else DEFAULT_START_DATE).normalize()
+
+    inv = load_dataset('inventory')
+    po = load_dataset('open_po')
+    inv = inv[inv['Item Number'].notna() & inv['destination_dc'].notna()]
+    po = po[po['Item Number'].notna() & po['Destination DC'].notna() & po['PO Due Date'].notna()]
+    if dcs is not None:
+        dcs = list(dict.fromkeys(dcs))
+        inv = inv[inv['destination_dc'].isin(dcs)]
+        po = po[po['Destination DC'].isin(dcs)]
+    if items is not None:
+        items = list(dict.fromkeys(items))
+        inv = inv[inv['Item Number'].isin(items)]
+        po = po[po['Item Number'].isin(items)]
+
+    if items is None:
+        items = list(pd.unique(pd.concat([inv['Item Number'], po['Item Number']])))
+    if dcs is None:
+        dcs = list(pd.unique(pd.concat([inv['destination_dc'], po['Destination DC']])))
+    item_code = {itm: n for n, itm in enumerate(items)}
+    dc_code = {dc: n for n, dc in enumerate(dcs)}
+    shape = (len(items), len(dcs))
+
+    # Stock is summed over batches; forecast and price are per item and DC
+    i = inv['Item Number'].map(item_code).to_numpy()
+    d = inv['destination_dc'].map(dc_code).to_numpy()
+    start_qty = np.zeros(shape)
+    daily_demand = np.zeros(shape)
+    price = np.zeros(shape)
+    np.add.at(start_qty, (i, d), inv['Qty'].fillna(0).to_numpy(dtype=float))
+    np.maximum.at(daily_demand, (i, d), inv['daily_sales_forecast_quantity'].fillna(0).to_numpy(dtype=float))
+    np.maximum.at(price, (i, d), inv['selling_price_usd'].fillna(0).to_numpy(dtype=float))
+
+    pos = po.assign(
+        __item=po['Item Number'].map(item_code).to_numpy(),
+        __dc=po['Destination DC'].map(dc_code).to_numpy(),
+        __due_day=(po['PO Due Date'] - start).dt.days.to_numpy(),
+        __qty=po['Qnty Ordered'].fillna(0).to_numpy(dtype=float),
+    )
+    return ProjectionInputs(items, dcs, start, start_qty, daily_demand, price, pos)
+
+
+def arrivals_array(shape: tuple, item: np.ndarray, dc: np.ndarray, day: np.ndarray,
+                   qty: np.ndarray, horizon_days: int) -> np.ndarray:
+    """[..., item, dc, day] inbound quantities; past-due POs land on day 0."""
+    day = np.maximum(day, 0)
+    keep = day < horizon_days
+    arrivals = np.zeros(shape + (horizon_days,))
+    np.add.at(arrivals, (item[keep], dc[keep], day[keep]), qty[keep])
+    return arrivals
+
+
+def project_inventory(
+    start_date: Optional[DateLike] = None,
+    horizon_days: int = DEFAULT_HORIZON_DAYS,
+    delay_days: int = 0,
+    delayed_ports: Iterable[str] = EAST_COAST_PORTS,
+    dcs: Optional[Iterable[str]] = None,
+    items: Optional[Iterable[str]] = None
+) -> InventoryProjection:
+    """
+    Project stock day by day from start_date.
+
+    Args:
+        start_date: First projected day ('dd/mm/yyyy', date or timestamp;
+            default 12/06/2025).
+        horizon_days: Number of days to project.
+        delay_days: Extra days added to the due date of POs arriving at
+            delayed_ports (e.g. a Panama Canal slowdown).
+        delayed_ports: Arrival ports affected by delay_days.
+        dcs, items: Restrict the projection (default: everything in the data).
+
+    Open POs arrive on their (possibly delayed) due date; POs already past
+    due arrive on the first projected day.
+    """
+    inputs = projection_inputs(start_date, dcs, items)
+    pos = inputs.pos
+    delay = np.where(pos['Arrival Port'].isin(list(delayed_ports)), delay_days, 0)
+    arrivals = arrivals_array(
+        inputs.start_qty.shape, pos['__item'].to_numpy(), pos['__dc'].to_numpy(),
+        pos['__due_day'].to_numpy() + delay, pos['__qty'].to_numpy(), horizon_days
+    )
+    dates = pd.date_range(inputs.start, periods=horizon_days, freq='D')
+    return InventoryProjection(inputs.items, inputs.dcs, dates, inputs.start_qty,
+                               inputs.daily_demand, inputs.price, arrivals)
+
+
+def projected_stockouts(
+    dc: str,
+    delay_days: int,
+    items: Optional[Iterable[str]] = None,
+    start_date: Optional[DateLike] = None
+) -> pd.DataFrame:
+    """
+    Projected stockouts at one DC during a delay_days window, with East Coast
+    arrivals pushed back by delay_days and all other POs arriving on time.
+    This is the projection counterpart of the Qty / daily forecast
+    days-of-supply estimate. Returns project_inventory(...).summary() rows.
+    """
+    window = max(int(delay_days), 1)
+    projection = project_inventory(start_date, window, delay_days, dcs=[dc], items=items)
+    return projection.summary(window)
@@ -0,0 +1,240 @@
+"""
+Background jobs for long-running workflow requests.
+
+A /supplier-analysis conversation takes 30-90 s and, as a synchronous
+endpoint, holds one of uvicorn's worker threads for all of it. JobQueue runs
+such requests on its own bounded thread pool instead: submit() returns a Job
+right away, clients poll it (optionally waiting for completion) and may
+cancel it.
+
+A queued job is cancelled before it starts. A running job cannot be
+interrupted mid-call, so cancellation is cooperative: code running inside a
+job checks cancellation_requested() at safe points (the group chat speaker
+selection does, ending the conversation before the next agent turn).
+
+A job can be submitted before its workflow is known (ROUTING) and name it
+with set_workflow() once it has routed the request.
+
+Per-workflow metrics (queue depth, running jobs, outcome counts, wait and
+run times) are kept in memory.
+"""
+import contextvars
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+
+MAX_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+MAX_QUEUED = int(os.getenv("JOB_MAX_QUEUED", "100"))
+# Finished jobs are kept this long for polling
+RETENTION_SECONDS = int(os.getenv("JOB_RETENTION_SECONDS", "3600"))
+# Longest a poll request may wait for a job to finish
+MAX_WAIT_SECONDS = 60
+# Workflow of a job that has not routed its request yet
+ROUTING = "routing"
+
+_current_job = contextvars.ContextVar("current_job", default=None)
+
+
+class QueueFull(Exception):
+    """Raised by JobQueue.submit when MAX_QUEUED jobs are already waiting."""
+
+
+def cancellation_requested() -> bool:
+    """True inside a job whose cancellation has been requested."""
+    job = _current_job.get()
+    return job is not None and job.cancel_requested
+
+
+def set_workflow(workflow: str):
+    """Name the current job's workflow (see ROUTING); no-op outside a job."""
+    job = _current_job.get()
+    if job is not None:
+        job.queue.set_workflow(job, workflow)
+
+
+class Job:
+    """One submitted request; status is queued, running, succeeded, failed or cancelled."""
+
+    def __init__(self, workflow: str, queue: "JobQueue"):
+        self.id = uuid.uuid4().hex
+        self.workflow = workflow
+        self.queue = queue
+        self.status = "queued"
+        self.cancel_requested = False
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+        self.future: Optional[Future] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("succeeded", "failed", "cancelled")
+
+    def to_dict(self) -> dict:
+        started = self.started_at or self.finished_at
+        return {
+            "job_id": self.id,
+            "workflow": self.workflow,
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "wait_time": round((started or time.time()) - self.submitted_at, 3),
+            "run_time": round((self.finished_at or time.time()) - self.started_at, 3) if self.started_at else None,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class JobQueue:
+    """Bounded worker pool running submitted jobs, with per-workflow metrics."""
+
+    def __init__(self, max_workers: int = MAX_WORKERS, max_queued: int = MAX_QUEUED):
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()
+        self._stats = {}
+
+    def _workflow_stats(self, workflow: str) -> dict:
+        return self._stats.setdefault(workflow, {
+            "queued": 0, "running": 0, "submitted": 0,
+            "succeeded": 0, "failed": 0, "cancelled": 0,
+            "wait_sum": 0.0, "wait_max": 0.0, "started": 0,
+            "run_sum": 0.0, "run_max": 0.0, "finished": 0,
+        })
+
+    def _prune(self):
+        cutoff = time.time() - RETENTION_SECONDS
+        for job_id in [k for k, job in self._jobs.items() if job.done and job.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+    def submit(self, workflow: str, fn: Callable, *args) -> Job:
+        """
+        Queue fn(*args) as a job for workflow.
+
+        Raises:
+            QueueFull: max_queued jobs are already waiting for a worker.
+        """
+        job = Job(workflow, self)
+        with self._lock:
+            self._prune()
+            if sum(s["queued"] for s in self._stats.values()) >= self.max_queued:
+                raise QueueFull(f"{self.max_queued} jobs are already queued")
+            stats = self._workflow_stats(workflow)
+            stats["queued"] += 1
+            stats["submitted"] += 1
+            self._jobs[job.id] = job
+        job.future = self._executor.submit(self._run, job, fn, args)
+        return job
+
+    def _run(self, job: Job, fn: Callable, args: tuple):
+        with self._lock:
+            stats = self._workflow_stats(job.workflow)
+            stats["queued"] -= 1
+            if job.cancel_requested:
+                self._finish(job, "cancelled")
+                return
+            job.status = "running"
+            job.started_at = time.time()
+            stats["running"] += 1
+
+        token = _current_job.set(job)
+        try:
+            result, error = fn(*args), None
+        except Exception as e:
+            print(f"Job {job.id} ({job.workflow}) failed: {e}")
+            result, error = None, str(e)
+        finally:
+            _current_job.reset(token)
+
+        with self._lock:
+            self._workflow_stats(job.workflow)["running"] -= 1
+            job.result = result
+            job.error = error
+            self._finish(job, "cancelled" if job.cancel_requested else "failed" if error else "succeeded")
+
+    def _finish(self, job: Job, status: str):
+        # Called with self._lock held
+        job.status = status
+        job.finished_at = time.time()
+        stats = self._workflow_stats(job.workflow)
+        stats[status] += 1
+        if job.started_at is not None:
+            # Wait times are recorded here rather than at start, under the
+            # workflow the job ended up with
+            wait = job.started_at - job.submitted_at
+            stats["started"] += 1
+            stats["wait_sum"] += wait
+            stats["wait_max"] = max(stats["wait_max"], wait)
+            run = job.finished_at - job.started_at
+            stats["finished"] += 1
+            stats["run_sum"] += run
+            stats["run_max"] = max(stats["run_max"], run)
+
+    def set_workflow(self, job: Job, workflow: str):
+        """Move a queued or running job, and its counts, to workflow."""
+        with self._lock:
+            if job.done or job.workflow == workflow:
+                return
+            old, new = self._workflow_stats(job.workflow), self._workflow_stats(workflow)
+            for key in ("submitted", job.status):
+                old[key] -= 1
+                new[key] += 1
+            job.workflow = workflow
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """
+        Request cancellation: a queued job never starts, a running one stops
+        at its next cancellation check. Returns None for an unknown job.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.done:
+                return job
+            job.cancel_requested = True
+            if job.status == "queued" and job.future.cancel():
+                # The worker will never pick it up, so settle it here
+                self._workflow_stats(job.workflow)["queued"] -= 1
+                self._finish(job, "cancelled")
+            return job
+
+    def metrics(self) -> dict:
+        """
+        Pool size and, per workflow, queue depth, running jobs, outcome
+        counts and mean / max seconds that finished jobs spent waiting for a
+        worker and running.
+        """
+        with self._lock:
+            workflows = {
+                name: {
+                    "queue_depth": s["queued"],
+                    "running": s["running"],
+                    "submitted": s["submitted"],
+                    "succeeded": s["succeeded"],
+                    "failed": s["failed"],
+                    "cancelled": s["cancelled"],
+                    "mean_wait_time": round(s["wait_sum"] / s["started"], 3) if s["started"] else None,
+                    "max_wait_time": round(s["wait_max"], 3),
+                    "mean_run_time": round(s["run_sum"] / s["finished"], 3) if s["finished"] else None,
+                    "max_run_time": round(s["run_max"], 3),
+                }
+                for name, s in self._stats.items()
+            }
+            return {
+                "workers": self.max_workers,
+                "max_queued": self.max_queued,
+                "queue_depth": sum(s["queued"] for s in self._stats.values()),
+                "running": sum(s["running"] for s in self._stats.values()),
+                "workflows": workflows,
+            }
@@ -0,0 +1,126 @@
+"""
+Vectorized landed-cost engine over Supplier_data.csv.
+
+landed_costs() expands every supplier row into one row per shipping mode and
+computes unit + shipping (+ import duty) cost for all item x supplier x mode
+combinations in one pass. best_suppliers() then answers multi-item,
+per-country "best supplier" queries with a single sort and de-duplication,
+instead of filtering, applying and grouping once per item.
+"""
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from data_registry import load_dataset, parse_percent, registry
+
+
+SUPPLIER_CSV = "./updated_docs/Supplier_data.csv"
+
+SHIPPING_COLUMNS = {
+    "sea": "Sea shipping cost/pc",
+    "air": "Air shipping cost/pc",
+}
+
+# Import Duty.csv names delivery countries differently from Supplier_data.csv
+DELIVERY_COUNTRY_ALIASES = {"US": "USA"}
+
+
+def shipping_mode_key(shipping_mode: str) -> str:
+    """'Air' -> 'air'; anything other than air is treated as sea (as the tools always have)."""
+    return "air" if str(shipping_mode).strip().lower() == "air" else "sea"
+
+
+def _cost_base(supplier_csv: str) -> pd.DataFrame:
+    def build():
+        sup = load_dataset("supplier", supplier_csv)
+        sup["__row"] = np.arange(len(sup))
+        sup["__delivery_country"] = (
+            sup["Delivery location"].str.split("/").str[0].str.strip().replace(DELIVERY_COUNTRY_ALIASES)
+        )
+        frames = []
+        for mode, column in SHIPPING_COLUMNS.items():
+            frames.append(sup.assign(**{
+                "Shipping Mode": mode,
+                "Shipping Cost/pc": sup[column],
+                "Total Cost": sup["Unit Price (USD)"] + sup[column],
+            }))
+        return pd.concat(frames, ignore_index=True)
+
+    return registry.derived(supplier_csv, "landed_cost_base", build)
+
+
+def landed_costs(
+    supplier_csv: str = SUPPLIER_CSV,
+    duties: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
+    """
+    Cost of every supplier row for every shipping mode.
+
+    Adds 'Shipping Mode', 'Shipping Cost/pc' and 'Total Cost' (unit price +
+    shipping). When duties (Import Duty.csv layout; the 'Import Duty' column
+    may hold '12%' strings) are given, also adds 'Import Duty (%)' charged on
+    the total cost and 'Landed Cost'. Lanes missing from duties get 0%.
+    """
+    base = _cost_base(supplier_csv)
+    if duties is None:
+        return base
+
+    rates = duties[["Supplier Location", "Delivery Location"]].copy()
+    rates["Import Duty (%)"] = parse_percent(duties["Import Duty"].astype(str))
+    rates = rates.drop_duplicates(["Supplier Location", "Delivery Location"], keep="last")
+
+    out = base.merge(
+        rates,
+        left_on=["Supplier Location", "__delivery_country"],
+        right_on=["Supplier Location", "Delivery Location"],
+        how="left",
+    ).drop(columns="Delivery Location")
+    out["Import Duty (%)"] = out["Import Duty (%)"].fillna(0.0)
+    out["Landed Cost"] = out["Total Cost"] * (1 + out["Import Duty (%)"] / 100)
+    return out
+
+
+def best_suppliers(
+    item_numbers: Iterable[str],
+    delivery_location: str,
+    shipping_mode: str = "sea",
+    rank_by: Sequence[str] = ("Total Cost",),
+    exclude_locations: Iterable[str] = (),
+    supplier_csv: str = SUPPLIER_CSV,
+    duties: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
+    """
+    Best supplier per (item, supplier country) for one delivery location and mode.
+
+    Args:
+        item_numbers: Items to evaluate; output follows this order.
+        delivery_location: Exact 'Delivery location' value, e.g. 'US/New York'.
+        shipping_mode: 'sea' or 'air'.
+        rank_by: Columns to minimise, in priority order (ties keep file order).
+        exclude_locations: Supplier countries to leave out (case-insensitive).
+        duties: Optional import duty table, enables ranking by 'Landed Cost'.
+
+    Returns:
+        One row per item and supplier country, ordered by item then country.
+    """
+    item_numbers = list(dict.fromkeys(item_numbers))
+    costs = landed_costs(supplier_csv, duties)
+
+    mask = (
+        (costs["Shipping Mode"] == shipping_mode_key(shipping_mode))
+        & (costs["Delivery location"] == delivery_location)
+        & costs["Item Number"].isin(item_numbers)
+    )
+    excluded = {loc.strip().lower() for loc in exclude_locations}
+    if excluded:
+        mask &= ~costs["Supplier Location"].str.strip().str.lower().isin(excluded)
+
+    candidates = costs[mask].assign(
+        __item_order=lambda d: d["Item Number"].map({itm: i for i, itm in enumerate(item_numbers)})
+    )
+    ranked = candidates.sort_values(
+        ["__item_order", "Supplier Location", *rank_by, "__row"], kind="mergesort"
+    )
+    best = ranked.drop_duplicates(["Item Number", "Supplier Location"], keep="first")
+    return best.drop(columns=["__item_order"]).reset_index(drop=True)
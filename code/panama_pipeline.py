@@ -0,0 +1,179 @@
+"""
+Stage graph behind the /panama-canal-analysis endpoint.
+
+Each analysis stage runs once per (affected_dc, delay_days, rerouting solver,
+data version) and hands its structured output to the stages that depend on
+it, instead of every section re-running get_delayed_shipments_to_east_coast
+and recommend_container_rerouting:
+
+    delayed_shipments --> stockout_risk
+                     \\--> rerouting_recommendations --> cost_benefit_analysis
+
+Stages whose inputs are ready run concurrently on a thread pool. Finished
+stage results are kept in a small LRU cache keyed on the data version of the
+CSVs they read, so repeated requests reuse them until a file changes.
+Cached results are shared between requests and must be treated as read-only.
+"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Iterable, NamedTuple, Tuple
+
+from data_registry import DATASET_SCHEMAS, registry
+from tools_manager import (
+    calculate_financial_impact_and_recommendation,
+    get_delayed_shipments_to_east_coast,
+    recommend_container_rerouting,
+)
+
+
+# Datasets read by the Panama stages; a change to any of them invalidates results
+PANAMA_DATASETS = ("open_po", "inventory", "port_transfer_cost")
+
+CACHE_SIZE = 64
+MAX_WORKERS = 4
+
+
+class Stage(NamedTuple):
+    deps: Tuple[str, ...]
+    params: Tuple[str, ...]
+    run: Callable
+
+
+# run(params, results) -> stage output; results holds the outputs of deps
+STAGES = {
+    "delayed_shipments": Stage(
+        deps=(),
+        params=("affected_dc", "delay_days"),
+        run=lambda p, r: get_delayed_shipments_to_east_coast(p["affected_dc"], p["delay_days"]),
+    ),
+    "stockout_risk": Stage(
+        deps=("delayed_shipments",),
+        params=("affected_dc", "delay_days"),
+        run=lambda p, r: calculate_financial_impact_and_recommendation(r["delayed_shipments"]),
+    ),
+    "rerouting_recommendations": Stage(
+        deps=("delayed_shipments",),
+        params=("affected_dc", "delay_days", "solver"),
+        run=lambda p, r: recommend_container_rerouting(r["delayed_shipments"], solver=p["solver"]),
+    ),
+    "cost_benefit_analysis": Stage(
+        deps=("delayed_shipments", "rerouting_recommendations"),
+        params=("affected_dc", "delay_days", "solver"),
+        run=lambda p, r: calculate_financial_impact_and_recommendation(
+            r["delayed_shipments"], r["rerouting_recommendations"]),
+    ),
+}
+
+# analysis_type -> stages whose results are returned
+ANALYSIS_TARGETS = {
+    "delayed_shipments": ("delayed_shipments",),
+    "stockout_risk": ("stockout_risk",),
+    "rerouting": ("rerouting_recommendations",),
+    "cost_benefit": ("cost_benefit_analysis",),
+    # Tool chain of panama_canal_workflow
+    "rerouting_plan": ("delayed_shipments", "rerouting_recommendations", "cost_benefit_analysis"),
+    "full": ("delayed_shipments", "stockout_risk", "rerouting_recommendations", "cost_benefit_analysis"),
+}
+
+
+def data_version() -> tuple:
+    """Version token of every CSV the Panama stages read."""
+    return tuple(registry.version(DATASET_SCHEMAS[name]["path"]) for name in PANAMA_DATASETS)
+
+
+class StageCache:
+    """LRU of stage results; concurrent requests for the same key share one run."""
+
+    def __init__(self, size: int = CACHE_SIZE):
+        self.size = size
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get_or_run(self, key, compute: Callable):
+        with self._lock:
+            future = self._entries.get(key)
+            owner = future is None
+            if owner:
+                future = self._entries[key] = Future()
+                while len(self._entries) > self.size:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+
+        if owner:
+            try:
+                future.set_result(compute())
+            except BaseException as e:
+                with self._lock:
+                    if self._entries.get(key) is future:
+                        del self._entries[key]
+                future.set_exception(e)
+        return future.result()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+stage_cache = StageCache()
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="panama-stage")
+
+
+def _required(targets: Iterable[str]) -> list:
+    """targets plus everything they depend on, dependencies first."""
+    order, seen = [], set()
+
+    def visit(name):
+        if name in seen:
+            return
+        seen.add(name)
+        for dep in STAGES[name].deps:
+            visit(dep)
+        order.append(name)
+
+    for name in targets:
+        visit(name)
+    return order
+
+
+def run_panama_stages(
+    affected_dc: str,
+    delay_days: int = 15,
+    analysis_type: str = "full",
+    solver: str = "greedy"
+) -> dict:
+    """
+    Run the stages needed for analysis_type and return {stage name: output}
+    for its target stages.
+
+    Args:
+        affected_dc: DC to analyze, e.g. 'DC3'.
+        delay_days: Days of Panama Canal delay.
+        analysis_type: Key of ANALYSIS_TARGETS ('full', 'rerouting', ...).
+        solver: Rerouting solver passed to recommend_container_rerouting.
+    """
+    if analysis_type not in ANALYSIS_TARGETS:
+        return {}
+
+    targets = ANALYSIS_TARGETS[analysis_type]
+    params = {"affected_dc": affected_dc, "delay_days": delay_days, "solver": solver}
+    version = data_version()
+    results = {}
+
+    def execute(name):
+        stage = STAGES[name]
+        key = (name, tuple(params[p] for p in stage.params), version)
+        return stage_cache.get_or_run(key, lambda: stage.run(params, results))
+
+    pending = _required(targets)
+    running = {}
+    while pending or running:
+        for name in [n for n in pending if all(d in results for d in STAGES[n].deps)]:
+            pending.remove(name)
+            running[_executor.submit(execute, name)] = name
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            results[running.pop(future)] = future.result()
+
+    return {name: results[name] for name in targets}
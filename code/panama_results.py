@@ -0,0 +1,360 @@
+"""
+Typed results of the Panama Canal tools.
+
+get_delayed_shipments_to_east_coast, analyze_stockout_risk_by_dc,
+recommend_container_rerouting, calculate_cost_benefit_analysis and
+calculate_financial_impact_and_recommendation return these models, so the
+next stage reads fields instead of parsing markdown. Markdown is rendered only
+when a result is shown: to_markdown() / str(), or the markdown_output field
+of the JSON dump that autogen posts to the chat and FastAPI returns.
+
+Agents sometimes pass the rendered markdown on instead of the JSON. That
+text is never parsed: coerce() turns it into a result whose message asks the
+agent to pass the tool result on unchanged.
+
+A result with a message (nothing found, bad input, error) renders as that
+message. Results are built from plain Python values (see records()), so the
+JSON dump has no numpy scalars and round-trips through model_validate.
+"""
+from abc import abstractmethod
+from typing import Any, List, Optional, Union
+
+import pandas as pd
+from pydantic import BaseModel, ConfigDict, computed_field
+
+Number = Union[int, float]
+
+# Message of a result coerced from text that is not a JSON tool result
+NOT_JSON_MESSAGE = ("Error: expected the JSON result of the previous Panama Canal tool, got text. "
+                    "Pass the tool result on unchanged (the JSON object it returned), not its markdown or a summary.")
+
+
+def records(df: pd.DataFrame) -> list:
+    """DataFrame rows as dicts of plain Python values, NaN/NaT as None."""
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+
+class PanamaResult(BaseModel):
+    """Base of the Panama Canal tool results."""
+    model_config = ConfigDict(extra='ignore')
+
+    message: Optional[str] = None
+
+    @classmethod
+    def coerce(cls, data: Any):
+        """
+        Accept a result or its dict / JSON dump (as passed back by an agent);
+        other text gives a result with NOT_JSON_MESSAGE, anything else None.
+        """
+        if isinstance(data, cls):
+            return data
+        if isinstance(data, dict):
+            return cls.model_validate(data)
+        if isinstance(data, str):
+            return cls.model_validate_json(data) if data.strip().startswith('{') else cls(message=NOT_JSON_MESSAGE)
+        return None
+
+    @computed_field
+    @property
+    def markdown_output(self) -> str:
+        return self.message if self.message is not None else self.to_markdown()
+
+    @abstractmethod
+    def to_markdown(self) -> str:
+        """The result as markdown (used when it has no message)."""
+
+    def __str__(self) -> str:
+        return self.markdown_output
+
+
+class DelayedItem(BaseModel):
+    model_config = ConfigDict(extra='ignore')
+
+    item_number: str
+    po_number: Optional[str] = None
+    item_description: Optional[str] = None
+    destination_dc: Optional[str] = None
+    arrival_port: Optional[str] = None
+    container_no: Optional[str] = None
+    quantity_ordered: int = 0
+    total_value: float = 0.0
+    po_due_date: Optional[str] = None
+    delayed_due_date: Optional[str] = None
+    delay_days: Optional[int] = None
+
+
+class DelayedShipmentsResult(PanamaResult):
+    """Output of get_delayed_shipments_to_east_coast."""
+    affected_dc: Optional[str] = None
+    delay_days: int = 15
+    delayed_items: List[DelayedItem] = []
+    total_value_at_risk: float = 0.0
+    summary_stats: dict = {}
+
+    def to_markdown(self) -> str:
+        table = pd.DataFrame({
+            'PO number': [i.po_number for i in self.delayed_items],
+            'Item Number': [i.item_number for i in self.delayed_items],
+            'Item Description': [i.item_description for i in self.delayed_items],
+            'Destination DC': [i.destination_dc for i in self.delayed_items],
+            'Arrival Port': [i.arrival_port for i in self.delayed_items],
+            'Container no': [i.container_no for i in self.delayed_items],
+            'Qnty Ordered': [i.quantity_ordered for i in self.delayed_items],
+            'Total Value': [f"${i.total_value:,.2f}" for i in self.delayed_items],
+            'PO Due Date': [i.po_due_date for i in self.delayed_items],
+            'Delayed Due Date': [i.delayed_due_date for i in self.delayed_items],
+            'Delay Days': [i.delay_days for i in self.delayed_items],
+        })
+        scope = 'Analysis for ' + self.affected_dc if self.affected_dc != 'All East Coast DCs' else 'East Coast DCs'
+        output = f"**PANAMA CANAL DELAY IMPACT - HIGH-RISK EAST COAST SHIPMENTS**\n"
+        output += f"{scope}: {len(self.delayed_items)} high-risk shipments delayed {self.delay_days} days\n"
+        output += f"Total Value at Risk: ${self.total_value_at_risk:,.2f}\n\n"
+        output += table.to_markdown(index=False)
+        return output
+
+
+class StockoutItem(BaseModel):
+    item_number: str
+    item_description: Optional[str] = None
+    classification: Optional[str] = None
+    current_inventory: Number = 0
+    daily_sales_forecast_quantity: Number = 0
+    days_of_supply: float = 0.0
+    selling_price_usd: Optional[float] = None
+    inbound_qty: Optional[float] = None
+    stockout_start: Optional[str] = None
+    potential_lost_sales: float = 0.0
+
+
+class StockoutRiskResult(PanamaResult):
+    """Output of analyze_stockout_risk_by_dc."""
+    dc_name: Optional[str] = None
+    delay_days: int = 15
+    use_projection: bool = False
+    items: List[StockoutItem] = []
+    total_lost_sales: float = 0.0
+
+    def to_markdown(self) -> str:
+        columns = {
+            'Item Number': 'item_number',
+            'Item Description': 'item_description',
+            'Classification': 'classification',
+            'Current Inventory': 'current_inventory',
+            'daily_sales_forecast_quantity': 'daily_sales_forecast_quantity',
+            'Days_of_Supply': 'days_of_supply',
+            'selling_price_usd': 'selling_price_usd',
+            'Potential Lost Sales': 'potential_lost_sales',
+        }
+        if self.use_projection:
+            columns = dict(list(columns.items())[:-1] + [('Inbound Qty', 'inbound_qty'), ('Stockout Start', 'stockout_start'),
+                                                         ('Potential Lost Sales', 'potential_lost_sales')])
+        table = pd.DataFrame({col: [getattr(i, field) for i in self.items] for col, field in columns.items()})
+        table['Days_of_Supply'] = table['Days_of_Supply'].round(1)
+        table['Potential Lost Sales'] = table['Potential Lost Sales'].round(2)
+
+        output = f"**STOCKOUT RISK ANALYSIS - {self.dc_name}**\n"
+        output += f"High-selling products (Classification A) at risk due to {self.delay_days}-day delay:\n\n"
+        output += table.to_markdown(index=False)
+        output += f"\n\n**Total Potential Lost Sales: ${self.total_lost_sales:,.2f}**"
+        return output
+
+
+class ReroutingOption(BaseModel):
+    """One container of rerouting.rerouting_options (column names kept)."""
+    model_config = ConfigDict(extra='allow')
+
+    Item_Number: Optional[str] = None
+    Item_Description: Optional[str] = None
+    PO_Number: Optional[str] = None
+    Container_No: Optional[str] = None
+    Donor_DC: Optional[str] = None
+    Donor_DOS: Optional[str] = None
+    From_Port: Optional[str] = None
+    To_DC: Optional[str] = None
+    Quantity: Number = 0
+    Shipment_Value: float = 0.0
+    Rerouting_Cost: float = 0.0
+
+
+class ReroutingResult(PanamaResult):
+    """Output of recommend_container_rerouting."""
+    affected_dc: Optional[str] = None
+    solver: str = 'greedy'
+    options_found: int = 0
+    container_information: List[ReroutingOption] = []
+    total_rerouting_cost: float = 0.0
+    total_shipment_value: float = 0.0
+    plan_summary: Optional[dict] = None
+
+    @property
+    def recommendation(self) -> str:
+        cost = self.total_rerouting_cost
+        if self.plan_summary:
+            # An optimal plan is worth it when the lost sales it prevents exceed its cost
+            prevented = self.plan_summary['lost_sales_before'] - self.plan_summary['lost_sales_after']
+            return 'PROCEED with rerouting' if prevented > cost else 'EVALUATE ALTERNATIVES'
+        roi_percentage = ((self.total_shipment_value - cost) / cost * 100) if cost > 0 else 0
+        return 'PROCEED with rerouting' if roi_percentage > 100 else 'EVALUATE ALTERNATIVES'
+
+    def to_markdown(self) -> str:
+        output = f"**CONTAINER REROUTING RECOMMENDATIONS FOR {self.affected_dc}**\n"
+        if self.plan_summary:
+            output += f"Optimal plan: {len(self.container_information)} containers from DCs with 15+ days supply:\n\n"
+        else:
+            output += f"Found {self.options_found} viable rerouting options from DCs with 15+ days supply:\n\n"
+
+        headers = ['PO Number', 'Item', 'Donor DC', 'From Port', 'To DC',
+                   'Qty', 'Value', 'Reroute Cost']
+        table_rows = ['| ' + ' | '.join(headers) + ' |',
+                      '|' + '|'.join([':' + '-' * (len(h) - 1) for h in headers]) + '|']
+        for rec in self.container_information:
+            row = [
+                rec.PO_Number,
+                f"{rec.Item_Number} - {(rec.Item_Description or '')[:20]}...",
+                f"{rec.Donor_DC} ({rec.Donor_DOS}d)",
+                rec.From_Port,
+                rec.To_DC,
+                f"{rec.Quantity:,.0f}",
+                f"${rec.Shipment_Value:,.0f}",
+                f"${rec.Rerouting_Cost:,.0f}",
+            ]
+            table_rows.append('| ' + ' | '.join([str(cell) for cell in row]) + ' |')
+        output += '\n'.join(table_rows)
+
+        output += f"\n\n**REROUTING SUMMARY:**\n"
+        output += f"- Total Shipment Value: ${self.total_shipment_value:,.2f}\n"
+        output += f"- Total Rerouting Cost: ${self.total_rerouting_cost:,.2f}\n"
+        if self.plan_summary:
+            output += f"- Shortfall Covered: {self.plan_summary['covered_qty']:,.0f} of {self.plan_summary['shortfall_qty']:,.0f} units\n"
+            output += f"- Lost Sales: ${self.plan_summary['lost_sales_before']:,.2f} without rerouting, ${self.plan_summary['lost_sales_after']:,.2f} with this plan\n"
+        output += f"- Recommendation: {self.recommendation}"
+        return output
+
+
+class CostBenefitResult(PanamaResult):
+    """Output of calculate_cost_benefit_analysis."""
+    affected_dc: Optional[str] = None
+    delay_days: int = 15
+    high_risk_items: int = 0
+    total_lost_sales: float = 0.0
+    total_rerouting_cost: float = 0.0
+    container_count: int = 0
+
+    @property
+    def net_benefit(self) -> float:
+        return self.total_lost_sales - self.total_rerouting_cost
+
+    @property
+    def roi(self) -> float:
+        cost = self.total_rerouting_cost
+        return (self.net_benefit / cost) * 100 if cost > 0 else 0
+
+    def to_markdown(self) -> str:
+        table = pd.DataFrame({
+            'Cost Category': [
+                'Potential Lost Sales (Do Nothing)',
+                'Container Rerouting Cost',
+                'Net Value (total lost sales value - rerouting cost)',
+                'ROI of Rerouting (%)'
+            ],
+            'Amount (USD)': [
+                f"${self.total_lost_sales:,.2f}",
+                f"${self.total_rerouting_cost:,.2f}",
+                f"${self.net_benefit:,.2f}",
+                f"{self.roi:.1f}%"
+            ],
+            'Impact': [
+                'Revenue Loss',
+                'One-time Cost',
+                'Savings/Loss',
+                'Return on Investment'
+            ]
+        })
+        if self.net_benefit > 0:
+            recommendation = "✅ **RECOMMEND REROUTING**: Rerouting containers will save money and prevent stockouts."
+        else:
+            recommendation = "❌ **DO NOT REROUTE**: Rerouting costs exceed potential lost sales."
+
+        output = f"**COST-BENEFIT ANALYSIS - PANAMA CANAL DELAY**\n"
+        output += f"Analysis for {self.affected_dc} with {self.delay_days}-day delay:\n\n"
+        output += table.to_markdown(index=False)
+        output += f"\n\n{recommendation}"
+        output += f"\n\n**Key Insights:**"
+        output += f"\n• {self.high_risk_items} high-selling items at risk of stockout"
+        if self.container_count > 0:
+            output += f"\n• {self.container_count} containers identified for rerouting"
+        else:
+            output += f"\n• No suitable containers available for rerouting"
+        output += f"\n• Break-even rerouting cost: ${self.total_lost_sales:,.2f}"
+        return output
+
+
+class LossItem(BaseModel):
+    item_number: str
+    item_description: Optional[str] = None
+    current_inventory: Number = 0
+    days_of_supply: float = 0.0
+    stockout_days: float = 0.0
+    lost_sales: float = 0.0
+
+
+class FinancialImpactResult(PanamaResult):
+    """Output of calculate_financial_impact_and_recommendation."""
+    affected_dc: Optional[str] = None
+    delay_days: int = 15
+    delayed_shipments: int = 0
+    total_shipment_value: float = 0.0
+    loss_items: List[LossItem] = []
+    total_lost_sales: float = 0.0
+    rerouting_available: bool = False
+    total_rerouting_cost: float = 0.0
+    container_count: int = 0
+    recommendation: str = ""
+
+    def to_markdown(self) -> str:
+        output = f"**FINANCIAL IMPACT ANALYSIS - PANAMA CANAL DELAY**\n"
+        output += f"Analysis for {self.affected_dc} with {self.delay_days}-day delay:\n\n"
+
+        # Delayed shipments summary
+        output += f"**DELAYED SHIPMENTS SUMMARY**\n"
+        output += f"• Total shipments delayed: {self.delayed_shipments}\n"
+        output += f"• Total shipment value: ${self.total_shipment_value:,.2f}\n"
+        output += f"• Delay period: {self.delay_days} days\n\n"
+
+        if not self.loss_items:
+            output += f"**GOOD NEWS: No Lost Sales Expected**\n"
+            output += f"{self.affected_dc} has sufficient inventory to cover the {self.delay_days}-day delay.\n"
+            output += f"All delayed items have adequate Days of Supply.\n\n"
+            output += "✅ **RECOMMENDATION**: No immediate action required. Monitor situation."
+            return output
+
+        output += f"**POTENTIAL LOST SALES ANALYSIS**\n"
+        output += f"Items at risk of stockout during {self.delay_days}-day delay:\n\n"
+        loss_summary = pd.DataFrame({
+            'Item Number': [i.item_number for i in self.loss_items],
+            'Item Description': [i.item_description for i in self.loss_items],
+            'Current Inventory': [i.current_inventory for i in self.loss_items],
+            'Days_of_Supply': [round(i.days_of_supply, 1) for i in self.loss_items],
+            'Potential Lost Sales': [f"${round(i.lost_sales, 2):,.2f}" for i in self.loss_items],
+        })
+        output += loss_summary.to_markdown(index=False)
+        output += f"\n\n**TOTAL POTENTIAL LOST SALES: ${self.total_lost_sales:,.2f}**\n\n"
+
+        if self.rerouting_available:
+            output += f"**COST-BENEFIT ANALYSIS**\n"
+            output += f"• Potential Lost Sales: ${self.total_lost_sales:,.2f}\n"
+            output += f"• Rerouting Cost: ${self.total_rerouting_cost:,.2f}\n"
+
+        output += f"{self.recommendation}\n\n"
+
+        # Key insights
+        worst = max(self.loss_items, key=lambda i: i.lost_sales)
+        avg_stockout = sum(i.stockout_days for i in self.loss_items) / len(self.loss_items)
+        output += f"**KEY INSIGHTS:**\n"
+        output += f"• {len(self.loss_items)} items will experience stockouts\n"
+        output += f"• Average stockout period: {avg_stockout:.1f} days\n"
+        output += f"• Highest-impact item: {worst.item_description}\n"
+        if self.rerouting_available and self.container_count > 0:
+            output += f"• {self.container_count} containers available for rerouting\n"
+        output += f"• Break-even rerouting cost: ${self.total_lost_sales:,.2f}"
+        return output
@@ -0,0 +1,112 @@
+"""
+Panama Canal delay sensitivity sweep.
+
+Evaluates every East Coast DC across a range of delay values in one pass.
+Days of supply, stockout lost sales and shipment value at risk are computed
+as DC x item x delay arrays with the same rules as
+get_delayed_shipments_to_east_coast and
+calculate_financial_impact_and_recommendation, instead of calling those
+tools once per DC and delay.
+"""
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from data_registry import load_dataset
+from rerouting import EAST_COAST_PORTS
+
+
+def _matrix(a: np.ndarray, decimals: int = 2) -> list:
+    """Round for JSON; NaN (item not stocked at a DC) becomes None."""
+    a = np.round(a.astype(float), decimals)
+    return np.where(np.isnan(a), None, a).tolist()
+
+
+def panama_delay_sweep(
+    delay_days: Iterable[int],
+    affected_dcs: Optional[Iterable[str]] = None
+) -> dict:
+    """
+    Delay sensitivity of every East Coast DC.
+
+    For each DC and delay D (as in the single-DC tools):
+        - high-risk items are Class A inventory lines with DOS < D;
+        - delayed shipments are the DC's East Coast POs for those items, or
+          all of its East Coast POs when it has no high-risk items;
+        - lost sales are (D - DOS) x daily forecast x selling price over the
+          DC's inventory lines for the delayed items, where DOS < D.
+
+    Args:
+        delay_days: Delay values to evaluate.
+        affected_dcs: DCs to include (default: every DC with East Coast POs).
+
+    Returns:
+        Dict of axis labels ('dcs', 'delay_days', 'items') and matrices
+        indexed [dc][delay] ('value_at_risk', 'lost_sales', 'delayed_shipments',
+        'high_risk_items'), [dc][item][delay] ('item_lost_sales') and
+        [dc][item] ('days_of_supply', None when the DC does not stock the item).
+    """
+    delays = np.array(sorted(set(int(d) for d in delay_days)), dtype=float)
+    po_df = load_dataset('open_po')
+    inv_df = load_dataset('inventory')
+
+    east = po_df[po_df['Arrival Port'].isin(EAST_COAST_PORTS)]
+    if affected_dcs is None:
+        dcs = list(pd.unique(east['Destination DC'].dropna()))
+    else:
+        dcs = list(dict.fromkeys(affected_dcs))
+    east = east[east['Destination DC'].isin(dcs)]
+    inv = inv_df[inv_df['destination_dc'].isin(dcs) & inv_df['Item Number'].notna()]
+    items = list(pd.unique(pd.concat([east['Item Number'], inv['Item Number']]).dropna()))
+
+    n_dc, n_item, n_delay = len(dcs), len(items), len(delays)
+    dc_code = {dc: i for i, dc in enumerate(dcs)}
+    item_code = {itm: i for i, itm in enumerate(items)}
+
+    # East Coast shipments per (DC, item): count and value
+    s_dc = east['Destination DC'].map(dc_code).to_numpy()
+    s_item = east['Item Number'].map(item_code).to_numpy()
+    valid = ~(pd.isna(s_dc) | pd.isna(s_item))
+    s_dc, s_item = s_dc[valid].astype(int), s_item[valid].astype(int)
+    s_value = (east['Qnty Ordered'] * east['Item value/pc with shipping']).to_numpy(dtype=float)[valid]
+    ship_count = np.zeros((n_dc, n_item))
+    ship_value = np.zeros((n_dc, n_item))
+    np.add.at(ship_count, (s_dc, s_item), 1)
+    np.add.at(ship_value, (s_dc, s_item), np.nan_to_num(s_value))
+
+    # Inventory lines: DOS, and the lowest Class A DOS per (DC, item)
+    l_dc = inv['destination_dc'].map(dc_code).to_numpy().astype(int)
+    l_item = inv['Item Number'].map(item_code).to_numpy().astype(int)
+    daily = inv['daily_sales_forecast_quantity'].to_numpy(dtype=float)
+    dos = inv['Qty'].to_numpy(dtype=float) / np.where(daily == 0, 1, daily)
+    class_a = (inv['Classification'] == 'A').to_numpy()
+
+    min_dos = np.full((n_dc, n_item), np.inf)
+    np.minimum.at(min_dos, (l_dc, l_item), np.where(np.isnan(dos), np.inf, dos))
+    min_dos_a = np.full((n_dc, n_item), np.inf)
+    np.minimum.at(min_dos_a, (l_dc[class_a], l_item[class_a]), np.nan_to_num(dos[class_a], nan=np.inf))
+
+    # [dc, item, delay] masks
+    high_risk = min_dos_a[:, :, None] < delays
+    any_high_risk = high_risk.any(axis=1, keepdims=True)
+    delayed = (ship_count[:, :, None] > 0) & (high_risk | ~any_high_risk)
+
+    # Lost sales per inventory line and delay, summed per (DC, item)
+    line_lost = np.clip(delays - dos[:, None], 0, None) * (daily * inv['selling_price_usd'].to_numpy(dtype=float))[:, None]
+    item_lost = np.zeros((n_dc, n_item, n_delay))
+    np.add.at(item_lost, (l_dc, l_item), np.nan_to_num(line_lost))
+    item_lost = np.where(delayed, item_lost, 0.0)
+
+    stocked_dos = np.where(np.isinf(min_dos), np.nan, min_dos)
+    return {
+        'dcs': dcs,
+        'delay_days': delays.astype(int).tolist(),
+        'items': items,
+        'value_at_risk': _matrix((ship_value[:, :, None] * delayed).sum(axis=1)),
+        'lost_sales': _matrix(item_lost.sum(axis=1)),
+        'delayed_shipments': (ship_count[:, :, None] * delayed).sum(axis=1).astype(int).tolist(),
+        'high_risk_items': high_risk.sum(axis=1).astype(int).tolist(),
+        'item_lost_sales': _matrix(item_lost),
+        'days_of_supply': _matrix(stocked_dos, 1),
+    }
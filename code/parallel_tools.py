@@ -0,0 +1,65 @@
+"""
+Concurrent execution of the tool calls in one assistant message.
+
+autogen runs the tool_calls of a message one after another. When an agent
+asks for several lookups at once (get_best_suppliers for a few items or
+locations, get_open_po_data for several POs, ...) they have no data
+dependency on each other, so parallel_tool_calls_reply runs them on a thread
+pool and returns the tool responses in the order of the calls, exactly as
+the sequential reply would.
+
+Tools with side effects (update_import_duties keeps the latest duty table in
+module state, the e-mail tools send mail) are not reordered: a message that
+calls any of them is executed sequentially.
+"""
+import contextvars
+import inspect
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from autogen import ConversableAgent
+
+
+MAX_WORKERS = int(os.getenv("TOOL_MAX_WORKERS", "4"))
+
+SEQUENTIAL_TOOLS = {
+    "update_import_duties",
+    "email_sending_tool",
+    "email_sending_tool_generic",
+    "send_reminder_email_to_approver",
+}
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="tool-call")
+
+
+def parallel_tool_calls_reply(agent: ConversableAgent, messages=None, sender=None, config=None):
+    """Drop-in replacement for ConversableAgent.generate_tool_calls_reply."""
+    if messages is None:
+        messages = agent._oai_messages[sender]
+    tool_calls = messages[-1].get("tool_calls", [])
+    names = [call.get("function", {}).get("name") for call in tool_calls]
+    if len(tool_calls) < 2 or SEQUENTIAL_TOOLS.intersection(names) or any(
+            inspect.iscoroutinefunction(agent.function_map.get(name)) for name in names):
+        return ConversableAgent.generate_tool_calls_reply(agent, messages, sender, config)
+
+    print(f"Running {len(tool_calls)} tool calls of {agent.name} concurrently: {', '.join(names)}")
+    # Each call runs in a copy of the request's context (e.g. its PDF folder)
+    futures = [_executor.submit(contextvars.copy_context().run, agent.execute_function, call.get("function", {}))
+               for call in tool_calls]
+    tool_returns = []
+    for call, future in zip(tool_calls, futures):
+        _, func_return = future.result()
+        content = func_return.get("content", "")
+        response = {"tool_call_id": call["id"]} if call.get("id") is not None else {}
+        response.update(role="tool", content="" if content is None else content)
+        tool_returns.append(response)
+    return True, {
+        "role": "tool",
+        "tool_responses": tool_returns,
+        "content": "\n\n".join(agent._str_for_tool_response(r) for r in tool_returns),
+    }
+
+
+def enable_parallel_tool_calls(agent: ConversableAgent):
+    """Make agent execute the tool calls of a message concurrently."""
+    agent.replace_reply_func(ConversableAgent.generate_tool_calls_reply, parallel_tool_calls_reply)
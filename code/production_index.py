@@ -0,0 +1,146 @@
+"""
+Interval index over Production_data.csv.
+
+Answers "which production orders overlap [a, b] (optionally for SKU X)" with
+a binary search per SKU instead of a scan of the production table. The
+schedule and the index are built once per version of the CSV.
+"""
+from datetime import date, datetime
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from data_registry import DATASET_SCHEMAS, apply_schema, load_csv, registry
+
+
+PRODUCTION_CSV = "./updated_docs/Production_data.csv"
+
+DateLike = Union[str, date, datetime, pd.Timestamp]
+
+
+def production_schedule(production_csv: str = PRODUCTION_CSV) -> pd.DataFrame:
+    """
+    Production orders prepared for PO matching, built once per file version:
+    the display columns (start/end dates rendered as dd-mm-YYYY) plus
+    __desc (normalized SKU desc), __start_dt/__end_dt and __rate
+    (Qnty planned per production day, NaN when the span is unknown).
+    """
+    def build():
+        raw = load_csv(production_csv)
+        typed = apply_schema(raw.copy(), DATASET_SCHEMAS['production'])
+
+        schedule = raw.copy()
+        schedule['Qnty planned'] = typed['Qnty planned']
+        for col in ['Production start date', 'Production end date']:
+            schedule[col] = typed[col].dt.strftime('%d-%m-%Y')
+
+        total_days = (typed['Production end date'] - typed['Production start date']).dt.days + 1
+        schedule['__desc'] = raw['SKU desc'].str.strip().str.lower()
+        schedule['__start_dt'] = typed['Production start date']
+        schedule['__end_dt'] = typed['Production end date']
+        schedule['__total_days'] = total_days
+        schedule['__rate'] = typed['Qnty planned'] / total_days.where(total_days > 0)
+        return schedule
+
+    return registry.derived(production_csv, 'po_requirements', build)
+
+
+def to_timestamp(value: DateLike) -> pd.Timestamp:
+    """Parse 'dd/mm/yyyy' (day first) strings, dates and timestamps."""
+    if isinstance(value, str):
+        return pd.to_datetime(value, dayfirst=True)
+    return pd.Timestamp(value)
+
+
+class ProductionIntervalIndex:
+    """
+    Sorted-interval index over a production schedule.
+
+    Each order is the closed interval [start, end]; an order missing one date
+    is treated as the single day it has, and one missing both is not indexed.
+    Per SKU (and for all SKUs together) orders are kept sorted by start along
+    with the longest span, so an overlap query bisects to the candidates
+    starting in [a - longest span, b] and only checks their ends.
+    """
+
+    _ALL = object()
+
+    def __init__(self, schedule: pd.DataFrame):
+        self.schedule = schedule
+        start = schedule['__start_dt'].fillna(schedule['__end_dt'])
+        end = schedule['__end_dt'].fillna(schedule['__start_dt'])
+        valid = start.notna().to_numpy()
+
+        self._start = start.to_numpy(dtype='datetime64[ns]')
+        self._end = end.to_numpy(dtype='datetime64[ns]')
+        positions = np.flatnonzero(valid)
+
+        self._groups = {self._ALL: self._build_group(positions)}
+        descs = schedule['__desc'].to_numpy()[positions]
+        for desc in pd.unique(descs):
+            if isinstance(desc, str):
+                self._groups[desc] = self._build_group(positions[descs == desc])
+
+    def _build_group(self, positions: np.ndarray) -> tuple:
+        order = positions[np.argsort(self._start[positions], kind='stable')]
+        starts = self._start[order]
+        span = (self._end[order] - starts).max() if len(order) else np.timedelta64(0, 'ns')
+        return order, starts, max(span, np.timedelta64(0, 'ns'))
+
+    def descriptions(self) -> list:
+        """Normalized SKU descriptions present in the index."""
+        return [k for k in self._groups if k is not self._ALL]
+
+    def overlapping(self, window_start: DateLike, window_end: DateLike, sku_desc: Optional[str] = None) -> np.ndarray:
+        """
+        Row positions (in file order) of orders overlapping [window_start, window_end].
+
+        Args:
+            window_start, window_end: Inclusive window bounds.
+            sku_desc: Restrict to one SKU description (matched case/space-insensitively).
+        """
+        key = self._ALL if sku_desc is None else sku_desc.strip().lower()
+        group = self._groups.get(key)
+        if group is None:
+            return np.empty(0, dtype=np.intp)
+
+        order, starts, span = group
+        a = to_timestamp(window_start).to_datetime64()
+        b = to_timestamp(window_end).to_datetime64()
+        lo = np.searchsorted(starts, a - span, side='left')
+        hi = np.searchsorted(starts, b, side='right')
+        candidates = order[lo:hi]
+        return np.sort(candidates[self._end[candidates] >= a])
+
+    def rows(self, window_start: DateLike, window_end: DateLike, sku_desc: Optional[str] = None) -> pd.DataFrame:
+        """Schedule rows overlapping the window, in file order."""
+        return self.schedule.iloc[self.overlapping(window_start, window_end, sku_desc)]
+
+    def descriptions_in_window(self, window_start: DateLike, window_end: DateLike) -> set:
+        """Normalized SKU descriptions with at least one order overlapping the window."""
+        return {
+            desc for desc in self.descriptions()
+            if len(self.overlapping(window_start, window_end, desc))
+        }
+
+
+def get_production_index(production_csv: str = PRODUCTION_CSV) -> ProductionIntervalIndex:
+    """Process-wide interval index, rebuilt only when Production_data.csv changes."""
+    return registry.derived(
+        production_csv, 'production_intervals',
+        lambda: ProductionIntervalIndex(production_schedule(production_csv))
+    )
+
+
+def production_orders_in_window(
+    window_start: DateLike,
+    window_end: DateLike,
+    sku_desc: Optional[str] = None,
+    production_csv: str = PRODUCTION_CSV
+) -> pd.DataFrame:
+    """
+    Production orders overlapping [window_start, window_end], optionally for one SKU.
+    Dates may be 'dd/mm/yyyy' strings, dates or timestamps.
+    """
+    return get_production_index(production_csv).rows(window_start, window_end, sku_desc)
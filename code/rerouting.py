@@ -0,0 +1,281 @@
+"""
+Container rerouting planner for Panama Canal delay analysis.
+
+rerouting_options() builds the donor inventory x candidate shipment x
+port-cost table with a few merges, for every DC in the data, and ranks it
+with a single sort. optimal_rerouting_plan() picks the containers to
+reroute from that table as a mixed-integer program (scipy/HiGHS) that
+minimises rerouting cost plus the lost sales left uncovered.
+"""
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import Bounds, LinearConstraint, milp
+from scipy.sparse import csr_matrix
+
+
+# East Coast ports (where Panama Canal delays land)
+EAST_COAST_PORTS = ['Port Georgia', 'Port New York', 'Port Boston']
+
+# Used when the affected DC has no open POs to take its port from
+DEFAULT_TARGET_PORT = 'Port Georgia'
+
+# Used when Port_transfer_cost.csv has no entry for a port pair
+DEFAULT_REROUTING_COST = 1500
+
+
+def target_port_for(po_df: pd.DataFrame, affected_dc: str) -> str:
+    """Arrival port of the affected DC's first open PO (default Port Georgia)."""
+    ports = po_df.loc[po_df['Destination DC'] == affected_dc, 'Arrival Port']
+    return ports.iloc[0] if not ports.empty else DEFAULT_TARGET_PORT
+
+
+def rerouting_options(
+    affected_dc: str,
+    high_risk_items: Iterable[str],
+    po_df: pd.DataFrame,
+    inv_df: pd.DataFrame,
+    port_cost_df: pd.DataFrame,
+    min_dos_threshold: float = 15
+) -> pd.DataFrame:
+    """
+    Every open non-East-Coast shipment of a high-risk item, bound for another
+    DC, whose DC holds at least min_dos_threshold days of supply of that item
+    and could therefore give the container up to affected_dc.
+
+    Args:
+        affected_dc: DC that needs inventory.
+        high_risk_items: Item numbers at risk; ties in cost keep this order.
+        po_df: Typed open PO data ('open_po' dataset).
+        inv_df: Typed inventory data ('inventory' dataset).
+        port_cost_df: Port transfer costs ('port_transfer_cost' dataset).
+        min_dos_threshold: Minimum donor days of supply.
+
+    Returns:
+        DataFrame sorted by Rerouting_Cost with the columns Item_Number,
+        Item_Description, PO_Number, Container_No, Donor_DC, Donor_DOS
+        (formatted), Donor_DOS_Days, Donor_Spare_Qty, From_Port, To_DC,
+        Quantity, Shipment_Value, Rerouting_Cost.
+    """
+    items = list(dict.fromkeys(high_risk_items))
+    item_rank = {itm: i for i, itm in enumerate(items)}
+
+    # Donor days of supply: best inventory line per (DC, item), other DCs only.
+    # Spare_Qty is the donor's supply (that line plus everything inbound on
+    # open POs) above min_dos_threshold days, i.e. what it can give away.
+    inv = inv_df[inv_df['Item Number'].isin(items) & (inv_df['destination_dc'] != affected_dc)]
+    daily = inv['daily_sales_forecast_quantity'].replace(0, 1)
+    inbound = po_df.groupby(['Destination DC', 'Item Number'])['Qnty Ordered'].sum()
+    inbound = inbound.reindex(pd.MultiIndex.from_arrays([inv['destination_dc'], inv['Item Number']]))
+    donors = (
+        inv.assign(DOS=inv['Qty'] / daily,
+                   Spare_Qty=inv['Qty'] + inbound.fillna(0).to_numpy() - min_dos_threshold * daily)
+           .sort_values('DOS', ascending=False, kind='mergesort')
+           .drop_duplicates(['destination_dc', 'Item Number'])
+           [['destination_dc', 'Item Number', 'DOS', 'Spare_Qty']]
+    )
+    # Unknown DOS (NaN) is not treated as insufficient, matching the old loop
+    donors = donors[~(donors['DOS'] < min_dos_threshold)]
+
+    # Candidate shipments from those donors that avoid the East Coast
+    ships = po_df[
+        po_df['Item Number'].isin(items)
+        & ~po_df['Arrival Port'].isin(EAST_COAST_PORTS)
+        & (po_df['Destination DC'] != affected_dc)
+    ]
+    ships = ships.assign(__po_pos=np.arange(len(ships)))
+    cand = ships.merge(
+        donors,
+        left_on=['Destination DC', 'Item Number'],
+        right_on=['destination_dc', 'Item Number'],
+    )
+
+    # Transfer cost from each shipment's port to the affected DC's port
+    costs = (
+        port_cost_df[port_cost_df['to_port'] == target_port_for(po_df, affected_dc)]
+        .drop_duplicates('from_port', keep='first')[['from_port', 'transfer_cost_usd']]
+    )
+    cand = cand.merge(costs, left_on='Arrival Port', right_on='from_port', how='left')
+
+    options = pd.DataFrame({
+        'Item_Number': cand['Item Number'],
+        'Item_Description': cand['Item Description'],
+        'PO_Number': cand['PO number'],
+        'Container_No': cand['Container no'],
+        'Donor_DC': cand['Destination DC'],
+        'Donor_DOS': cand['DOS'].map(lambda v: f"{v:.1f}"),
+        'Donor_DOS_Days': cand['DOS'],
+        'Donor_Spare_Qty': cand['Spare_Qty'],
+        'From_Port': cand['Arrival Port'],
+        'To_DC': affected_dc,
+        'Quantity': cand['Qnty Ordered'],
+        'Shipment_Value': cand['Total PO value'],
+        'Rerouting_Cost': cand['transfer_cost_usd'].fillna(DEFAULT_REROUTING_COST)
+                                                  .astype(port_cost_df['transfer_cost_usd'].dtype),
+    })
+
+    # Deterministic tie order: item, donor DC, file order; then cheapest first
+    options['__item'] = cand['Item Number'].map(item_rank)
+    options['__po_pos'] = cand['__po_pos']
+    options = (
+        options.sort_values(['__item', 'Donor_DC', '__po_pos'], kind='mergesort')
+               .sort_values('Rerouting_Cost', kind='mergesort')
+               .drop(columns=['__item', '__po_pos'])
+               .reset_index(drop=True)
+    )
+    return options
+
+
+def dc_shortfall(
+    inv_df: pd.DataFrame,
+    affected_dc: str,
+    items: Iterable[str],
+    delay_days: float
+) -> pd.DataFrame:
+    """
+    Units each item at affected_dc is short over delay_days, and what a unit
+    of lost sales costs. Uses the same per-inventory-line formula as
+    calculate_cost_benefit_analysis: (delay_days - DOS) x daily forecast.
+
+    Returns:
+        DataFrame with To_DC, Item_Number, Shortfall_Qty and Unit_Lost_Sales,
+        one row per item that is actually short.
+    """
+    items = list(dict.fromkeys(items))
+    inv = inv_df[(inv_df['destination_dc'] == affected_dc) & inv_df['Item Number'].isin(items)]
+    daily = inv['daily_sales_forecast_quantity'].replace(0, 1)
+    short = (delay_days * daily - inv['Qty']).clip(lower=0)
+    lines = pd.DataFrame({
+        'Item_Number': inv['Item Number'],
+        'Shortfall_Qty': short,
+        'Lost_Sales': short * inv['selling_price_usd'],
+    })
+    out = lines.groupby('Item_Number', sort=False)[['Shortfall_Qty', 'Lost_Sales']].sum().reset_index()
+    out = out[out['Shortfall_Qty'] > 0]
+    out['Unit_Lost_Sales'] = out['Lost_Sales'] / out['Shortfall_Qty']
+    out.insert(0, 'To_DC', affected_dc)
+    return out.drop(columns='Lost_Sales').reset_index(drop=True)
+
+
+def _group_rows(keys: pd.DataFrame, n_vars: int, offset: int = 0, weights=None):
+    """Sparse 0/1 (or weighted) rows selecting the variables of each key group."""
+    codes, uniques = pd.factorize(pd.MultiIndex.from_frame(keys))
+    cols = np.arange(len(codes)) + offset
+    data = np.ones(len(codes)) if weights is None else np.asarray(weights, dtype=float)
+    return csr_matrix((data, (codes, cols)), shape=(len(uniques), n_vars)), uniques, codes
+
+
+def _solve_item(opts: pd.DataFrame, shortfall: pd.DataFrame) -> np.ndarray:
+    """0/1 choice per row of opts (all one item) from the mixed-integer program."""
+    n, m = len(opts), len(shortfall)
+    qty = opts['Quantity'].to_numpy(dtype=float)
+    demand = opts['__demand'].to_numpy()
+    c = np.concatenate([
+        opts['Rerouting_Cost'].to_numpy(dtype=float),
+        -shortfall['Unit_Lost_Sales'].to_numpy(dtype=float),
+    ])
+
+    # y_d - sum(q_c x_c for c serving d) <= 0; capping q_c at the shortfall
+    # leaves the integer solutions unchanged but tightens the LP relaxation
+    need = shortfall['Shortfall_Qty'].to_numpy(dtype=float)
+    serve = csr_matrix(
+        (np.concatenate([-np.minimum(qty, need[demand]), np.ones(m)]),
+         (np.concatenate([demand, np.arange(m)]), np.concatenate([np.arange(n), n + np.arange(m)]))),
+        shape=(m, n + m)
+    )
+    constraints = [LinearConstraint(serve, -np.inf, 0)]
+
+    # Each container at most once
+    once, _, _ = _group_rows(opts[['Container_No']], n + m)
+    if once.shape[0] < n:
+        constraints.append(LinearConstraint(once, 0, 1))
+
+    # Donor supply is shared by every container taken from it
+    spare = opts['Donor_Spare_Qty'].to_numpy(dtype=float)
+    limited = np.isfinite(spare)
+    if limited.any():
+        donor_rows, _, codes = _group_rows(opts[['Donor_DC']], n + m, weights=qty)
+        limits = np.full(donor_rows.shape[0], np.inf)
+        np.minimum.at(limits, codes[limited], spare[limited])
+        constraints.append(LinearConstraint(donor_rows, -np.inf, limits))
+
+    bounds = Bounds(np.zeros(n + m), np.concatenate([np.ones(n), need]))
+    integrality = np.concatenate([np.ones(n), np.zeros(m)])
+    res = milp(c, constraints=constraints, bounds=bounds, integrality=integrality)
+    if res.x is None:
+        raise RuntimeError(f"Rerouting optimisation failed: {res.message}")
+    return res.x[:n] > 0.5
+
+
+def optimal_rerouting_plan(options: pd.DataFrame, shortfall: pd.DataFrame) -> tuple:
+    """
+    Globally cheapest set of containers to reroute.
+
+    Decision variables are x_c (reroute container option c or not) and y_d
+    (units of shortfall d covered). The program minimises
+
+        sum(Rerouting_Cost_c * x_c) + sum(Unit_Lost_Sales_d * (Shortfall_Qty_d - y_d))
+
+    subject to
+        - y_d <= Shortfall_Qty_d and y_d <= Quantity of the containers chosen for d,
+        - each container is rerouted at most once (even if it appears for
+          several DCs),
+        - the containers taken from a donor (DC, item) add up to no more than
+          its Donor_Spare_Qty, so its stock plus remaining inbound POs still
+          cover min_dos_threshold days.
+
+    A container only carries one item and donor supply is per item, so the
+    program splits into one small independent problem per item. A container
+    is only worth its cost when the lost sales it prevents exceed it, so the
+    plan may be empty.
+
+    Args:
+        options: Output of rerouting_options (one or more To_DC values).
+        shortfall: Output of dc_shortfall for the same DCs.
+
+    Returns:
+        (plan, summary): the chosen rows of options, cheapest first, and a dict
+        with shortfall_qty, covered_qty, rerouting_cost, lost_sales_before,
+        lost_sales_after and total_cost.
+    """
+    shortfall = shortfall.reset_index(drop=True)
+    opts = options.reset_index(drop=True).merge(
+        shortfall[['To_DC', 'Item_Number']].assign(__demand=np.arange(len(shortfall))),
+        on=['To_DC', 'Item_Number']
+    )
+    # A container never covers more than min(Quantity, shortfall), so one that
+    # costs more than those lost sales can be left out of every optimal plan
+    need = shortfall['Shortfall_Qty'].to_numpy(dtype=float)
+    unit_lost = shortfall['Unit_Lost_Sales'].to_numpy(dtype=float)
+    demand = opts['__demand'].to_numpy()
+    worth = np.minimum(opts['Quantity'].to_numpy(dtype=float), need[demand]) * unit_lost[demand]
+    opts = opts[opts['Rerouting_Cost'].to_numpy(dtype=float) < worth].reset_index(drop=True)
+
+    chosen = np.zeros(len(opts), dtype=bool)
+    for item, rows in opts.groupby('Item_Number', sort=False).indices.items():
+        demands = shortfall.index[shortfall['Item_Number'] == item]
+        item_opts = opts.iloc[rows].assign(__demand=lambda d: np.searchsorted(demands, d['__demand']))
+        chosen[rows] = _solve_item(item_opts, shortfall.loc[demands])
+
+    covered = np.minimum(
+        np.bincount(opts['__demand'].to_numpy()[chosen], weights=opts['Quantity'].to_numpy(dtype=float)[chosen],
+                    minlength=len(shortfall)),
+        need,
+    )
+    plan = (
+        opts[chosen].drop(columns='__demand')
+                    .sort_values('Rerouting_Cost', kind='mergesort')
+                    .reset_index(drop=True)
+    )
+    rerouting_cost = float(plan['Rerouting_Cost'].sum())
+    lost_after = float(((need - covered) * unit_lost).sum())
+    summary = {
+        'shortfall_qty': float(need.sum()),
+        'covered_qty': float(covered.sum()),
+        'rerouting_cost': rerouting_cost,
+        'lost_sales_before': float((need * unit_lost).sum()),
+        'lost_sales_after': lost_after,
+        'total_cost': rerouting_cost + lost_after,
+    }
+    return plan, summary
@@ -0,0 +1,116 @@
+"""
+Columnar snapshots of the CSVs in updated_docs.
+
+When DATA_SNAPSHOTS=1, every typed dataset (see data_registry.DATASET_SCHEMAS)
+is compiled once to an Arrow IPC (Feather v2) file under
+updated_docs/.snapshots/ and later process starts read that file instead of
+running the CSV text parser. Each snapshot records the source CSV's
+mtime/size and the schema it was built with; a snapshot that no longer
+matches is ignored and rebuilt on the next load.
+
+Compile all snapshots up front with:
+
+    cd code && python snapshots.py
+"""
+import hashlib
+import os
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+
+SNAPSHOTS_ENABLED = os.getenv("DATA_SNAPSHOTS", "0").lower() in ("1", "true", "yes")
+SNAPSHOT_DIRNAME = ".snapshots"
+
+_SOURCE_KEY = b"source_signature"
+_SCHEMA_KEY = b"schema_hash"
+
+
+def snapshot_path(csv_path: str) -> str:
+    """updated_docs/GRN.csv -> updated_docs/.snapshots/GRN.arrow"""
+    folder, name = os.path.split(os.path.abspath(csv_path))
+    return os.path.join(folder, SNAPSHOT_DIRNAME, os.path.splitext(name)[0] + ".arrow")
+
+
+def _schema_hash(schema: dict) -> bytes:
+    return hashlib.sha1(repr(sorted(schema.items())).encode()).hexdigest().encode()
+
+
+def _source_signature(signature: tuple) -> bytes:
+    return ("%d:%d" % signature).encode()
+
+
+def read_snapshot(csv_path: str, signature: tuple, schema: dict) -> Optional[pd.DataFrame]:
+    """
+    Return the snapshot for csv_path if it was built from this exact CSV
+    version and schema, otherwise None.
+    """
+    path = snapshot_path(csv_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        table = feather.read_table(path, memory_map=True)
+    except (OSError, pa.ArrowInvalid):
+        return None
+    meta = table.schema.metadata or {}
+    if meta.get(_SOURCE_KEY) != _source_signature(signature) or meta.get(_SCHEMA_KEY) != _schema_hash(schema):
+        return None
+    return table_to_frame(table)
+
+
+def table_to_frame(table: pa.Table) -> pd.DataFrame:
+    """Convert an Arrow table to the frame read_csv would have produced."""
+    df = table.to_pandas()
+    # Arrow hands back None for missing strings where read_csv gives NaN.
+    for name, column in zip(table.column_names, table.columns):
+        if column.null_count and df[name].dtype == object:
+            df[name] = df[name].fillna(np.nan)
+    return df
+
+
+def write_snapshot(df: pd.DataFrame, csv_path: str, signature: tuple, schema: dict) -> str:
+    """
+    Write df as the snapshot for csv_path. The file is written under a
+    temporary name and renamed, so concurrent readers never see a partial file.
+    """
+    path = snapshot_path(csv_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    meta = dict(table.schema.metadata or {})
+    meta[_SOURCE_KEY] = _source_signature(signature)
+    meta[_SCHEMA_KEY] = _schema_hash(schema)
+    table = table.replace_schema_metadata(meta)
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    feather.write_feather(table, tmp_path, compression="uncompressed")
+    os.replace(tmp_path, path)
+    return path
+
+
+def compile_snapshots(names=None) -> dict:
+    """
+    Build snapshots for the given dataset names (default: all that exist).
+
+    Returns:
+        {dataset name: snapshot path}
+    """
+    from data_registry import DATASET_SCHEMAS, DatasetRegistry, apply_schema
+
+    written = {}
+    for name in names or DATASET_SCHEMAS:
+        schema = DATASET_SCHEMAS[name]
+        if not os.path.exists(schema["path"]):
+            continue
+        signature = DatasetRegistry.signature(schema["path"])
+        df = apply_schema(pd.read_csv(schema["path"]), schema)
+        written[name] = write_snapshot(df, schema["path"], signature, schema)
+    return written
+
+
+if __name__ == "__main__":
+    for name, path in compile_snapshots().items():
+        print(f"{name}: {path}")
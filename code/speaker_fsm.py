@@ -0,0 +1,93 @@
+"""
+Deterministic speaker selection over a group chat's declared transitions.
+
+With speaker_selection_method="auto", GroupChatManager asks the LLM for the
+next speaker whenever the last speaker has more than one allowed successor.
+In the workflows that is almost always an agent with a self-loop
+(`agent: [agent, next_agent]`), which exists only so the agent can run and
+follow up its own tool calls. TransitionSelector walks the transitions as a
+state machine and settles those cases from the last message:
+
+- a tool call goes to the agent that executes it (autogen's func_call_filter);
+- after a tool result the agent speaks again, to summarise the result or to
+  call another tool;
+- after a plain reply the agent's turn is over, so the self-loop is dropped.
+
+With tool_handoff=True (opt-in per workflow, see agent_registry) the turn
+passes on straight after a successful tool result of an agent with a single
+tool. That saves the agent's summary turn, but the next agent then sees the
+raw tool output instead of the summary.
+
+Only when several successors remain (e.g. `you: [panama_analysis_agent,
+optibuy_agent]`) is the LLM consulted, by returning "auto".
+
+Speaker selection is also where a cancelled job (see jobs) ends its
+conversation: returning None makes the GroupChatManager stop before the next
+agent turn.
+"""
+import threading
+from collections import defaultdict
+
+from autogen import Agent, GroupChat
+
+from jobs import cancellation_requested
+
+
+_lock = threading.Lock()
+_counts = defaultdict(lambda: {"graph": 0, "llm": 0})
+
+
+def _tool_count(agent: Agent) -> int:
+    llm_config = getattr(agent, "llm_config", None)
+    return len(llm_config.get("tools", [])) if isinstance(llm_config, dict) else 0
+
+
+def _failed(message: dict) -> bool:
+    return any(str(r.get("content", "")).startswith("Error")
+               for r in message.get("tool_responses", []))
+
+
+class TransitionSelector:
+    """
+    speaker_selection_method for a GroupChat with allowed speaker transitions;
+    with deterministic=False every choice is left to autogen's "auto" method,
+    tool_handoff lets single-tool agents hand off right after their tool result.
+    """
+
+    def __init__(self, workflow: str, deterministic: bool = True, tool_handoff: bool = False):
+        self.workflow = workflow
+        self.deterministic = deterministic
+        self.tool_handoff = tool_handoff
+
+    def __call__(self, last_speaker: Agent, groupchat: GroupChat):
+        if cancellation_requested():
+            print(f"Speaker FSM: {self.workflow} cancelled after {last_speaker.name}")
+            return None
+        if not self.deterministic:
+            return "auto"
+
+        message = groupchat.messages[-1] if groupchat.messages else {}
+        if message.get("tool_calls") or message.get("function_call"):
+            return "auto"
+
+        successors = groupchat.allowed_speaker_transitions_dict.get(last_speaker, [])
+        others = [agent for agent in successors if agent is not last_speaker]
+        if last_speaker in successors and message.get("role") == "tool" and (
+                not self.tool_handoff or _failed(message) or _tool_count(last_speaker) > 1):
+            candidates = [last_speaker]
+        else:
+            candidates = others or successors
+
+        with _lock:
+            _counts[self.workflow]["graph" if len(candidates) == 1 else "llm"] += int(bool(candidates))
+        if len(candidates) == 1:
+            print(f"Speaker FSM: {last_speaker.name} -> {candidates[0].name}")
+            return candidates[0]
+        # No successor (autogen ends the chat) or a real choice for the LLM
+        return "auto"
+
+
+def selection_counts(workflow: str) -> dict:
+    """Speaker selections settled by the graph vs. left to the LLM for a workflow."""
+    with _lock:
+        return dict(_counts[workflow]) if workflow in _counts else {"graph": 0, "llm": 0}
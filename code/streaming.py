@@ -0,0 +1,97 @@
+"""
+Server-sent events of a workflow's group chat while it runs.
+
+/supplier-analysis returns the chat history only once the whole workflow has
+finished. For the streaming variant the workflow runs as a job (see jobs)
+inside MessageStream.run, and every group chat built by the agent registry
+publishes each message it records (after the initiating query) to the
+stream of the request running it. The endpoint relays them as they come,
+waiting on the event loop rather than holding a server thread:
+
+    event: job        job id and status, for DELETE /supplier-analysis/jobs/{id}
+    event: message    one group chat message (agent reply, tool call or tool result)
+    event: result     the /supplier-analysis response (chat_history, chat_summary, ...)
+    event: done       final job status, wait / run time and error
+
+Messages that do not pass through a group chat (the "Preparing plan" entry,
+pre-fetched and direct tool results) only appear in the result.
+"""
+import asyncio
+import contextvars
+import json
+from typing import AsyncIterator, Callable
+
+from autogen import Agent, GroupChat
+
+
+# A comment line is sent when nothing happened for this long, so proxies do
+# not drop the connection during long tool calls
+KEEPALIVE_SECONDS = 15
+
+_current_stream = contextvars.ContextVar("current_stream", default=None)
+
+
+def format_event(event: str, data) -> str:
+    """One server-sent event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+class MessageStream:
+    """
+    Events of one request, produced by the thread running its workflow and
+    consumed on the event loop the stream was created on.
+    """
+
+    def __init__(self):
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+
+    def _put(self, chunk):
+        try:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, chunk)
+        except RuntimeError:
+            # The event loop is closed: nobody is listening any more
+            pass
+
+    def publish(self, event: str, data):
+        # Serialised right away: autogen keeps mutating its message dicts
+        self._put(format_event(event, data))
+
+    def close(self):
+        """End events(); safe to call more than once."""
+        self._put(None)
+
+    def run(self, fn: Callable, *args):
+        """Call fn(*args) with its group chat messages published here, then publish its return value as 'result'."""
+        token = _current_stream.set(self)
+        try:
+            result = fn(*args)
+        finally:
+            _current_stream.reset(token)
+        self.publish("result", result)
+        return result
+
+    async def events(self) -> AsyncIterator[str]:
+        """Published events until close()."""
+        while True:
+            try:
+                chunk = await asyncio.wait_for(self._queue.get(), KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if chunk is None:
+                return
+            yield chunk
+
+
+def stream_messages(group_chat: GroupChat):
+    """Make group_chat publish the messages it records to the current request's MessageStream, if any."""
+    append = group_chat.append
+
+    def publishing_append(message: dict, speaker: Agent):
+        append(message, speaker)
+        stream = _current_stream.get()
+        if stream is not None and len(group_chat.messages) > 1:
+            stream.publish("message", group_chat.messages[-1])
+
+    group_chat.append = publishing_append
@@ -0,0 +1,42 @@
+"""
+analyze_po_requirements over a window that contains production orders
+without an end date (indexed as single-day intervals).
+
+Run from code/:  python -m pytest -q tests
+"""
+import os
+import sys
+
+import pytest
+
+CODE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, CODE_DIR)
+
+
+@pytest.fixture(autouse=True)
+def in_code_dir(monkeypatch):
+    # The tools read ./updated_docs relative to code/
+    monkeypatch.chdir(CODE_DIR)
+
+
+def test_april_2025_window_with_open_ended_orders():
+    from production_index import production_orders_in_window
+    from tools_manager import analyze_po_requirements
+
+    in_window = production_orders_in_window("20/04/2025", "30/04/2025")
+    assert in_window["__end_dt"].isna().any()
+
+    output = analyze_po_requirements("PO-103908", "20/04/2025")
+
+    assert "- End date: **N/A**" in output
+    assert "- Total days: **N/A**" in output
+    assert "Requirement per day: **nan" not in output
+
+
+@pytest.mark.parametrize("window_days", [None, 7, 30])
+def test_april_2025_windows_do_not_raise(window_days):
+    from tools_manager import analyze_po_requirements
+
+    output = analyze_po_requirements("PO-103908", "20/04/2025", window_days)
+
+    assert "production requirement" in output
@@ -0,0 +1,82 @@
+"""
+IntentRouter on paraphrases that are not among the routing prompt's
+examples: every query is either routed to the right workflow or left to the
+LLM, and workflows that send email are never picked locally.
+
+Run from code/:  python -m pytest -q tests
+"""
+import os
+import sys
+
+import pytest
+
+CODE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, CODE_DIR)
+
+from intent_router import LLM_ONLY_PATTERN, IntentRouter, parse_examples  # noqa: E402
+
+LLM = "<llm>"
+
+HELD_OUT = [
+    ("Read the PR emails", "read_pr_emails_workflow"),
+    ("Show me the pending PRs for approval", "pr_pending_workflow"),
+    ("What is the status of PRs PR-100201 and PR-100202?", "pr_pending_workflow"),
+    ("Which PRs are still pending approval?", "pr_pending_workflow"),
+    ("Any new PR request emails in the inbox?", "read_pr_emails_workflow"),
+    ("Check my email for new purchase requisitions", "read_pr_emails_workflow"),
+    ("How can we expedite PO-104512? Show lead time impact", "expedite_supply_workflow"),
+    ("Give me options to speed up purchase order PO-100045", "expedite_supply_workflow"),
+    ("Draft an emergency PO with Supplier B for ITM-007", "draft_po_workflow"),
+    ("Create a purchase order draft for Supplier K for ITM-001", "draft_po_workflow"),
+    ("Send the email to the supplier", "send_email_workflow"),
+    ("Yes, send it", "send_email_workflow"),
+    ("Release the PR to the approver", "send_pr_to_approver_email_workflow"),
+    ("Remind the approver about PR-100300", "send_pr_reminder_email_workflow"),
+    ("Send a reminder for the pending PRs", "send_pr_reminder_email_workflow"),
+    ("Ask the supplier to correct the invoice inaccuracies", "seek_supplier_correction_email_workflow"),
+    ("Compare the attached invoice against PO-79011 and its GRN", "extract_invoice_details_workflow"),
+    ("Extract the invoice details from the attached PDF", "extract_invoice_details_workflow"),
+    ("Did the schedule change for PR-103101?", "calculate_pr_schedule_changes_workflow"),
+    ("Check schedule changes for PR-100201", "calculate_pr_schedule_changes_workflow"),
+    ("US raised tariffs on Mexico to 25%; which supplier should we use for ITM-005?", "tariff_impact_workflow"),
+    ("How do the new import duties on China affect our ITM-002 sourcing?", "tariff_impact_workflow"),
+    ("The Panama Canal is congested, which shipments to DC3 are delayed and should we reroute?",
+     "panama_canal_workflow"),
+    ("Proceed with rerouting the containers through Los Angeles", "panama_canal_workflow"),
+    ("A typhoon closed the port of Shanghai for 10 days, which orders are affected?", "route_disruption_workflow"),
+]
+
+
+@pytest.fixture(scope="module")
+def examples():
+    # The examples live in the routing prompt of app_entegris; read them from
+    # the source instead of importing the app (LLM clients, agent teams)
+    with open(os.path.join(CODE_DIR, "app_entegris.py"), encoding="utf-8") as f:
+        return parse_examples(f.read())
+
+
+@pytest.fixture(scope="module")
+def router(examples):
+    return IntentRouter(examples)
+
+
+@pytest.mark.parametrize("query, workflow", HELD_OUT)
+def test_held_out_query_is_routed_correctly_or_left_to_llm(router, query, workflow):
+    assert router.route(query, lambda q: LLM) in (workflow, LLM)
+
+
+@pytest.mark.parametrize("query", ["Read the PR emails", "Show me the pending PRs for approval"])
+def test_filler_words_do_not_route_locally(router, query):
+    assert router.route(query, lambda q: LLM) == LLM
+
+
+def test_email_workflows_are_never_routed_locally(router, examples):
+    for query, workflow in examples + HELD_OUT:
+        chosen = router.route(query, lambda q: LLM)
+        assert chosen == LLM or not LLM_ONLY_PATTERN.search(chosen), query
+
+
+def test_prompt_examples_route_to_their_workflow_or_llm(router, examples):
+    routed = [router.route(query, lambda q: LLM) for query, _ in examples]
+    assert all(chosen in (workflow, LLM) for chosen, (_, workflow) in zip(routed, examples))
+    assert any(chosen != LLM for chosen in routed)
@@ -1,6 +1,7 @@
 from fitz import open as open_pdf  # PyMuPDF
 import PIL.Image
 from PIL import Image
+import contextvars
 import glob
 import pandas as pd
 from typing import Optional, List, Union
@@ -16,28 +17,57 @@ from google import genai
 from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import Mail
 
+from artifacts import record_artifact
+from data_registry import load_csv, load_dataset, load_index, load_dataset_index, registry
+from grn_store import get_grn_rows
+from inventory_projection import projected_stockouts
+from landed_cost import best_suppliers
+from panama_results import (
+    NOT_JSON_MESSAGE,
+    CostBenefitResult,
+    DelayedShipmentsResult,
+    FinancialImpactResult,
+    ReroutingResult,
+    StockoutRiskResult,
+    records,
+)
+from production_index import get_production_index, to_timestamp
+from rerouting import dc_shortfall, optimal_rerouting_plan, rerouting_options
+
 global_import_duties_df = None
 
-def _parse_percent(s: str) -> float:
-    try:
-        return float(s.strip().rstrip("%"))
-    except:
-        return 0.0
+PDF_STORE = "./updated_docs/pdf_store"
+# Folder extract_invoice_details reads the invoices from; each request sets
+# its own so that concurrent requests do not see (or clear) each other's PDFs
+pdf_folder = contextvars.ContextVar("pdf_folder", default=PDF_STORE)
 
 import pandas as pd
 from datetime import datetime, date, timedelta
 
-def analyze_po_requirements(po_number: str) -> str:
+def analyze_po_requirements(
+    po_number: str,
+    as_of_date: Optional[str] = None,
+    window_days: Optional[int] = None
+) -> str:
+    """
+    Report region POs whose items have production orders in a time window and
+    how long current US own-stock inventory covers the first requirement.
+
+    Parameters:
+    - po_number: PO to analyze, e.g. "PO-104007".
+    - as_of_date: Reference date 'dd/mm/yyyy' for inventory coverage (default 12/06/2025).
+    - window_days: Production window length starting at as_of_date. When omitted,
+      the window is the calendar month containing as_of_date.
+    """
     output = ""
     print("po_number", po_number)
-    # 1. Load CSVs
-    po_df   = pd.read_csv('./updated_docs/Open_PO_data.csv', dayfirst=True)
-    prod_df = pd.read_csv('./updated_docs/Production_data.csv', dayfirst=True)
-    inv_df  = pd.read_csv('./updated_docs/Inventory_data.csv', dayfirst=True)
+    # 1. Load CSVs (production orders come pre-indexed per file version)
+    po_df     = load_csv('./updated_docs/Open_PO_data.csv', dayfirst=True)
+    prod_index = get_production_index()
+    inv_df    = load_csv('./updated_docs/Inventory_data.csv', dayfirst=True)
 
     # 2. Coerce numeric columns
-    prod_df['Qnty planned'] = pd.to_numeric(prod_df['Qnty planned'], errors='coerce')
-    inv_df['Qty']            = pd.to_numeric(inv_df['Qty'], errors='coerce')
+    inv_df['Qty'] = pd.to_numeric(inv_df['Qty'], errors='coerce')
 
     # 3. Select target PO
     target_po = po_df[po_df['PO number'] == po_number]
@@ -60,62 +90,64 @@ def analyze_po_requirements(po_number: str) -> str:
         & po_df['Ship to Location'].str.lower().str.startswith(to_pref)
     ]
 
-    # 6. Parse production dates
-    for col in ['Production start date', 'Production end date']:
-        prod_df[col] = pd.to_datetime(prod_df[col], dayfirst=True, errors='coerce')
-        prod_df[col] = prod_df[col].dt.strftime('%d-%m-%Y')
-
-    print("prod_df", prod_df)
-
-    # 7. Identify POs with June production requirements
-    prod_matches = []  # list of PO numbers with June production
-    first_rate = None
-    first_qty  = None
+    # 6. Production window
+    reference_date = to_timestamp(as_of_date).date() if as_of_date else date(2025, 6, 12)
+    if window_days:
+        window_start = pd.Timestamp(reference_date)
+        window_end   = window_start + pd.Timedelta(days=window_days - 1)
+        window_label = f"{window_start.strftime('%d-%m-%Y')} to {window_end.strftime('%d-%m-%Y')}"
+    else:
+        window_start = pd.Timestamp(reference_date).to_period('M').start_time
+        window_end   = pd.Timestamp(reference_date).to_period('M').end_time.normalize()
+        window_label = window_start.strftime('%B')
 
-    for _, po_row in region_po.iterrows():
-        desc = po_row['Item Description'].strip().lower()
-        m = prod_df[prod_df['SKU desc'].str.strip().str.lower() == desc].copy()
-        print("m SKU desc", m)
-        m['__start_dt'] = pd.to_datetime(m['Production start date'], dayfirst=True, errors='coerce')
-        m['__end_dt']   = pd.to_datetime(m['Production end date'], dayfirst=True, errors='coerce')
-        m = m[(m['__start_dt'].dt.month == 6) | (m['__end_dt'].dt.month == 6)]
-        if not m.empty:
-            prod_matches.append(po_row['PO number'])
+    # 7. Identify POs with production requirements in the window (one isin over normalized descriptions)
+    window_descs = prod_index.descriptions_in_window(window_start, window_end)
+    po_desc = region_po['Item Description'].str.strip().str.lower()
+    prod_matches = region_po.loc[po_desc.isin(window_descs), 'PO number'].tolist()
 
     # 8. List non-immediate POs by number
     non_immediate = [po for po in region_po['PO number'] if po not in prod_matches and po != po_number]
     if non_immediate:
-        output += "PO(s) without immediate June production requirement: " + ", ".join(non_immediate) + "\n\n"
+        output += f"PO(s) without immediate {window_label} production requirement: " + ", ".join(non_immediate) + "\n\n"
 
     # 9. Filter to only immediate POs
     immediate_po = region_po[region_po['PO number'].isin(prod_matches)]
     if immediate_po.empty:
-        return output + "No POs with immediate production requirements in June."
+        return output + f"No POs with immediate production requirements in {window_label}."
 
-    output += "**PO(s) with immediate June production requirement (filtered by region):**\n"
+    output += f"**PO(s) with immediate {window_label} production requirement (filtered by region):**\n"
     output += immediate_po.to_markdown(index=False) + "\n\n"
 
-    # 10. Detail production requirements and calculate rates
-    for _, po_row in immediate_po.iterrows():
-        desc = po_row['Item Description'].strip().lower()
-        m = prod_df[prod_df['SKU desc'].str.strip().str.lower() == desc].copy()
-        print("m SKU desc", m)
-        m['__start_dt'] = pd.to_datetime(m['Production start date'], dayfirst=True, errors='coerce')
-        m['__end_dt']   = pd.to_datetime(m['Production end date'], dayfirst=True, errors='coerce')
-        m = m[(m['__start_dt'].dt.month == 6) | (m['__end_dt'].dt.month == 6)]
+    # 10. Match all immediate POs to their window production orders in one merge,
+    #     keeping PO order and production-file order within each PO
+    in_window = prod_index.rows(window_start, window_end)
+    left = pd.DataFrame({
+        '__po_pos': range(len(immediate_po)),
+        '__desc': immediate_po['Item Description'].str.strip().str.lower().to_numpy(),
+    })
+    right = in_window.assign(__prod_pos=range(len(in_window)))
+    matched = left.merge(right, on='__desc').sort_values(['__po_pos', '__prod_pos'], kind='mergesort')
+    display_cols = [c for c in in_window.columns if not c.startswith('__')]
+
+    first_rate = None
+    first_qty  = None
+    for po_pos, m in matched.groupby('__po_pos', sort=True):
+        po_row = immediate_po.iloc[po_pos]
         output += f"**Production for {po_row['Item Number']} – {po_row['Item Description']}:**\n"
-        output += m.drop(columns=['__start_dt','__end_dt']).to_markdown(index=False) + "\n\n"
-        for _, r in m.iterrows():
-            qty_req = r['Qnty planned']
-            start   = pd.to_datetime(r['Production start date'], dayfirst=True)
-            end     = pd.to_datetime(r['Production end date'], dayfirst=True)
-            total_days = (end - start).days + 1 if pd.notna(start) and pd.notna(end) else None
-            rate = qty_req / total_days if total_days and total_days > 0 else float('nan')
+        output += m[display_cols].to_markdown(index=False) + "\n\n"
+        for qty_req, start, end, total_days, rate in zip(
+            m['Qnty planned'], m['__start_dt'], m['__end_dt'], m['__total_days'], m['__rate']
+        ):
+            # Orders missing a date are indexed as single-day intervals; their
+            # span and daily rate are unknown
             output += f"- Quantity required: **{qty_req}**\n"
-            output += f"- Start date: **{start.strftime('%d-%m-%Y')}**\n"
-            output += f"- End date: **{end.strftime('%d-%m-%Y')}**\n"
-            output += f"- Total days: **{total_days}**\n"
-            output += f"- Requirement per day: **{rate:.2f}**\n\n"
+            output += f"- Start date: **{start.strftime('%d-%m-%Y') if pd.notna(start) else 'N/A'}**\n"
+            output += f"- End date: **{end.strftime('%d-%m-%Y') if pd.notna(end) else 'N/A'}**\n"
+            output += f"- Total days: **{int(total_days) if pd.notna(total_days) else 'N/A'}**\n"
+            if pd.notna(rate):
+                output += f"- Requirement per day: **{rate:.2f}**\n"
+            output += "\n"
             if first_rate is None and pd.notna(rate):
                 first_rate = rate
                 first_qty  = qty_req
@@ -138,7 +170,6 @@ def analyze_po_requirements(po_number: str) -> str:
     if first_rate is None or first_rate <= 0 or pd.isna(first_rate):
         return output + "Undefined daily requirement rate; cannot compute sufficiency."
 
-    reference_date = date(2025, 6, 12)
     days_covered   = (qty_on_hand / first_rate) - 1
     suffice_until  = reference_date + timedelta(days=days_covered)
 
@@ -175,11 +206,11 @@ def get_top_alternative_suppliers(
     - Markdown table of top suppliers with key columns and chosen metric.
     """
     
-    cap = pd.read_csv(capacity_csv)
-    sup = pd.read_csv(supplier_csv)
+    cap = load_dataset('supplier_capacity', capacity_csv)
+    sup = load_csv(supplier_csv)
 
     
-    cap['capacity_allocation'] = cap['Percentage allocation to company'].apply(_parse_percent)
+    cap['capacity_allocation'] = cap['Percentage allocation to company'].fillna(0.0)
 
     
     df = cap.merge(
@@ -196,7 +227,7 @@ def get_top_alternative_suppliers(
     
     df = df[df['Item number'] == item_number]
     
-    print(df.to_csv("suppl_loc.csv"))
+    record_artifact("suppl_loc", df)
 
     if location:
         df = df[df['Supplier Location_x'].str.contains(location, case=False, na=False)]
@@ -239,9 +270,10 @@ def get_avg_lead_time(
 
     If no matching rows are found, returns None.
     """
-    # 1. Read the CSV into a DataFrame, forcing 'Lead time (days)' to float
-    df = pd.read_csv(
+    # 1. Index the CSV on the four criteria, forcing 'Lead time (days)' to float
+    index = load_index(
         csv_path,
+        ["Mode of Transport", "Supplier Code", "Item Number", "Delivery Location"],
         dtype={
             "PO number": str,
             "Item Number": str,
@@ -252,25 +284,18 @@ def get_avg_lead_time(
         converters={"Lead time (days)": lambda x: float(x) if x not in ["", None] else None},
     )
 
-    # 2. Drop any rows where 'Lead time (days)' is missing
-    df = df[df["Lead time (days)"].notna()].copy()
-    df["Lead time (days)"] = df["Lead time (days)"].astype(float)
+    # 2. Look up the rows matching all four criteria
+    subset = index.rows((mode_of_transport, supplier_code, item_number, delivery_location.split('/')[0]))
 
-    # 3. Filter by the four criteria
-    mask = (
-        (df["Mode of Transport"] == mode_of_transport) &
-        (df["Supplier Code"]    == supplier_code) &
-        (df["Item Number"]      == item_number) &
-        (df["Delivery Location"]== delivery_location.split('/')[0])
-    )
-    subset = df.loc[mask]
+    # 3. Drop any rows where 'Lead time (days)' is missing
+    subset = subset[subset["Lead time (days)"].notna()]
 
     # 4. If no matches, return None
     if subset.empty:
         return None
 
     # 5. Compute and return the mean lead time
-    return subset["Lead time (days)"].mean()
+    return subset["Lead time (days)"].astype(float).mean()
 
 
 def get_open_po_data(
@@ -282,14 +307,15 @@ def get_open_po_data(
     containing all rows where "PO number" == po_number.
     If no matches are found, returns an empty string.
     """
-    # 1. Read the CSV, ensuring "PO number" is string
-    df = pd.read_csv(
+    # 1. Index the CSV by PO number, ensuring "PO number" is string
+    index = load_index(
         csv_path,
+        "PO number",
         dtype={"PO number": str}
     )
 
-    # 2. Filter rows by PO number
-    result = df.loc[df["PO number"] == po_number].copy()
+    # 2. Look up rows by PO number
+    result = index.rows(po_number)
 
     # 3. If no matches, return empty string
     if result.empty:
@@ -318,12 +344,13 @@ def expedite_po_by_cost(
       4. Its original Explanation (verbatim except trimmed to these two rows).
     """
     # --- Read all required CSVs into DataFrames ---
-    df_capacity = pd.read_csv(capacity_csv)    # has columns "Supplier Code", "Item number", "Expedite Qnty possible", "Expedite Lead time", "Premium to expedite", ...
-    df_supplier = pd.read_csv(supplier_csv)    # has columns "Supplier Code", "Item Number", "Total Unit Cost with Sea shipping", "Total Unit Cost with Air shipping", "Lead time (Weeks)", ...
-    df_openpo   = pd.read_csv(open_po_csv)     # has columns "PO number", "Supplier Code", "Item Number", "Qnty Ordered", "Requested Mode of Transport", "Ship to Location", ...
+    # --- Key indexes over the required CSVs (cached per file version) ---
+    capacity_index = load_dataset_index('supplier_capacity', ["Supplier Code", "Item number"], capacity_csv)    # "Expedite Qnty possible", "Expedite Lead time", "Premium to expedite", ...
+    supplier_index = load_index(supplier_csv, ["Supplier Code", "Item Number"])    # "Total Unit Cost with Sea shipping", "Total Unit Cost with Air shipping", "Lead time (Weeks)", ...
+    po_index       = load_index(open_po_csv, "PO number")     # "Supplier Code", "Item Number", "Qnty Ordered", "Requested Mode of Transport", "Ship to Location", ...
 
     # 1. Find the PO row
-    df_po = df_openpo[df_openpo["PO number"] == open_po_number]
+    df_po = po_index.rows(open_po_number)
     if df_po.empty:
         return f"No purchase order found with PO number '{open_po_number}'."
     po = df_po.iloc[0]
@@ -336,11 +363,8 @@ def expedite_po_by_cost(
     current_mode      = po["Requested Mode of Transport"]
     delivery_location = po.get("Ship to Location", "").strip().split("/")[0]
 
-    # 3. Filter supplier data (to get cost info & lead time in weeks)
-    df_sup = df_supplier[
-        (df_supplier["Supplier Code"] == supplier_code) &
-        (df_supplier["Item Number"]   == item_number)
-    ]
+    # 3. Look up supplier data (to get cost info & lead time in weeks)
+    df_sup = supplier_index.rows((supplier_code, item_number))
     if df_sup.empty:
         return (
             f"No supplier data found for Supplier Code '{supplier_code}', "
@@ -348,11 +372,8 @@ def expedite_po_by_cost(
         )
     sup = df_sup.iloc[0]
 
-    # 4. Filter capacity data (to get expedite info)
-    df_cap = df_capacity[
-        (df_capacity["Supplier Code"] == supplier_code) &
-        (df_capacity["Item number"]   == item_number)
-    ]
+    # 4. Look up capacity data (to get expedite info)
+    df_cap = capacity_index.rows((supplier_code, item_number))
     if df_cap.empty:
         return (
             f"No capacity data found for Supplier Code '{supplier_code}', "
@@ -367,11 +388,10 @@ def expedite_po_by_cost(
     sea_total_cost = qty_ordered * sea_cost_per_unit
 
     expedite_max_qty    = float(cap["Expedite Qnty possible"])
-    expedite_lead_time  = str(cap["Expedite Lead time"])  # e.g., "2 days"
+    expedite_lead_time  = f"{int(cap['Expedite Lead time'])} days"  # parsed from e.g. "2 days" at load time
 
-    # Parse premium per unit from a string like "$1.2/pc"
-    prem_str = str(cap["Premium to expedite"])
-    premium_per_unit = float(prem_str.replace("$", "").replace("/pc", "").strip())
+    # Premium per unit, parsed from a string like "$1.2/pc" at load time
+    premium_per_unit = float(cap["Premium to expedite"])
     premium_per_unit +=50
     # Sea lead time (in weeks) -> represent as string
     lead_time_weeks = sup["Lead time (Weeks)"]
@@ -474,11 +494,11 @@ def expedite_po_by_lead(
       4. Its original Explanation (verbatim except trimmed to these two rows).
     """
     # --- Read all required CSVs into DataFrames ---
-    df_supplier = pd.read_csv(supplier_csv)
-    df_openpo   = pd.read_csv(open_po_csv)
+    supplier_index = load_index(supplier_csv, ["Supplier Code", "Item Number"])
+    po_index       = load_index(open_po_csv, "PO number")
 
     # 1. Find the PO row
-    df_po = df_openpo[df_openpo["PO number"] == open_po_number]
+    df_po = po_index.rows(open_po_number)
     if df_po.empty:
         return f"No purchase order found with PO number '{open_po_number}'."
     po = df_po.iloc[0]
@@ -489,11 +509,8 @@ def expedite_po_by_lead(
     qty_ordered       = float(po["Qnty Ordered"])
     delivery_location = po.get("Ship to Location", "").strip().split("/")[0]
 
-    # 3. Filter supplier data (to get cost info & lead time in weeks)
-    df_sup = df_supplier[
-        (df_supplier["Supplier Code"] == supplier_code) &
-        (df_supplier["Item Number"]   == item_number)
-    ]
+    # 3. Look up supplier data (to get cost info & lead time in weeks)
+    df_sup = supplier_index.rows((supplier_code, item_number))
     if df_sup.empty:
         return (
             f"No supplier data found for Supplier Code '{supplier_code}', "
@@ -610,8 +627,8 @@ def find_alternate_suppliers_by_cost(
     Output columns: Supplier Name, Supplier Code, Supplier Location,
                     Unit Price (USD), MOQ, lead_time_days
     """
-    cap = pd.read_csv(capacity_csv)
-    sup = pd.read_csv(supplier_csv)
+    cap = load_csv(capacity_csv)
+    sup = load_csv(supplier_csv)
 
     base = cap[cap['Item number'] == item_number].copy()
     if base.empty:
@@ -666,13 +683,13 @@ def rank_suppliers_by_leadtime_and_moq(
 
     Returns markdown table.
     """
-    df = pd.read_csv(supplier_csv)
+    df = load_csv(supplier_csv)
     df = df[df['Item Number'] == item_number]
 
     if location:
         df = df[df['Supplier Location'].str.contains(location, case=False, na=False)]
     df['lead_time_days'] = df['Lead time (Weeks)'] * 7
-    df.to_csv('s1.csv')
+    record_artifact("s1", df)
     df_sorted = df.sort_values(by=['lead_time_days','MOQ'])
     
     out = df_sorted[[
@@ -685,7 +702,8 @@ def get_best_suppliers(
     item_numbers: list,
     delivery_location: str,
     shipping_mode: str = 'sea',
-    supplier_csv_path: str= './updated_docs/Supplier_data.csv'
+    supplier_csv_path: str= './updated_docs/Supplier_data.csv',
+    include_import_duty: bool = False
 ) -> str:
     """
     Reads supplier data from a CSV, then for each item number finds the top supplier
@@ -700,72 +718,54 @@ def get_best_suppliers(
     - delivery_location (str): Delivery location string to filter supplier rows.
       Example: 'US/New York' or 'Philippines/Manila'.
     - shipping_mode (str): Either 'sea' or 'air'. Defaults to 'sea'.
+    - include_import_duty (bool): Also show the import duty for each lane (latest
+      values from update_import_duties if any) and rank by Landed Cost instead.
 
     Returns:
     - str: A concatenated markdown string with a separate table for each item.
     """
-    # 1) Load supplier data from CSV
-    items_data = pd.read_csv(supplier_csv_path)
+    # 1) Best supplier per item and country for all requested items in one pass
+    duties = _current_import_duties() if include_import_duty else None
+    best = best_suppliers(
+        item_numbers,
+        delivery_location,
+        shipping_mode,
+        rank_by=['Landed Cost'] if include_import_duty else ['Total Cost'],
+        supplier_csv=supplier_csv_path,
+        duties=duties,
+    )
 
-    # 2) Determine which shipping‐cost column to use
-    mode = shipping_mode.strip().lower()
-    if mode == 'air':
-        shipping_column = 'Air shipping cost/pc'
-    else:
-        shipping_column = 'Sea shipping cost/pc'
+    # 2) Keep only the columns you need
+    cols = [
+        'Item Number',
+        'Item Description',
+        'Supplier Name',
+        'Supplier Code',
+        'Supplier Location',
+        'Delivery location',
+        'Lead time (Weeks)',
+        'MOQ',
+        'Unit Price (USD)',
+        'Shipping Cost/pc',
+        'Total Cost'
+    ]
+    if include_import_duty:
+        cols += ['Import Duty (%)', 'Landed Cost']
+    best = best[cols].round({'Total Cost': 2, 'Landed Cost': 2})
+    by_item = dict(tuple(best.groupby('Item Number', sort=False)))
 
+    # 3) Render one table per item, in the order requested
     output_strings = []
-
-    # 3) Iterate over each requested item number
     for itm in item_numbers:
-        # Filter rows by Item Number and Delivery location
-        filtered = items_data[
-            (items_data['Item Number'] == itm) &
-            (items_data['Delivery location'] == delivery_location)
-        ].copy()
-
-        if filtered.empty:
+        result_df = by_item.get(itm)
+        if result_df is None:
             output_strings.append(
                 f"{itm}: No matching entries found for delivery location '{delivery_location}'."
             )
             continue
 
-        # 4) Compute Total Cost = Unit Price + Shipping Cost (no import duty)
-        def compute_total_cost(row):
-            unit_price = float(row['Unit Price (USD)'])
-            shipping_cost = float(row[shipping_column])
-            return pd.Series({'Total Cost': unit_price + shipping_cost})
-
-        computed = filtered.apply(compute_total_cost, axis=1)
-        filtered = pd.concat([filtered, computed], axis=1)
-
-        # 5) Sort by Supplier Location + Total Cost, then pick cheapest per country
-        filtered.sort_values(by=['Supplier Location', 'Total Cost'], inplace=True)
-        best_per_country = filtered.groupby('Supplier Location', as_index=False).first()
-
-        # 6) Keep only the columns you need (omit import-duty columns)
-        cols = [
-            'Item Number',
-            'Item Description',
-            'Supplier Name',
-            'Supplier Code',
-            'Supplier Location',
-            'Delivery location',
-            'Lead time (Weeks)',
-            'MOQ',
-            'Unit Price (USD)',
-            shipping_column,
-            'Total Cost'
-        ]
-        result_df = best_per_country[cols].copy()
-
-        # 7) Rename the shipping column to 'Shipping Cost/pc'
-        result_df.rename(columns={shipping_column: 'Shipping Cost/pc'}, inplace=True)
-        result_df['Total Cost'] = result_df['Total Cost'].round(2)
-
-        # 8) Convert to markdown, save CSV if desired, and append to output
         md_table = result_df.to_markdown(index=False)
-        result_df.to_csv(f"itm_{itm}.csv", index=False)
+        record_artifact(f"itm_{itm}", result_df)
         output_strings.append(f"{itm}:\n\n{md_table}\n")
 
     return "\n".join(output_strings)
@@ -785,64 +785,49 @@ def get_best_suppliers_by_lead_cost(
 
     Returns a concatenated markdown with a table per item.
     """
-    # 1) Load supplier data
-    df = pd.read_csv(supplier_csv_path)
+    # 1) Best supplier per item and country (excluding China) in one pass
+    best = best_suppliers(
+        item_numbers,
+        delivery_location,
+        shipping_mode,
+        rank_by=['Lead time (Weeks)', 'Total Cost'],
+        exclude_locations=['China'],
+        supplier_csv=supplier_csv_path,
+    )
 
-    # 2) Pick shipping‑cost column
-    mode = shipping_mode.strip().lower()
-    ship_col = 'Air shipping cost/pc' if mode == 'air' else 'Sea shipping cost/pc'
+    # 2) Select columns
+    cols = [
+        'Item Number', 'Item Description',
+        'Supplier Name','Supplier Code','Supplier Location',
+        'Delivery location','Lead time (Weeks)','MOQ',
+        'Unit Price (USD)', 'Shipping Cost/pc', 'Total Cost'
+    ]
+    best = best[cols].round({'Total Cost': 2})
+    by_item = dict(tuple(best.groupby('Item Number', sort=False)))
 
     output_strings = []
-
     for itm in item_numbers:
-        # 3) Filter to this item, delivery location, and exclude China
-        sub = df[
-            (df['Item Number'] == itm) &
-            (df['Delivery location'] == delivery_location) &
-            (df['Supplier Location'].str.strip().str.lower() != 'china')
-        ].copy()
-
-        if sub.empty:
+        result = by_item.get(itm)
+        if result is None:
             output_strings.append(
                 f"**{itm}**: No entries for delivery location '{delivery_location}' (excluding China)."
             )
             continue
 
-        # 4) Ensure numeric
-        sub['Lead time (Weeks)'] = pd.to_numeric(sub['Lead time (Weeks)'], errors='coerce')
-        sub['Unit Price (USD)']  = pd.to_numeric(sub['Unit Price (USD)'],  errors='coerce')
-        sub[ship_col]            = pd.to_numeric(sub[ship_col],            errors='coerce')
-
-        # 5) Compute Total Cost
-        sub['Total Cost'] = sub['Unit Price (USD)'] + sub[ship_col]
-
-        # 6) Sort by country, then Lead time, then Total Cost
-        sub.sort_values(
-            by=['Supplier Location', 'Lead time (Weeks)', 'Total Cost'],
-            inplace=True
-        )
-
-        # 7) Pick the best per country
-        best = sub.groupby('Supplier Location', as_index=False).first()
-
-        # 8) Select & rename columns
-        cols = [
-            'Item Number', 'Item Description',
-            'Supplier Name','Supplier Code','Supplier Location',
-            'Delivery location','Lead time (Weeks)','MOQ',
-            'Unit Price (USD)', ship_col, 'Total Cost'
-        ]
-        result = best[cols].copy()
-        result.rename(columns={ship_col: 'Shipping Cost/pc'}, inplace=True)
-        result['Total Cost'] = result['Total Cost'].round(2)
-
-        # 9) Render & save
+        # 3) Render & record
         md = result.to_markdown(index=False)
-        result.to_csv(f"best_suppliers_{itm}.csv", index=False)
+        record_artifact(f"best_suppliers_{itm}", result)
         output_strings.append(f"**{itm}**\n\n{md}\n")
 
     return "\n".join(output_strings)
 
+
+def _current_import_duties() -> pd.DataFrame:
+    """Import duties as last set by update_import_duties, else from Import Duty.csv."""
+    if global_import_duties_df is not None:
+        return global_import_duties_df
+    return load_csv('./updated_docs/Import Duty.csv')
+
 def update_import_duties( updates: dict = {}, use_global: bool = False, csv_path: str='./updated_docs/Import Duty.csv') -> str:
     global global_import_duties_df
 
@@ -851,7 +836,7 @@ def update_import_duties( updates: dict = {}, use_global: bool = False, csv_path
         df = global_import_duties_df.copy()
     else:
         # Load fresh from CSV if no global exists or use_global is False
-        df = pd.read_csv(csv_path)
+        df = load_csv(csv_path)
         df['Import Duty'] = df['Import Duty'].astype(str)
 
     # Apply each update: overwrite existing or append new row
@@ -914,57 +899,45 @@ def find_suppliers_for_due_date(
            min/avg/max transit times.
     """
 
-    # --- Load data ---
-    sup  = pd.read_csv(supplier_csv)
-    cap  = pd.read_csv(capacity_csv)
-    ship = pd.read_csv(shipment_csv, dtype=str)
-
-    # --- Parse dates into datetime ---
-    for col in ['Ship Date', 'Receipt Date', 'Delivery Date']:
-        ship[col] = pd.to_datetime(
-            ship[col].str.strip() + '-2025',
-            format='%d-%b-%Y',
-            errors='coerce'
-        )
-
-    # --- Merge capacity with supplier lead time & price ---
-    merged = cap.merge(
-        sup[['Supplier Code', 'Lead time (Weeks)', 'Unit Price (USD)']],
-        on='Supplier Code',
-        how='left'
-    )
-    merged['total_lead_days'] = merged['Lead time (Weeks)'] * 7
+    # --- Push supplier filters down to each table before joining ---
+    cap = load_dataset('supplier_capacity', capacity_csv)
+    sup = load_dataset('supplier', supplier_csv)[['Supplier Code', 'Item Number', 'Lead time (Weeks)', 'Unit Price (USD)']]
 
-    # --- Apply filters for suppliers ---
-    df = merged
     if Supplier_Name:
-        df = df[df['Supplier name'].str.contains(Supplier_Name, case=False, na=False)]
+        cap = cap[cap['Supplier name'].str.contains(Supplier_Name, case=False, na=False)]
     if Supplier_Code:
-        df = df[df['Supplier Code'] == Supplier_Code]
+        cap = cap[cap['Supplier Code'] == Supplier_Code]
+        sup = sup[sup['Supplier Code'] == Supplier_Code]
     if Supplier_Location:
-        df = df[df['Supplier Location'].str.contains(Supplier_Location, case=False, na=False)]
+        cap = cap[cap['Supplier Location'].str.contains(Supplier_Location, case=False, na=False)]
     if Item_Number:
-        df = df[df['Item number'] == Item_Number]
+        cap = cap[cap['Item number'] == Item_Number]
+        sup = sup[sup['Item Number'] == Item_Number]
     if due_in_days is not None:
-        df = df[df['total_lead_days'] <= due_in_days]
+        sup = sup[sup['Lead time (Weeks)'] * 7 <= due_in_days]
+
+    # --- Join capacity with supplier lead time & price on (supplier, item) ---
+    df = cap.merge(
+        sup.rename(columns={'Item Number': 'Item number'}),
+        on=['Supplier Code', 'Item number'],
+        how='inner' if due_in_days is not None else 'left'
+    )
+    df['total_lead_days'] = df['Lead time (Weeks)'] * 7
 
     # --- Build supplier output table ---
     df_sup = df.sort_values('Unit Price (USD)')
     suppliers_out = df_sup[[
-        'Supplier name', 'Supplier Code', 'Supplier Location', 'total_lead_days'
+        'Supplier name', 'Supplier Code', 'Supplier Location', 'Item number', 'total_lead_days'
     ]]
 
     # --- Filter shipment history to matching suppliers & destinations ---
-    carr = ship[ ship['Supplier Code'].isin(df_sup['Supplier Code']) ]
+    carr = _shipment_transit_days(shipment_csv)
+    carr = carr[carr['Supplier Code'].isin(df_sup['Supplier Code'].unique())]
     if destinations:
         pattern = '|'.join(destinations)
         carr = carr[carr['Delivery Location'].str.contains(pattern, case=False, na=False)]
 
-    # --- Compute transit days ---
-    carr['transit_days'] = (carr['Delivery Date'] - carr['Ship Date']).dt.days
-
-
-    # --- Aggregate by carrier: min, avg, max ---
+    # --- Aggregate by carrier: min, avg, max in one groupby ---
     carriers = (
         carr.groupby('Carrier name')['transit_days']
             .agg(
@@ -973,8 +946,6 @@ def find_suppliers_for_due_date(
                 max_transit_days='max'
             )
             .reset_index()
-            # Round the average to one decimal, if you like:
-            .assign(avg_transit_days=lambda d: d['avg_transit_days'])
             .sort_values('avg_transit_days')
             .head(top_n_carriers)
     )
@@ -987,6 +958,27 @@ def find_suppliers_for_due_date(
     )
 
 
+def _shipment_transit_days(shipment_csv: str) -> pd.DataFrame:
+    """
+    Supplier Code, Delivery Location, Carrier name and transit_days for every
+    shipment, with the dates parsed once per version of the tracker file.
+    """
+    def build():
+        ship = load_csv(shipment_csv, dtype=str)
+        ship_date, delivery_date = (
+            pd.to_datetime(ship[col].str.strip() + '-2025', format='%d-%b-%Y', errors='coerce')
+            for col in ('Ship Date', 'Delivery Date')
+        )
+        return pd.DataFrame({
+            'Supplier Code': ship['Supplier Code'],
+            'Delivery Location': ship['Delivery Location'],
+            'Carrier name': ship['Carrier name'],
+            'transit_days': (delivery_date - ship_date).dt.days,
+        })
+
+    return registry.derived(shipment_csv, 'transit_days', build)
+
+
 
 def list_expired_inventory(
     as_of_date: str,
@@ -1000,13 +992,7 @@ def list_expired_inventory(
     Returns a markdown table.
     """
 
-    df = pd.read_csv(inventory_csv, dtype=str)
-
-    df['Expiry Date'] = pd.to_datetime(
-        df['Expiry Date'].str.strip() + '-2025',
-        format='%d-%b-%Y',
-        errors='coerce'
-    )
+    df = load_dataset('inventory', inventory_csv)
 
     print(df)
     cutoff = pd.to_datetime(as_of_date, dayfirst=True, errors='coerce')
@@ -1023,7 +1009,8 @@ def list_expired_inventory(
                           .str.contains(category, case=False, na=False)]
 
 
-    out = expired[['Item Number','Item Description','Qty','Expiry Date','Sloc']]
+    out = expired[['Item Number','Item Description','Qty','Expiry Date','Sloc']].copy()
+    out['Expiry Date'] = out['Expiry Date'].dt.strftime('%d/%m/%y')
 
     return out.to_markdown(index=False)
 
@@ -1042,10 +1029,10 @@ def summarize_inventory_vs_po(
 
     Returns markdown table: Item, On-Hand Qty, Pending Qty, Net Position.
     """
-    inv = pd.read_csv(inventory_csv)
-    po = pd.read_csv(po_csv, parse_dates=['PO date'], dayfirst=True)
+    inv = load_dataset('inventory', inventory_csv)
+    po = load_csv(po_csv, parse_dates=['PO date'], dayfirst=True)
     
-    inv['Qty_n'] = inv['Qty'].str.replace(',','').astype(float)
+    inv['Qty_n'] = inv['Qty'].astype(float)
     po['Qnty pending'] = po['Qnty pending'].astype(float)
 
     if item_number:
@@ -1079,12 +1066,12 @@ def get_supplier_load(
 
     Returns markdown table: Item, Total Cap, Committed, Available, MOQ, Lead Time.
     """
-    df = pd.read_csv(capacity_csv)
+    df = load_dataset('supplier_capacity', capacity_csv)
     df = df[df['Supplier Code']==supplier_code]
     if item_number:
         df = df[df['Item number']==item_number]
     df['Available'] = df['Total monthly capacity (units)'] - df['Current committed capacity (units)']
-    df['Lead days'] = df['Lead time'].str.extract(r"(\d+)").astype(int)
+    df['Lead days'] = df['Lead time'].astype(int)
     out = df[[
         'Item number','Total monthly capacity (units)','Current committed capacity (units)',
         'Available','MOQ','Lead days'
@@ -1107,7 +1094,7 @@ def calculate_transit_time(supplier_location: str = None, delivery_location: str
     - str: A markdown table showing average transit time for the filtered routes
     """
 
-    df = pd.read_csv("./updated_docs/Shipment_tracker_data.csv")
+    df = load_csv("./updated_docs/Shipment_tracker_data.csv")
 
 
     # Filter based on inputs
@@ -1131,7 +1118,7 @@ def calculate_transit_time(supplier_location: str = None, delivery_location: str
 
 # ===== PANAMA CANAL DELAY ANALYSIS FUNCTIONS =====
 
-def get_delayed_shipments_to_east_coast(affected_dc: str = None, delay_days: int = 15) -> dict:
+def get_delayed_shipments_to_east_coast(affected_dc: str = None, delay_days: int = 15) -> DelayedShipmentsResult:
     """
     Identify high-risk shipments to East Coast ports affected by Panama Canal delays.
     Filters by east coast ports, affected DC, and prioritizes high-risk items by DOS and classification.
@@ -1141,17 +1128,17 @@ def get_delayed_shipments_to_east_coast(affected_dc: str = None, delay_days: int
         delay_days: Number of days of delay (default 15)
     
     Returns:
-        Dict containing:
-        - markdown_output: Formatted markdown table string
-        - delayed_items: List of dicts with item details
+        DelayedShipmentsResult with:
+        - delayed_items: Delayed shipment details, highest value first
         - total_value_at_risk: Total financial impact
         - affected_dc: DC being analyzed
         - summary_stats: Additional metrics
+        - markdown_output: Formatted markdown table (rendered on demand)
     """
     try:
         # Load relevant data
-        po_df = pd.read_csv('./updated_docs/Open_PO_data.csv')
-        inv_df = pd.read_csv('./updated_docs/Inventory_data.csv')
+        po_df = load_dataset('open_po')
+        inv_df = load_dataset('inventory')
         
         # East Coast ports affected by Panama Canal delays
         east_coast_ports = ['Port Georgia', 'Port New York', 'Port Boston']
@@ -1160,13 +1147,15 @@ def get_delayed_shipments_to_east_coast(affected_dc: str = None, delay_days: int
         east_coast_pos = po_df[po_df['Arrival Port'].isin(east_coast_ports)].copy()
         
         if east_coast_pos.empty:
-            return "No purchase orders found heading to East Coast ports."
+            return DelayedShipmentsResult(affected_dc=affected_dc, delay_days=delay_days,
+                                          message="No purchase orders found heading to East Coast ports.")
         
         # If specific DC is requested, filter further
         if affected_dc:
             east_coast_pos = east_coast_pos[east_coast_pos['Destination DC'] == affected_dc].copy()
             if east_coast_pos.empty:
-                return f"No East Coast shipments found for {affected_dc}."
+                return DelayedShipmentsResult(affected_dc=affected_dc, delay_days=delay_days,
+                                              message=f"No East Coast shipments found for {affected_dc}.")
         
         # Get current inventory to calculate Days of Supply for risk assessment
         if affected_dc:
@@ -1182,9 +1171,6 @@ def get_delayed_shipments_to_east_coast(affected_dc: str = None, delay_days: int
             if dc_inventory.empty:
                 continue
                 
-            # Convert to numeric and calculate DOS
-            dc_inventory['Qty'] = pd.to_numeric(dc_inventory['Qty'].astype(str).str.replace(',', ''), errors='coerce')
-            dc_inventory['daily_sales_forecast_quantity'] = pd.to_numeric(dc_inventory['daily_sales_forecast_quantity'], errors='coerce')
             dc_inventory['Days_of_Supply'] = dc_inventory['Qty'] / dc_inventory['daily_sales_forecast_quantity'].replace(0, 1)
             
             # Identify high-risk items: Classification A items with DOS < delay_days
@@ -1203,80 +1189,59 @@ def get_delayed_shipments_to_east_coast(affected_dc: str = None, delay_days: int
             filtered_shipments = east_coast_pos.copy()
         
         if filtered_shipments.empty:
-            return f"No high-risk shipments identified for {'East Coast DCs' if not affected_dc else affected_dc}."
+            return DelayedShipmentsResult(
+                affected_dc=affected_dc, delay_days=delay_days,
+                message=f"No high-risk shipments identified for {'East Coast DCs' if not affected_dc else affected_dc}."
+            )
         
         # Add delay information and risk scoring
-        filtered_shipments['Original Due Date'] = pd.to_datetime(filtered_shipments['PO Due Date'], dayfirst=True)
+        filtered_shipments['Original Due Date'] = filtered_shipments['PO Due Date']
         filtered_shipments['Delayed Due Date'] = filtered_shipments['Original Due Date'] + pd.Timedelta(days=delay_days)
         filtered_shipments['Delay Days'] = delay_days
         
         # Add financial impact calculation
-        filtered_shipments['Qnty Ordered'] = pd.to_numeric(filtered_shipments['Qnty Ordered'], errors='coerce')
-        filtered_shipments['Item value/pc with shipping'] = pd.to_numeric(filtered_shipments['Item value/pc with shipping'], errors='coerce')
         filtered_shipments['Total Value'] = filtered_shipments['Qnty Ordered'] * filtered_shipments['Item value/pc with shipping']
         
         # Sort by total value (highest impact first)
         filtered_shipments = filtered_shipments.sort_values('Total Value', ascending=False)
         
-        # Select relevant columns for output
-        output_cols = ['PO number', 'Item Number', 'Item Description', 'Destination DC', 
-                      'Arrival Port', 'Container no', 'Qnty Ordered', 'Total Value',
-                      'PO Due Date', 'Delayed Due Date', 'Delay Days']
-        
-        result = filtered_shipments[output_cols].copy()
-        result['PO Due Date'] = result['PO Due Date'].astype(str)
-        result['Delayed Due Date'] = result['Delayed Due Date'].dt.strftime('%d/%m/%Y')
-        result['Total Value'] = result['Total Value'].apply(lambda x: f"${x:,.2f}" if pd.notnull(x) else "$0.00")
-        
-        total_shipments = len(result)
         total_value = filtered_shipments['Total Value'].sum()
         
-        # Create markdown output
-        markdown_output = f"**PANAMA CANAL DELAY IMPACT - HIGH-RISK EAST COAST SHIPMENTS**\n"
-        markdown_output += f"{'Analysis for ' + affected_dc if affected_dc else 'East Coast DCs'}: {total_shipments} high-risk shipments delayed {delay_days} days\n"
-        markdown_output += f"Total Value at Risk: ${total_value:,.2f}\n\n"
-        markdown_output += result.to_markdown(index=False)
-        
-        # Create structured data for delayed items
-        delayed_items = []
-        for _, row in filtered_shipments.iterrows():
-            delayed_items.append({
-                'po_number': row['PO number'],
-                'item_number': row['Item Number'],
-                'item_description': row['Item Description'],
-                'destination_dc': row['Destination DC'],
-                'arrival_port': row['Arrival Port'],
-                'container_no': row['Container no'],
-                'quantity_ordered': int(row['Qnty Ordered']) if pd.notnull(row['Qnty Ordered']) else 0,
-                'total_value': float(row['Total Value']) if pd.notnull(row['Total Value']) else 0.0,
-                'po_due_date': str(row['PO Due Date']),
-                'delayed_due_date': row['Delayed Due Date'].strftime('%d/%m/%Y'),
-                'delay_days': delay_days
-            })
-        
-        # Return structured data
-        return {
-            'markdown_output': markdown_output,
-            'delayed_items': delayed_items,
-            'total_value_at_risk': float(total_value),
-            'affected_dc': affected_dc if affected_dc else 'All East Coast DCs',
-            'summary_stats': {
-                'total_shipments': total_shipments,
+        # Structured data for delayed items
+        items = pd.DataFrame({
+            'po_number': filtered_shipments['PO number'],
+            'item_number': filtered_shipments['Item Number'],
+            'item_description': filtered_shipments['Item Description'],
+            'destination_dc': filtered_shipments['Destination DC'],
+            'arrival_port': filtered_shipments['Arrival Port'],
+            'container_no': filtered_shipments['Container no'],
+            'quantity_ordered': filtered_shipments['Qnty Ordered'].fillna(0).astype(int),
+            'total_value': filtered_shipments['Total Value'].fillna(0.0).astype(float),
+            'po_due_date': filtered_shipments['PO Due Date'].dt.strftime('%d/%m/%y'),
+            'delayed_due_date': filtered_shipments['Delayed Due Date'].dt.strftime('%d/%m/%Y'),
+            'delay_days': delay_days,
+        })
+        
+        return DelayedShipmentsResult(
+            affected_dc=affected_dc if affected_dc else 'All East Coast DCs',
+            delay_days=delay_days,
+            delayed_items=records(items),
+            total_value_at_risk=float(total_value),
+            summary_stats={
+                'total_shipments': len(items),
                 'delay_days': delay_days,
                 'high_risk_items': filtered_shipments['Item Number'].unique().tolist(),
                 'affected_ports': filtered_shipments['Arrival Port'].unique().tolist()
             }
-        }
+        )
         
     except Exception as e:
-        error_msg = f"Error analyzing delayed shipments: {str(e)}"
-        return {
-            'markdown_output': error_msg,
-            'delayed_items': [],
-            'total_value_at_risk': 0.0,
-            'affected_dc': affected_dc or 'Unknown',
-            'summary_stats': {'error': str(e)}
-        }
+        return DelayedShipmentsResult(
+            affected_dc=affected_dc or 'Unknown',
+            delay_days=delay_days,
+            summary_stats={'error': str(e)},
+            message=f"Error analyzing delayed shipments: {str(e)}"
+        )
 
 
 def get_delayed_shipments_to_east_coast_markdown(affected_dc: str = None, delay_days: int = 15) -> str:
@@ -1284,36 +1249,34 @@ def get_delayed_shipments_to_east_coast_markdown(affected_dc: str = None, delay_
     Backward compatibility function that returns only the markdown output.
     For new code, use get_delayed_shipments_to_east_coast() which returns structured data.
     """
-    result = get_delayed_shipments_to_east_coast(affected_dc, delay_days)
-    return result['markdown_output']
+    return get_delayed_shipments_to_east_coast(affected_dc, delay_days).markdown_output
 
 
-def analyze_stockout_risk_by_dc(dc_name: str, delay_days: int = 15) -> str:
+def analyze_stockout_risk_by_dc(dc_name: str, delay_days: int = 15, use_projection: bool = False) -> StockoutRiskResult:
     """
     Analyze stockout risk for a specific DC based on inventory levels and sales forecast.
     
     Args:
         dc_name: Name of the distribution center (e.g., 'DC1')
         delay_days: Number of days of delay
+        use_projection: Project stock day by day including inbound POs
+            (East Coast arrivals delayed) instead of using Qty / forecast
     
     Returns:
-        Markdown table showing stockout risk analysis
+        StockoutRiskResult with the at-risk Class A items (markdown table via markdown_output)
     """
     try:
         # Load inventory data
-        inv_df = pd.read_csv('./updated_docs/Inventory_data.csv')
+        inv_df = load_dataset('inventory')
         
         # Filter by DC
         dc_inventory = inv_df[inv_df['destination_dc'] == dc_name].copy()
         
         if dc_inventory.empty:
-            return f"No inventory data found for {dc_name}."
+            return StockoutRiskResult(dc_name=dc_name, delay_days=delay_days,
+                                      message=f"No inventory data found for {dc_name}.")
         
         # Calculate Days of Supply (DOS)
-        # Convert to numeric and handle any formatting issues
-        dc_inventory['Qty'] = pd.to_numeric(dc_inventory['Qty'].astype(str).str.replace(',', ''), errors='coerce')
-        dc_inventory['daily_sales_forecast_quantity'] = pd.to_numeric(dc_inventory['daily_sales_forecast_quantity'], errors='coerce')
-        
         # Calculate DOS, avoiding division by zero
         dc_inventory['Days_of_Supply'] = dc_inventory['Qty'] / dc_inventory['daily_sales_forecast_quantity'].replace(0, 1)
         
@@ -1323,237 +1286,166 @@ def analyze_stockout_risk_by_dc(dc_name: str, delay_days: int = 15) -> str:
         # Focus on Classification A items (high-selling)
         high_risk_class_a = high_risk[high_risk['Classification'] == 'A'].copy()
         
+        if use_projection:
+            # Stockouts from the day-by-day projection, which counts POs
+            # arriving during the delay window
+            projected = projected_stockouts(dc_name, delay_days)
+            projected = projected[projected['Lost Units'] > 0]
+            class_a = dc_inventory[dc_inventory['Classification'] == 'A']
+            high_risk_class_a = (
+                class_a.groupby('Item Number', sort=False)
+                       .agg({'Item Description': 'first', 'Classification': 'first', 'Qty': 'sum',
+                             'daily_sales_forecast_quantity': 'max', 'selling_price_usd': 'max'})
+                       .reset_index()
+                       .merge(projected[['Item Number', 'Inbound Qty', 'Stockout Start', 'Lost Sales']], on='Item Number')
+            )
+            high_risk_class_a['Days_of_Supply'] = high_risk_class_a['Qty'] / high_risk_class_a['daily_sales_forecast_quantity'].replace(0, 1)
+            high_risk_class_a['Potential_Lost_Sales_USD'] = high_risk_class_a['Lost Sales']
+            high_risk_class_a['Stockout Start'] = high_risk_class_a['Stockout Start'].map(lambda d: d.strftime('%d/%m/%Y'))
+        
         if high_risk_class_a.empty:
-            return f"No high-risk Class A items found for {dc_name} with current delay of {delay_days} days."
+            return StockoutRiskResult(
+                dc_name=dc_name, delay_days=delay_days,
+                message=f"No high-risk Class A items found for {dc_name} with current delay of {delay_days} days."
+            )
         
         # Calculate potential lost sales
-        high_risk_class_a['Potential_Lost_Sales_USD'] = (
-            (delay_days - high_risk_class_a['Days_of_Supply']) * 
-            high_risk_class_a['daily_sales_forecast_quantity'] * 
-            high_risk_class_a['selling_price_usd']
-        )
+        if not use_projection:
+            high_risk_class_a['Potential_Lost_Sales_USD'] = (
+                (delay_days - high_risk_class_a['Days_of_Supply']) * 
+                high_risk_class_a['daily_sales_forecast_quantity'] * 
+                high_risk_class_a['selling_price_usd']
+            )
         
         # Select relevant columns
-        output_cols = ['Item Number', 'Item Description', 'Classification', 'Qty', 
-                      'daily_sales_forecast_quantity', 'Days_of_Supply', 'selling_price_usd',
-                      'Potential_Lost_Sales_USD']
-        
-        result = high_risk_class_a[output_cols].copy()
-        result['Days_of_Supply'] = result['Days_of_Supply'].round(1)
-        result['Potential_Lost_Sales_USD'] = result['Potential_Lost_Sales_USD'].round(2)
-        
-        # Rename columns for better readability to match agent expectations
-        result = result.rename(columns={
-            'Qty': 'Current Inventory',
-            'Potential_Lost_Sales_USD': 'Potential Lost Sales'
-        })
-        
-        total_lost_sales = result['Potential Lost Sales'].sum()
+        output_cols = {
+            'Item Number': 'item_number',
+            'Item Description': 'item_description',
+            'Classification': 'classification',
+            'Qty': 'current_inventory',
+            'daily_sales_forecast_quantity': 'daily_sales_forecast_quantity',
+            'Days_of_Supply': 'days_of_supply',
+            'selling_price_usd': 'selling_price_usd',
+            'Potential_Lost_Sales_USD': 'potential_lost_sales',
+        }
+        if use_projection:
+            output_cols.update({'Inbound Qty': 'inbound_qty', 'Stockout Start': 'stockout_start'})
         
-        output = f"**STOCKOUT RISK ANALYSIS - {dc_name}**\n"
-        output += f"High-selling products (Classification A) at risk due to {delay_days}-day delay:\n\n"
-        output += result.to_markdown(index=False)
-        output += f"\n\n**Total Potential Lost Sales: ${total_lost_sales:,.2f}**"
+        result = high_risk_class_a[list(output_cols)].rename(columns=output_cols)
         
-        return output
+        return StockoutRiskResult(
+            dc_name=dc_name,
+            delay_days=delay_days,
+            use_projection=use_projection,
+            items=records(result),
+            total_lost_sales=float(result['potential_lost_sales'].round(2).sum())
+        )
         
     except Exception as e:
-        return f"Error analyzing stockout risk for {dc_name}: {str(e)}"
+        return StockoutRiskResult(dc_name=dc_name, delay_days=delay_days,
+                                  message=f"Error analyzing stockout risk for {dc_name}: {str(e)}")
 
 
-def recommend_container_rerouting(delayed_shipments_data: dict, min_dos_threshold: int = 15) -> str:
+REROUTING_SOLVERS = ('greedy', 'optimal')
+
+
+def recommend_container_rerouting(delayed_shipments_data: dict, min_dos_threshold: int = 15, solver: str = 'greedy') -> ReroutingResult:
     """
     Recommend container rerouting based on delayed shipments analysis.
     Takes structured output from get_delayed_shipments_to_east_coast and finds rerouting options.
     
     Args:
-        delayed_shipments_data: Dict output from get_delayed_shipments_to_east_coast function containing:
+        delayed_shipments_data: Output of get_delayed_shipments_to_east_coast
+            (DelayedShipmentsResult or its dict) containing:
             - delayed_items: List of delayed shipment details
             - affected_dc: DC being analyzed
             - summary_stats: Additional metrics
         min_dos_threshold: Minimum days of supply required for donor DCs (default 15)
+        solver: 'greedy' (default) lists the 5 cheapest rerouting options;
+            'optimal' picks the set of containers that minimises rerouting
+            cost plus remaining lost sales, without reusing a container or
+            taking donor DCs below min_dos_threshold days of supply
     
     Returns:
-        Recommendations for container rerouting with cost-benefit analysis
+        ReroutingResult with the recommended containers, total rerouting cost
+        and, for the optimal solver, the plan summary
     """
+    if solver not in REROUTING_SOLVERS:
+        return ReroutingResult(solver=solver, message=f"Error: unknown rerouting solver {solver!r}; use one of "
+                                                      + ", ".join(repr(s) for s in REROUTING_SOLVERS) + ".")
     try:
+        shipments = DelayedShipmentsResult.coerce(delayed_shipments_data)
+        if shipments is None:
+            return ReroutingResult(solver=solver, message="Rerouting function requires the output of get_delayed_shipments_to_east_coast.")
+        if shipments.message == NOT_JSON_MESSAGE:
+            return ReroutingResult(solver=solver, message=NOT_JSON_MESSAGE)
+        
         # Load data
-        po_df = pd.read_csv('./updated_docs/Open_PO_data.csv')
-        inv_df = pd.read_csv('./updated_docs/Inventory_data.csv')
-        port_cost_df = pd.read_csv('./updated_docs/Port_transfer_cost.csv')
+        po_df = load_dataset('open_po')
+        inv_df = load_dataset('inventory')
+        port_cost_df = load_dataset('port_transfer_cost')
         
         # Extract data from structured input
-        affected_dc = delayed_shipments_data.get('affected_dc')
-        delayed_items = delayed_shipments_data.get('delayed_items', [])
+        affected_dc = shipments.affected_dc
+        delayed_items = shipments.delayed_items
         
         if not affected_dc or affected_dc == 'All East Coast DCs':
-            return "Rerouting function requires a specific affected DC, not all East Coast DCs."
+            return ReroutingResult(affected_dc=affected_dc, solver=solver,
+                                   message="Rerouting function requires a specific affected DC, not all East Coast DCs.")
         
         if not delayed_items:
-            return "No delayed items found in the input data."
+            return ReroutingResult(affected_dc=affected_dc, solver=solver,
+                                   message="No delayed items found in the input data.")
         
         # Extract high-risk item numbers from delayed items
-        high_risk_items = list(set([item['item_number'] for item in delayed_items]))
-        
-        if not high_risk_items:
-            return "No high-risk items found in delayed shipments data."
+        high_risk_items = list(dict.fromkeys(item.item_number for item in delayed_items))
         
-        # East Coast ports (where delays are occurring)
-        east_coast_ports = ['Port Georgia', 'Port New York', 'Port Boston']
-        
-        # Non-East Coast DCs that could be potential donors
-        all_dcs = ['DC1', 'DC2', 'DC3', 'DC4', 'DC5']
-        potential_donor_dcs = [dc for dc in all_dcs if dc != affected_dc]
-        
-        rerouting_recommendations = []
-        
-        # For each high-risk item, find potential donor DCs
-        for item_number in high_risk_items:
-            
-            # Check each potential donor DC
-            for donor_dc in potential_donor_dcs:
-                
-                # Check if donor DC has sufficient DOS (15+ days) for this item
-                donor_inv = inv_df[
-                    (inv_df['destination_dc'] == donor_dc) & 
-                    (inv_df['Item Number'] == item_number)
-                ].copy()
-                
-                if donor_inv.empty:
-                    continue
-                
-                # Calculate DOS for donor DC
-                donor_inv['Qty'] = pd.to_numeric(donor_inv['Qty'].astype(str).str.replace(',', ''), errors='coerce')
-                donor_inv['daily_sales_forecast_quantity'] = pd.to_numeric(donor_inv['daily_sales_forecast_quantity'], errors='coerce')
-                donor_inv['DOS'] = donor_inv['Qty'] / donor_inv['daily_sales_forecast_quantity'].replace(0, 1)
-                
-                # Check if donor has sufficient inventory (15+ days supply)
-                max_donor_dos = donor_inv['DOS'].max()
-                if max_donor_dos < min_dos_threshold:
-                    continue  # Donor DC doesn't have enough supply
-                
-                # Look for available PO shipments from donor DC for this item
-                donor_shipments = po_df[
-                    (po_df['Destination DC'] == donor_dc) &
-                    (po_df['Item Number'] == item_number) &
-                    (~po_df['Arrival Port'].isin(east_coast_ports))  # Non-East Coast shipments that can be rerouted
-                ].copy()
-                
-                if donor_shipments.empty:
-                    continue
-                
-                # Calculate rerouting costs for each available shipment
-                for _, shipment in donor_shipments.iterrows():
-                    
-                    # Find the destination port for affected DC (where shipment should be rerouted)
-                    affected_dc_shipments = po_df[po_df['Destination DC'] == affected_dc]
-                    if not affected_dc_shipments.empty:
-                        target_port = affected_dc_shipments['Arrival Port'].iloc[0]
-                    else:
-                        target_port = 'Port Georgia'  # Default East Coast port
-                    
-                    # Look up rerouting cost
-                    cost_lookup = port_cost_df[
-                        (port_cost_df['from_port'] == shipment['Arrival Port']) &
-                        (port_cost_df['to_port'] == target_port)
-                    ]
-                    
-                    if not cost_lookup.empty:
-                        rerouting_cost = cost_lookup['transfer_cost_usd'].iloc[0]
-                    else:
-                        rerouting_cost = 1500  # Default cost if not found
-                    
-                    # Calculate financial metrics
-                    shipment_value = pd.to_numeric(shipment['Total PO value'], errors='coerce')
-                    quantity = pd.to_numeric(shipment['Qnty Ordered'], errors='coerce')
-                    
-                    rerouting_recommendations.append({
-                        'Item_Number': item_number,
-                        'Item_Description': shipment['Item Description'],
-                        'PO_Number': shipment['PO number'],
-                        'Container_No': shipment['Container no'],
-                        'Donor_DC': donor_dc,
-                        'Donor_DOS': f"{max_donor_dos:.1f}",
-                        'From_Port': shipment['Arrival Port'],
-                        'To_DC': affected_dc,
-                        'Quantity': quantity,
-                        'Shipment_Value': shipment_value,
-                        'Rerouting_Cost': rerouting_cost,
-                        #'Cost_Benefit_Ratio': (shipment_value / rerouting_cost) if rerouting_cost > 0 else 0
-                    })
-        
-        if not rerouting_recommendations:
-            return f"No viable rerouting options found. Non-East Coast DCs do not have sufficient inventory (15+ days supply) for high-risk items."
-        
-        # Sort by Rerouting Cost (lowest value per rerouting cost)
-        rerouting_recommendations.sort(key=lambda x: x['Rerouting_Cost'], reverse=False)
-        
-        # Create output table
-        output = f"**CONTAINER REROUTING RECOMMENDATIONS FOR {affected_dc}**\n"
-        output += f"Found {len(rerouting_recommendations)} viable rerouting options from DCs with 15+ days supply:\n\n"
-        
-        # Take top 5 recommendations
-        top_recommendations = rerouting_recommendations[:5]
-        
-        # Format as markdown table
-        headers = ['PO Number', 'Item', 'Donor DC', 'From Port', 'To DC', 
-                  'Qty', 'Value', 'Reroute Cost']
-        
-        table_data = []
-        total_rerouting_cost = 0
-        total_shipment_value = 0
-        
-        for rec in top_recommendations:
-            total_rerouting_cost += rec['Rerouting_Cost']
-            total_shipment_value += rec['Shipment_Value']
-            print("**********--", rec['To_DC'])
-            
-            table_data.append([
-                rec['PO_Number'],
-                f"{rec['Item_Number']} - {rec['Item_Description'][:20]}...",
-                f"{rec['Donor_DC']} ({rec['Donor_DOS']}d)",
-                rec['From_Port'],
-                rec['To_DC'],
-                f"{rec['Quantity']:,.0f}",
-                f"${rec['Shipment_Value']:,.0f}",
-                f"${rec['Rerouting_Cost']:,.0f}",
-                #f"{rec['Cost_Benefit_Ratio']:.1f}x"
-            ])
-        
-        # Create markdown table
-        table_rows = []
-        table_rows.append('| ' + ' | '.join(headers) + ' |')
-        table_rows.append('|' + '|'.join([':' + '-'*(len(h)-1) for h in headers]) + '|')
-        
-        for row in table_data:
-            table_rows.append('| ' + ' | '.join([str(cell) for cell in row]) + ' |')
-        
-        output += '\n'.join(table_rows)
-        
-        # Summary
-        roi_percentage = ((total_shipment_value - total_rerouting_cost) / total_rerouting_cost * 100) if total_rerouting_cost > 0 else 0
-        
-        output += f"\n\n**REROUTING SUMMARY:**\n"
-        output += f"- Total Shipment Value: ${total_shipment_value:,.2f}\n"
-        output += f"- Total Rerouting Cost: ${total_rerouting_cost:,.2f}\n"
-        #output += f"- Net Value (shipment value - rerouting cost): ${total_shipment_value - total_rerouting_cost:,.2f}\n"
-        #output += f"- ROI: {roi_percentage:,.0f}%\n"
-        output += f"- Recommendation: {'PROCEED with rerouting' if roi_percentage > 100 else 'EVALUATE ALTERNATIVES'}"
-        
-        # Create structured output for other functions to use
-        structured_output = {
-            'markdown_output': output,
-            'total_rerouting_cost': total_rerouting_cost,
-            'container_information': top_recommendations if 'top_recommendations' in locals() else []
-        }
-
-        return structured_output
+        # Donor inventory x candidate shipment x port cost, across all DCs,
+        # already sorted by Rerouting Cost (lowest first)
+        options = rerouting_options(
+            affected_dc, high_risk_items, po_df, inv_df, port_cost_df, min_dos_threshold
+        )
+        if options.empty:
+            return ReroutingResult(
+                affected_dc=affected_dc, solver=solver,
+                message=f"No viable rerouting options found. Non-East Coast DCs do not have sufficient inventory (15+ days supply) for high-risk items."
+            )
+        options_found = len(options)
+        
+        plan_summary = None
+        if solver == 'optimal':
+            delay_days = shipments.summary_stats.get('delay_days', shipments.delay_days)
+            shortfall = dc_shortfall(inv_df, affected_dc, high_risk_items, delay_days)
+            plan, plan_summary = optimal_rerouting_plan(options, shortfall)
+            if plan.empty:
+                return ReroutingResult(
+                    affected_dc=affected_dc, solver=solver, options_found=options_found, plan_summary=plan_summary,
+                    message=(f"No rerouting recommended for {affected_dc}: no combination of the {options_found} viable options "
+                             f"prevents more lost sales than it costs within donor supply limits "
+                             f"(${plan_summary['lost_sales_before']:,.2f} potential lost sales).")
+                )
+            top_recommendations = plan
+        else:
+            # Take top 5 recommendations
+            top_recommendations = options.head(5)
+        
+        top_recommendations = top_recommendations.drop(columns=['Donor_DOS_Days', 'Donor_Spare_Qty'])
+        
+        return ReroutingResult(
+            affected_dc=affected_dc,
+            solver=solver,
+            options_found=options_found,
+            container_information=records(top_recommendations),
+            total_rerouting_cost=float(top_recommendations['Rerouting_Cost'].sum()),
+            total_shipment_value=float(top_recommendations['Shipment_Value'].sum()),
+            plan_summary=plan_summary
+        )
         
     except Exception as e:
-        return f"Error generating rerouting recommendations: {str(e)}"
+        return ReroutingResult(solver=solver, message=f"Error generating rerouting recommendations: {str(e)}")
 
 
-def calculate_cost_benefit_analysis(affected_dc: str, delay_days: int = 15) -> str:
+def calculate_cost_benefit_analysis(affected_dc: str, delay_days: int = 15) -> CostBenefitResult:
     """
     Calculate comprehensive cost-benefit analysis for container rerouting vs. accepting stockouts.
     
@@ -1562,17 +1454,14 @@ def calculate_cost_benefit_analysis(affected_dc: str, delay_days: int = 15) -> s
         delay_days: Number of days of delay
     
     Returns:
-        Cost-benefit analysis with recommendations
+        CostBenefitResult with lost sales, rerouting cost and recommendation
     """
     try:
         # Load data
-        inv_df = pd.read_csv('./updated_docs/Inventory_data.csv')
-        port_cost_df = pd.read_csv('./updated_docs/Port_transfer_cost.csv')
+        inv_df = load_dataset('inventory')
         
         # Calculate potential lost sales (cost of doing nothing)
         affected_inv = inv_df[inv_df['destination_dc'] == affected_dc].copy()
-        affected_inv['Qty'] = pd.to_numeric(affected_inv['Qty'].astype(str).str.replace(',', ''), errors='coerce')
-        affected_inv['daily_sales_forecast_quantity'] = pd.to_numeric(affected_inv['daily_sales_forecast_quantity'], errors='coerce')
         affected_inv['Days_of_Supply'] = affected_inv['Qty'] / affected_inv['daily_sales_forecast_quantity'].replace(0, 1)
         
         high_risk_items = affected_inv[
@@ -1581,7 +1470,8 @@ def calculate_cost_benefit_analysis(affected_dc: str, delay_days: int = 15) -> s
         ].copy()
         
         if high_risk_items.empty:
-            return f"No high-risk items found for {affected_dc}."
+            return CostBenefitResult(affected_dc=affected_dc, delay_days=delay_days,
+                                     message=f"No high-risk items found for {affected_dc}.")
         
         # Calculate total potential lost sales
         high_risk_items['Lost_Sales'] = (
@@ -1592,120 +1482,76 @@ def calculate_cost_benefit_analysis(affected_dc: str, delay_days: int = 15) -> s
         
         total_lost_sales = high_risk_items['Lost_Sales'].sum()
         
-        # Get ACTUAL rerouting costs from the same logic used by panama_analysis_agent
-        rerouting_result = recommend_container_rerouting(affected_dc, delay_days)
-        
-        # Extract total rerouting cost from the rerouting recommendation
-        if "Total Rerouting Cost: $" in rerouting_result:
-            cost_line = [line for line in rerouting_result.split('\n') if 'Total Rerouting Cost: $' in line][0]
-            cost_str = cost_line.split('Total Rerouting Cost: $')[1].replace(',', '').replace('**', '')
-            try:
-                total_rerouting_cost = float(cost_str)
-            except:
-                # Fallback to estimation if parsing fails
-                avg_rerouting_cost = port_cost_df['transfer_cost_usd'].mean()
-                estimated_containers_needed = max(1, len(high_risk_items) // 3)
-                total_rerouting_cost = avg_rerouting_cost * estimated_containers_needed
-        else:
-            # No rerouting options available, set cost to 0
-            total_rerouting_cost = 0
-        
-        # Calculate ROI
-        net_benefit = total_lost_sales - total_rerouting_cost
-        roi = (net_benefit / total_rerouting_cost) * 100 if total_rerouting_cost > 0 else 0
-        
-        # Create summary table
-        analysis_data = {
-            'Cost Category': [
-                'Potential Lost Sales (Do Nothing)',
-                'Container Rerouting Cost',
-                'Net Value (total lost sales value - rerouting cost)',
-                'ROI of Rerouting (%)'
-            ],
-            'Amount (USD)': [
-                f"${total_lost_sales:,.2f}",
-                f"${total_rerouting_cost:,.2f}",
-                f"${net_benefit:,.2f}",
-                f"{roi:.1f}%"
-            ],
-            'Impact': [
-                'Revenue Loss',
-                'One-time Cost',
-                'Savings/Loss',
-                'Return on Investment'
-            ]
-        }
-        
-        analysis_df = pd.DataFrame(analysis_data)
-        
-        # Generate recommendation
-        if net_benefit > 0:
-            recommendation = "✅ **RECOMMEND REROUTING**: Rerouting containers will save money and prevent stockouts."
-        else:
-            recommendation = "❌ **DO NOT REROUTE**: Rerouting costs exceed potential lost sales."
-        
-        output = f"**COST-BENEFIT ANALYSIS - PANAMA CANAL DELAY**\n"
-        output += f"Analysis for {affected_dc} with {delay_days}-day delay:\n\n"
-        output += analysis_df.to_markdown(index=False)
-        output += f"\n\n{recommendation}"
-        # Extract number of containers from rerouting result
-        container_count = 0
-        if "Total Rerouting Cost: $" in rerouting_result:
-            # Count containers by counting table rows (excluding header)
-            table_lines = [line for line in rerouting_result.split('\n') if '|' in line and 'PO number' not in line and ':-' not in line]
-            container_count = len([line for line in table_lines if line.strip() and not line.startswith('**')])
-        
-        output += f"\n\n**Key Insights:**"
-        output += f"\n• {len(high_risk_items)} high-selling items at risk of stockout"
-        if container_count > 0:
-            output += f"\n• {container_count} containers identified for rerouting"
-        else:
-            output += f"\n• No suitable containers available for rerouting"
-        output += f"\n• Break-even rerouting cost: ${total_lost_sales:,.2f}"
-        
-        return output
+        # Get ACTUAL rerouting costs from the same logic used by panama_analysis_agent;
+        # no rerouting options means no rerouting cost
+        rerouting = recommend_container_rerouting(get_delayed_shipments_to_east_coast(affected_dc, delay_days))
+        rerouted = rerouting.message is None
+        
+        return CostBenefitResult(
+            affected_dc=affected_dc,
+            delay_days=delay_days,
+            high_risk_items=len(high_risk_items),
+            total_lost_sales=float(total_lost_sales),
+            total_rerouting_cost=rerouting.total_rerouting_cost if rerouted else 0.0,
+            container_count=len(rerouting.container_information) if rerouted else 0
+        )
         
     except Exception as e:
-        return f"Error calculating cost-benefit analysis: {str(e)}"
+        return CostBenefitResult(affected_dc=affected_dc, delay_days=delay_days,
+                                 message=f"Error calculating cost-benefit analysis: {str(e)}")
 
 
 def calculate_financial_impact_and_recommendation(
     delayed_shipments_data: dict,
-    rerouting_data: dict = None
-) -> str:
+    rerouting_data: dict = None,
+    use_projection: bool = False
+) -> FinancialImpactResult:
     """
     Calculate financial impact and recommendation using structured data from panama analysis.
     Focuses on potential lost sales calculation with optional rerouting cost-benefit analysis.
     
     Args:
-        delayed_shipments_data: Dict output from get_delayed_shipments_to_east_coast containing:
+        delayed_shipments_data: Output of get_delayed_shipments_to_east_coast
+            (DelayedShipmentsResult or its dict) containing:
             - delayed_items: List of delayed shipment details
             - total_value_at_risk: Total shipment value delayed
             - affected_dc: DC being analyzed
             - summary_stats: Additional metrics
-        rerouting_data: Optional dict from recommend_container_rerouting with cost analysis
+        rerouting_data: Optional output of recommend_container_rerouting
+            (ReroutingResult or its dict) with cost analysis
+        use_projection: Project stock day by day including inbound POs
+            (East Coast arrivals delayed) instead of using Qty / forecast
     
     Returns:
-        Financial analysis with potential lost sales and recommendation
+        FinancialImpactResult with potential lost sales and recommendation
     """
     try:
+        shipments = DelayedShipmentsResult.coerce(delayed_shipments_data)
+        if shipments is None:
+            return FinancialImpactResult(message="Financial impact calculation requires the output of get_delayed_shipments_to_east_coast.")
+        rerouting = ReroutingResult.coerce(rerouting_data) if rerouting_data else None
+        if shipments.message == NOT_JSON_MESSAGE or (rerouting is not None and rerouting.message == NOT_JSON_MESSAGE):
+            return FinancialImpactResult(message=NOT_JSON_MESSAGE)
+        
         # Extract data from structured input
-        affected_dc = delayed_shipments_data.get('affected_dc')
-        delayed_items = delayed_shipments_data.get('delayed_items', [])
-        total_shipment_value = delayed_shipments_data.get('total_value_at_risk', 0)
-        delay_days = delayed_shipments_data.get('summary_stats', {}).get('delay_days', 15)
+        affected_dc = shipments.affected_dc
+        delayed_items = shipments.delayed_items
+        total_shipment_value = shipments.total_value_at_risk
+        delay_days = shipments.summary_stats.get('delay_days', shipments.delay_days)
         
         if not affected_dc or affected_dc == 'All East Coast DCs':
-            return "Financial impact calculation requires a specific affected DC."
+            return FinancialImpactResult(affected_dc=affected_dc, delay_days=delay_days,
+                                         message="Financial impact calculation requires a specific affected DC.")
         
         if not delayed_items:
-            return f"No delayed shipments found for {affected_dc}."
+            return FinancialImpactResult(affected_dc=affected_dc, delay_days=delay_days,
+                                         message=f"No delayed shipments found for {affected_dc}.")
         
         # Load inventory data to calculate potential lost sales
-        inv_df = pd.read_csv('./updated_docs/Inventory_data.csv')
+        inv_df = load_dataset('inventory')
         
         # Get high-risk item numbers from delayed shipments
-        high_risk_item_numbers = list(set([item['item_number'] for item in delayed_items]))
+        high_risk_item_numbers = list(set([item.item_number for item in delayed_items]))
         
         # Filter inventory for affected DC and high-risk items
         affected_inv = inv_df[
@@ -1714,12 +1560,10 @@ def calculate_financial_impact_and_recommendation(
         ].copy()
         
         if affected_inv.empty:
-            return f"No inventory data found for {affected_dc} high-risk items."
+            return FinancialImpactResult(affected_dc=affected_dc, delay_days=delay_days,
+                                         message=f"No inventory data found for {affected_dc} high-risk items.")
         
         # Calculate Days of Supply and potential lost sales
-        affected_inv['Qty'] = pd.to_numeric(affected_inv['Qty'].astype(str).str.replace(',', ''), errors='coerce')
-        affected_inv['daily_sales_forecast_quantity'] = pd.to_numeric(affected_inv['daily_sales_forecast_quantity'], errors='coerce')
-        affected_inv['selling_price_usd'] = pd.to_numeric(affected_inv['selling_price_usd'], errors='coerce')
         affected_inv['Days_of_Supply'] = affected_inv['Qty'] / affected_inv['daily_sales_forecast_quantity'].replace(0, 1)
         
         # Calculate potential lost sales for items with insufficient inventory
@@ -1730,31 +1574,28 @@ def calculate_financial_impact_and_recommendation(
             affected_inv['selling_price_usd']
         )
         
+        if use_projection:
+            # One row per item from the day-by-day projection, which counts
+            # POs arriving during the delay window
+            projected = projected_stockouts(affected_dc, delay_days, high_risk_item_numbers)
+            affected_inv = (
+                affected_inv.groupby('Item Number', sort=False)
+                            .agg({'Item Description': 'first', 'Qty': 'sum'})
+                            .reset_index()
+                            .merge(projected, on='Item Number')
+            )
+            affected_inv['Days_of_Supply'] = affected_inv['Qty'] / affected_inv['Daily Forecast'].replace(0, 1)
+            affected_inv['Stockout_Days'] = affected_inv['Stockout Days']
+            affected_inv['Lost_Sales'] = affected_inv['Lost Sales']
+        
         # Filter to only items that will actually have lost sales
         items_with_losses = affected_inv[affected_inv['Lost_Sales'] > 0].copy()
         total_lost_sales = items_with_losses['Lost_Sales'].sum()
         
-        # Parse rerouting data if provided
-        total_rerouting_cost = 0
-        container_count = 0
-        rerouting_available = False
-
-        if rerouting_data:
-            # Handle both string and dict formats
-            if isinstance(rerouting_data, dict):
-                total_rerouting_cost = rerouting_data.get('total_rerouting_cost', 0)
-                container_info = rerouting_data.get('container_information', [])
-                container_count = len(container_info) if container_info else 0
-            elif isinstance(rerouting_data, str) and "Total Rerouting Cost: $" in rerouting_data:
-                # Parse from markdown string if needed
-                import re
-                cost_match = re.search(r'Total Rerouting Cost: \$([0-9,]+\.?\d*)', rerouting_data)
-                if cost_match:
-                    total_rerouting_cost = float(cost_match.group(1).replace(',', ''))
-                # Count containers from table rows
-                container_count = len(re.findall(r'PO-\d+', rerouting_data))
-            
-            rerouting_available = total_rerouting_cost > 0 and container_count > 0
+        # Rerouting cost and containers, if a rerouting result was provided
+        total_rerouting_cost = rerouting.total_rerouting_cost if rerouting else 0
+        container_count = len(rerouting.container_information) if rerouting else 0
+        rerouting_available = total_rerouting_cost > 0 and container_count > 0
 
         # Calculate cost-benefit analysis
         if rerouting_available and total_rerouting_cost > 0:
@@ -1767,74 +1608,32 @@ def calculate_financial_impact_and_recommendation(
             else:
                 recommendation = "❌ **DO NOT REROUTE**: Rerouting costs exceed potential lost sales."
         else:
-            net_benefit = -total_lost_sales  # All losses since no rerouting
-            roi = 0
             recommendation = "❌ **NO REROUTING OPTIONS**: Accept lost sales or find alternative solutions."
         
-        # Generate output with focus on potential lost sales
-        output = f"**FINANCIAL IMPACT ANALYSIS - PANAMA CANAL DELAY**\n"
-        output += f"Analysis for {affected_dc} with {delay_days}-day delay:\n\n"
-        
-        # Delayed shipments summary
-        output += f"**DELAYED SHIPMENTS SUMMARY**\n"
-        output += f"• Total shipments delayed: {len(delayed_items)}\n"
-        output += f"• Total shipment value: ${total_shipment_value:,.2f}\n"
-        output += f"• Delay period: {delay_days} days\n\n"
-        
-        # Potential lost sales analysis
-        if items_with_losses.empty:
-            output += f"**GOOD NEWS: No Lost Sales Expected**\n"
-            output += f"{affected_dc} has sufficient inventory to cover the {delay_days}-day delay.\n"
-            output += f"All delayed items have adequate Days of Supply.\n\n"
-            output += "✅ **RECOMMENDATION**: No immediate action required. Monitor situation."
-        else:
-            output += f"**POTENTIAL LOST SALES ANALYSIS**\n"
-            output += f"Items at risk of stockout during {delay_days}-day delay:\n\n"
-            
-            # Show detailed lost sales breakdown with proper column naming
-            loss_cols = ['Item Number', 'Item Description', 'Qty', 'Days_of_Supply', 'Lost_Sales']
-            
-            loss_summary = items_with_losses[loss_cols].copy()
-            loss_summary['Days_of_Supply'] = loss_summary['Days_of_Supply'].round(1)
-            loss_summary['Lost_Sales'] = loss_summary['Lost_Sales'].round(2)
-            
-            # Rename columns to match agent expectations
-            loss_summary = loss_summary.rename(columns={
-                'Qty': 'Current Inventory',
-                'Lost_Sales': 'Potential Lost Sales'
-            })
-            
-            # Format currency column
-            loss_summary['Potential Lost Sales'] = loss_summary['Potential Lost Sales'].apply(lambda x: f"${x:,.2f}")
-            
-            output += loss_summary.to_markdown(index=False)
-            output += f"\n\n**TOTAL POTENTIAL LOST SALES: ${total_lost_sales:,.2f}**\n\n"
-            
-            # Cost-benefit analysis if rerouting data provided
-            if rerouting_available:
-                output += f"**COST-BENEFIT ANALYSIS**\n"
-                output += f"• Potential Lost Sales: ${total_lost_sales:,.2f}\n"
-                output += f"• Rerouting Cost: ${total_rerouting_cost:,.2f}\n"
-                #output += f"• Net Benefit: ${net_benefit:,.2f}\n"
-                #output += f"• ROI: {roi:.1f}%\n\n"
-            
-            output += f"{recommendation}\n\n"
-            
-            # Key insights
-            output += f"**KEY INSIGHTS:**\n"
-            output += f"• {len(items_with_losses)} items will experience stockouts\n"
-            output += f"• Average stockout period: {items_with_losses['Stockout_Days'].mean():.1f} days\n"
-            output += f"• Highest-impact item: {items_with_losses.loc[items_with_losses['Lost_Sales'].idxmax(), 'Item Description']}\n"
-            
-            if rerouting_available and container_count > 0:
-                output += f"• {container_count} containers available for rerouting\n"
-            
-            output += f"• Break-even rerouting cost: ${total_lost_sales:,.2f}"
-        
-        return output
+        loss_items = items_with_losses.rename(columns={
+            'Item Number': 'item_number',
+            'Item Description': 'item_description',
+            'Qty': 'current_inventory',
+            'Days_of_Supply': 'days_of_supply',
+            'Stockout_Days': 'stockout_days',
+            'Lost_Sales': 'lost_sales',
+        })[['item_number', 'item_description', 'current_inventory', 'days_of_supply', 'stockout_days', 'lost_sales']]
+        
+        return FinancialImpactResult(
+            affected_dc=affected_dc,
+            delay_days=delay_days,
+            delayed_shipments=len(delayed_items),
+            total_shipment_value=total_shipment_value,
+            loss_items=records(loss_items),
+            total_lost_sales=float(total_lost_sales),
+            rerouting_available=rerouting_available,
+            total_rerouting_cost=total_rerouting_cost,
+            container_count=container_count,
+            recommendation=recommendation
+        )
         
     except Exception as e:
-        return f"Error calculating financial impact: {str(e)}"
+        return FinancialImpactResult(message=f"Error calculating financial impact: {str(e)}")
 
 #----- Tools from previous versions -----
 
@@ -1842,7 +1641,8 @@ def extract_invoice_details():
 
     response_string = ""
     invoice_count = 0
-    for path in glob.glob("./updated_docs/pdf_store/*.pdf"):
+    folder = pdf_folder.get()
+    for path in glob.glob(os.path.join(folder, "*.pdf")):
         print(path)
         doc = open_pdf(path)
         page = doc.load_page(0)
@@ -1882,7 +1682,7 @@ def extract_invoice_details():
             model="gemini-2.0-flash",
             contents=[f"""Study the invoice extremely carefully. And Extract these details: invoice number, supplier name, po number, billed quantity, unit price, total invoice amount, tax. Get Complete Invoice Number, Supplier Name [shouldn't be billed to company or ship to company], PO Number, Billed Quantity, Total Invoice Amount [Balance Due], Tax [or Import Duty Percentage]. Return these details: {format} in a markdown table format. Do Not return any extra words.. only the table. Avoid using "```" backticks """, image]
         )
-        clear_images()
+        clear_images(folder)
         invoice_count+=1
         response_string += f"\n\nInvoice #{invoice_count}:\n\n"+response.text
 
@@ -1897,12 +1697,11 @@ def get_po_grn_details(po_number: str) -> str:
 
     po_data_path='./updated_docs/PO_data.csv'
 
-    grn_df = pd.read_csv(grn_path)
-    po_df = pd.read_csv(po_data_path)
+    po_index = load_index(po_data_path, 'PO number')
     
-    # Filter based on PO number and GRN number
-    grn_filtered = grn_df[(grn_df['PO number'] == po_number)]
-    po_filtered = po_df[po_df['PO number'] == po_number]
+    # Look up based on PO number (GRN rows come from the memory-mapped store)
+    grn_filtered = get_grn_rows(po_number, grn_path)
+    po_filtered = po_index.rows(po_number)
 
     # Check if any results found
     if grn_filtered.empty:
@@ -1921,7 +1720,7 @@ def generate_alphanumeric_string(length=12):
     characters = string.ascii_letters + string.digits
     return ''.join(random.choice(characters) for _ in range(length))
 
-def clear_pdfs(folder_path = "./updated_docs/pdf_store"):
+def clear_pdfs(folder_path = PDF_STORE):
     """
     Delete all PDF files in the specified folder (non-recursive).
 
@@ -1959,10 +1758,10 @@ def calculate_eta_from_files(pr_number: str):
     sh_csv_path = './updated_docs/Shipment_data.csv'
     df_csv_path = './updated_docs/req_table.csv'
     # Read files
-    pr = pd.read_csv(pr_csv_path, parse_dates=['Request Date', 'Need By Date', 'Action date (Stage 2)', 'Action date (Stage 3)'])
-    sp = pd.read_csv(sp_csv_path)
-    sh = pd.read_csv(sh_csv_path)
-    df = pd.read_csv(df_csv_path)
+    pr = load_csv(pr_csv_path, parse_dates=['Request Date', 'Need By Date', 'Action date (Stage 2)', 'Action date (Stage 3)'])
+    sp = load_csv(sp_csv_path)
+    sh = load_csv(sh_csv_path)
+    df = load_csv(df_csv_path).copy()
 
     # Filter shipment and supplier data
     sh_1 = sh[(sh['Item Number'] == 'ITM-001') & 
@@ -2045,7 +1844,7 @@ def analysed_pr_details(pr_numbers_list: list):
 
     response_string = ""
     try:
-        pr_df = pd.read_csv('./updated_docs/pr_data.csv', dayfirst=True)
+        pr_df = load_csv('./updated_docs/pr_data.csv', dayfirst=True)
     except FileNotFoundError:
         print("Error: File './updated_docs/pr_data.csv' not found.")
         return None
@@ -2069,7 +1868,7 @@ def analysed_pr_details(pr_numbers_list: list):
     # Convert input string into list of normalized PR numbers
     pr_numbers = [pr.strip().upper() for pr in pr_numbers_list]
 
-    df = pd.read_csv('./updated_docs/pr_data.csv', dayfirst=True)
+    pr_index = load_index('./updated_docs/pr_data.csv', "PR Number", dayfirst=True)
     
     # Map of original → desired column names
     cols_to_select = {
@@ -2087,8 +1886,8 @@ def analysed_pr_details(pr_numbers_list: list):
         "Remarks": "Remarks"
     }
     
-    # Filter and select
-    filtered_df = df[df["PR Number"].isin(pr_numbers)]
+    # Look up and select
+    filtered_df = pr_index.rows_many(pr_numbers)
     result_df = (
         filtered_df
         .loc[:, cols_to_select.keys()]
@@ -2153,7 +1952,7 @@ def send_reminder_email_to_approver(pr_numbers_str: str):
     sendgrid_api_key = os.getenv("SENDGRID_API_KEY") 
 
     try:
-        pr_df = pd.read_csv('./updated_docs/pr_data.csv', dayfirst=True)
+        pr_df = load_csv('./updated_docs/pr_data.csv', dayfirst=True)
     except FileNotFoundError:
         print("Error: File './updated_docs/pr_data.csv' not found.")
         return None
@@ -2443,7 +2242,7 @@ def send_reminder_email_to_approver(pr_numbers_str: str):
           except Exception as e:
               return f"❌ Error sending email for ticket {pr['PR Number']}: {e}"
 
-def clear_images(folder_path = "./updated_docs/pdf_store"):
+def clear_images(folder_path = PDF_STORE):
     """
     Delete all PDF files in the specified folder (non-recursive).
 